@@ -0,0 +1,93 @@
+import copy
+# Worker mendapat salinan game sendiri, karena pencarian AI melakukan make_move/unmake_move langsung di state-nya
+# (kalau tidak disalin, UI bisa menggambar posisi "simulasi" di tengah pencarian)
+
+import threading
+# Pencarian AI dijalankan di background thread supaya loop pygame tetap bisa memproses event dan menggambar
+
+import time
+
+
+# --- Background Search Worker ---
+# Menjalankan AIPlayer.find_best_move (atau task lain milik AI, misalnya ponder) di thread terpisah
+# UI cukup memanggil start() sekali, lalu poll() setiap frame sampai hasilnya ada
+# on_finished (opsional) dipanggil dari background thread setiap kali task-nya selesai,
+# misalnya untuk membangunkan loop UI yang sedang menunggu event
+class SearchWorker:
+    def __init__(self, ai, on_finished=None):
+        self.ai = ai
+        self.on_finished = on_finished
+        self.thread = None
+        self.result = None
+        self.error = None
+        self.finished = False
+        self.started_at = None
+
+    # Mulai mencari move untuk posisi game saat ini
+    # task = method AI yang dijalankan (default ai.find_best_move, atau ai.ponder untuk pondering)
+    # search_kwargs diteruskan ke task tersebut (misalnya remaining_ms atau time_limit_ms)
+    def start(self, game, task=None, **search_kwargs):
+        if self.is_running():
+            raise RuntimeError("SearchWorker is already running a search")
+
+        self.result = None
+        self.error = None
+        self.finished = False
+        self.started_at = time.perf_counter()
+
+        if task is None:
+            task = self.ai.find_best_move
+
+        game_copy = copy.deepcopy(game)
+        self.thread = threading.Thread(target=self.run, args=(task, game_copy, search_kwargs), daemon=True)
+        self.thread.start()
+
+    def run(self, task, game, search_kwargs):
+        try:
+            self.result = task(game, **search_kwargs)
+        except Exception as error: # Error tetap dilaporkan ke thread UI lewat poll(), bukan hilang di background
+            self.error = error
+        finally:
+            self.finished = True
+            if self.on_finished is not None:
+                self.on_finished()
+
+    def is_running(self):
+        return self.thread is not None and not self.finished
+
+    # Return (sudah selesai?, move terbaik)
+    # Kalau pencariannya error, error-nya dilempar ulang di thread yang memanggil poll()
+    def poll(self):
+        if not self.finished:
+            return False, None
+        if self.error is not None:
+            raise self.error
+        return True, self.result
+
+    # Berapa lama (dalam ms) pencarian yang sekarang sudah berjalan
+    def elapsed_ms(self):
+        if self.started_at is None:
+            return 0
+        return (time.perf_counter() - self.started_at) * 1000
+
+    # Batalkan pencarian yang sedang berjalan
+    # Menunggu sampai thread-nya benar-benar berhenti (biasanya hanya beberapa ms setelah stop()),
+    # supaya thread lama tidak menimpa hasil dari pencarian berikutnya
+    def cancel(self):
+        if self.thread is None:
+            return
+        if not self.finished:
+            self.ai.stop()
+            self.thread.join()
+            # Task-nya bisa saja sudah selesai sendiri tepat sebelum stop() dipanggil,
+            # jadi flag stop-nya dibersihkan di sini supaya tidak membatalkan pencarian berikutnya
+            self.ai.stop_event.clear()
+        self.reset()
+
+    # Lupakan hasil pencarian terakhir, supaya worker siap untuk start() berikutnya
+    def reset(self):
+        self.thread = None
+        self.result = None
+        self.error = None
+        self.finished = False
+        self.started_at = None
@@ -0,0 +1,193 @@
+import argparse
+import collections
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from game_logic import AIPlayer, BLACK_PIECE, WHITE_PIECE, SEARCH_ALGORITHMS, square_name, game_from_string
+from search_stats import json_score
+from records import PositionReader, PositionWriter, LABEL_SEARCH_SCORE, record_kind, position_string
+
+# --- Batch Position Analysis ---
+# Baca posisi (1 board string per baris, lihat game_from_string) dari file atau stdin, cari best move-nya di beberapa
+# worker process, dan tulis hasilnya sebagai JSON lines dengan urutan yang sama seperti input
+# Input dibaca sambil jalan dan jumlah posisi yang sedang dikerjakan dibatasi, jadi file sebesar apapun tidak dimuat ke memory
+#
+# Contoh:
+#   python analyze.py positions.txt --depth 6 --output results.jsonl
+#   cat positions.txt | python analyze.py --movetime 200 > results.jsonl
+#
+# Baris kosong dan baris yang diawali "#" dilewati
+# Posisi tanpa legal move ditulis dengan "move": "pass", atau "move": "none" (plus selisih disk akhir sebagai score)
+# kalau kedua pihak sudah tidak bisa jalan
+# Input juga boleh file posisi biner dari records.py (dikenali dari header-nya, "line" = nomor record mulai dari 1),
+# dan --positions-out menyimpan posisi yang dianalisis beserta score AI-nya ke file posisi biner
+
+# Berapa posisi per worker yang boleh menunggu / dikerjakan sekaligus
+IN_FLIGHT_PER_WORKER = 4
+
+
+# --- Bagian yang jalan di dalam worker process ---
+# Setiap worker membuat AIPlayer-nya sendiri sekali saja (1 per warna), jadi transposition table-nya tetap dipakai antar posisi
+_worker_config = None
+_worker_ais = {}
+
+
+def _init_worker(config):
+    global _worker_config
+    _worker_config = config
+
+
+def _worker_ai(piece):
+    ai = _worker_ais.get(piece)
+    if ai is None:
+        ai = AIPlayer(
+            piece,
+            difficulty_depth=_worker_config["depth"],
+            tt_size_mb=_worker_config["tt_mb"],
+            endgame_empties=_worker_config["endgame"],
+            opening_book=_worker_config["book"],
+            stats_callback=None,
+            evaluator=_worker_config["eval"],
+            search_algorithm=_worker_config["search"],
+            probcut=_worker_config["probcut"],
+            probcut_confidence=_worker_config["probcut_confidence"],
+        )
+        _worker_ais[piece] = ai
+    return ai
+
+
+def analyze_position(line_number, text):
+    result = {"line": line_number, "position": text}
+    try:
+        game = game_from_string(text, backend="bitboard")
+    except ValueError as error:
+        result["error"] = str(error)
+        return result
+
+    if not game.get_valid_moves():
+        opponent = WHITE_PIECE if game.current_player == BLACK_PIECE else BLACK_PIECE
+        if game.has_any_move(opponent):
+            result["move"] = "pass"
+        else:
+            # Game over: tidak ada move untuk kedua pihak, score = selisih disk akhir dari sudut pandang pihak yang jalan
+            result["move"] = "none"
+            result["score"] = game.disc_count[game.current_player] - game.disc_count[opponent]
+        return result
+
+    ai = _worker_ai(game.current_player)
+    stats = ai.search(game, time_limit_ms=_worker_config["movetime"])
+    result.update({
+        "move": square_name(*stats.move),
+        "score": json_score(stats.score),
+        "nodes": stats.nodes,
+        "depth": stats.depth,
+        "source": stats.source,
+        "ms": round(stats.seconds * 1000, 1),
+    })
+    return result
+
+
+# --- Bagian yang jalan di proses utama ---
+def read_positions(lines):
+    for line_number, line in enumerate(lines, start=1):
+        text = line.strip()
+        if text and not text.startswith("#"):
+            yield line_number, text
+
+
+def read_position_records(reader):
+    for index, (black, white, side, _) in enumerate(reader, start=1):
+        yield index, position_string(black, white, side)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze a stream of positions (one board string per line)")
+    parser.add_argument("input", nargs="?", default="-", help="positions file ('-' for stdin)")
+    parser.add_argument("--output", default="-", help="JSON lines output file ('-' for stdout)")
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--movetime", type=int, default=None, help="time limit per position in ms (depth becomes a minimum)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--tt-mb", type=int, default=32, help="transposition table size per worker and side")
+    parser.add_argument("--endgame", type=int, default=12, help="solve exactly at this many empty squares or fewer (0 = off)")
+    parser.add_argument("--book", default=None, help="opening book file")
+    parser.add_argument("--eval", default=None, help="'pattern' or a pattern evaluator weight file (default: positional weights)")
+    parser.add_argument("--search", choices=SEARCH_ALGORITHMS, default="alphabeta", help="search algorithm")
+    parser.add_argument("--probcut", default=None, help="Multi-ProbCut parameters for --search pvs: 'default' or a probcut.py file")
+    parser.add_argument("--probcut-confidence", type=float, default=None, help="ProbCut confidence in sigmas")
+    parser.add_argument("--positions-out", help="append analyzed positions with their scores to this binary position file")
+    args = parser.parse_args(argv)
+
+    config = {
+        "depth": args.depth,
+        "movetime": args.movetime,
+        "tt_mb": args.tt_mb,
+        "endgame": args.endgame,
+        "book": args.book,
+        "eval": args.eval,
+        "search": args.search,
+        "probcut": args.probcut,
+        "probcut_confidence": args.probcut_confidence,
+    }
+
+    if args.input != "-" and record_kind(args.input) == "positions":
+        source = PositionReader(args.input)
+        positions_in = read_position_records(source)
+    else:
+        source = sys.stdin if args.input == "-" else open(args.input)
+        positions_in = read_positions(source)
+    output = sys.stdout if args.output == "-" else open(args.output, "w")
+    position_writer = PositionWriter(args.positions_out, LABEL_SEARCH_SCORE) if args.positions_out else None
+    max_in_flight = max(1, args.workers) * IN_FLIGHT_PER_WORKER
+
+    positions = 0
+    errors = 0
+    total_nodes = 0
+    started = time.perf_counter()
+
+    def write(result):
+        nonlocal positions, errors, total_nodes
+        output.write(json.dumps(result) + "\n")
+        output.flush()
+        positions += 1
+        errors += "error" in result
+        total_nodes += result.get("nodes", 0)
+        if position_writer is not None and "score" in result:
+            score = result["score"]
+            if score == "win":
+                score = float("inf")
+            elif score == "loss":
+                score = float("-inf")
+            position_writer.write_game_state(game_from_string(result["position"]), score)
+
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(config,)) as executor:
+            # Hasil ditulis sesuai urutan input: future paling tua ditunggu dulu setiap kali antriannya penuh
+            pending = collections.deque()
+            for line_number, text in positions_in:
+                pending.append(executor.submit(analyze_position, line_number, text))
+                if len(pending) >= max_in_flight:
+                    write(pending.popleft().result())
+            while pending:
+                write(pending.popleft().result())
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+        if position_writer is not None:
+            position_writer.close()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"{positions} positions ({errors} errors) in {elapsed:.1f}s: "
+        f"{positions / elapsed if elapsed > 0 else 0:.1f} positions/s, "
+        f"{total_nodes / elapsed if elapsed > 0 else 0:.0f} nodes/s with {args.workers} workers",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from game_logic import GameLogic, AIPlayer, BACKENDS, SEARCH_ALGORITHMS, parse_square, board_to_string, game_from_string
+from search_stats import json_score
+
+# --- Benchmark Suite ---
+# 1. Perft: hitung jumlah posisi sampai kedalaman tertentu, untuk memvalidasi generate_moves / make_move / unmake_move
+#    (dan mengukur kecepatannya). Pass dihitung sebagai 1 ply, posisi game over dihitung sebagai 1 leaf
+# 2. Search: find_best_move dengan depth tetap di beberapa posisi, diukur nodes/sec, waktu, dan peak memory
+# 3. Eval: biaya 1 evaluasi leaf (microsecond) untuk loop POSITIONAL_WEIGHTS, versi incremental-nya, dan pattern evaluator
+# 4. Algorithm compare (--compare-algorithms): search dijalankan dengan alphabeta dan pvs di depth yang sama,
+#    move dan score-nya harus sama persis, yang dibandingkan jumlah node-nya
+# 5. ProbCut (--probcut): pvs dengan dan tanpa Multi-ProbCut diberi batas waktu yang sama per posisi,
+#    yang dibandingkan depth yang sempat selesai (plus move, score, dan jumlah node-nya)
+#
+# Contoh:
+#   python benchmark.py --output bench.json
+#   python benchmark.py --output new.json --compare bench.json
+#   python benchmark.py --skip-perft --skip-eval --compare-algorithms --search-depth 6
+#   python benchmark.py --skip-perft --skip-search --skip-eval --probcut default --probcut-time 5000
+
+# Jumlah perft dari posisi awal (nilai standar Othello, pass dihitung)
+START_PERFT = [1, 4, 12, 56, 244, 1396, 8200, 55092, 390216, 3005288, 24571284]
+
+# Posisi uji, ditulis sebagai urutan move dari posisi awal (pass tidak ditulis, langsung diganti giliran)
+# (nama, move-move, depth perft, jumlah perft yang diharapkan)
+# Beda dengan START_PERFT, jumlah untuk posisi-posisi ini dihasilkan oleh perft di file ini sendiri (backend list dan
+# bitboard, yang move generator-nya terpisah, menghasilkan angka yang sama), jadi yang ditangkap hanya regresi
+# Dengan --backend all kedua backend dicek terhadap angka yang sama
+PERFT_POSITIONS = [
+    ("midgame", "f5f4f3f6d3f2g6c3b3b2g4g3b1d2c4c5f1g2g1g5", 5, 301264),
+    ("endgame", "e6f6g6d6c6g7g8b6c4h8f7e3f2e7f5c3d3h5b2g5h7c5a6a7b4d7h4a1c2a3b5h6a2a4d8h3f8d2b3c8a5e8c1f4f3g1", 7, 127694),
+    ("passes", "d3c3e6d2d1e1b2c1a3a1b4b3d6b5f4e3f3e2a5g5b6b7f5f6c7g3h3c2e7c5h5d7g6e8f2h7g4g2f7h6g7f8a4c4h8a7g1f1a2h4c6b1", 10, 6718),
+]
+
+# Posisi untuk benchmark search (nama, move-move)
+SEARCH_POSITIONS = [
+    ("start", ""),
+    ("midgame", PERFT_POSITIONS[0][1]),
+    ("endgame", PERFT_POSITIONS[1][1]),
+]
+
+
+def play_moves(moves, backend):
+    game = GameLogic(backend=backend)
+    for index in range(0, len(moves), 2):
+        if not game.get_valid_moves():
+            game.switch_player()
+        row, col = parse_square(moves[index:index + 2])
+        if not game.is_valid_move(row, col):
+            raise ValueError(f"Illegal move {moves[index:index + 2]} in {moves!r}")
+        game.make_move(row, col)
+    return game
+
+
+def perft(game, depth, passed=False):
+    if depth == 0:
+        return 1
+
+    # Di depth 1 cukup dihitung jumlahnya, flips-nya tidak dipakai
+    moves = game.get_valid_moves() if depth == 1 else game.generate_moves()
+    if not moves:
+        if passed:
+            # Dua pihak sama-sama tidak bisa jalan: game over
+            return 1
+        game.switch_player()
+        try:
+            return perft(game, depth - 1, True)
+        finally:
+            game.switch_player()
+
+    if depth == 1:
+        return len(moves)
+
+    total = 0
+    for (row, col), flips in moves.items():
+        undo = game.make_move(row, col, flips)
+        total += perft(game, depth - 1)
+        game.unmake_move(undo)
+    return total
+
+
+def run_perft(backends, start_depth):
+    results = []
+    cases = [("start", "", start_depth, START_PERFT[start_depth])] + PERFT_POSITIONS
+    for name, moves, depth, expected in cases:
+        for backend in backends:
+            game = play_moves(moves, backend)
+            hash_before = game.hash
+            started = time.perf_counter()
+            count = perft(game, depth)
+            elapsed = time.perf_counter() - started
+            if game.hash != hash_before:
+                raise AssertionError(f"{backend}: make/unmake did not restore the position for {name}")
+            results.append({
+                "name": name,
+                "backend": backend,
+                "depth": depth,
+                "count": count,
+                "expected": expected,
+                "ok": count == expected,
+                "seconds": round(elapsed, 4),
+                "nodes_per_second": round(count / elapsed) if elapsed > 0 else None,
+            })
+    return results
+
+
+def run_search(backend, depth, measure_memory, evaluator=None, algorithm="alphabeta"):
+    results = []
+    for name, moves in SEARCH_POSITIONS:
+        game = play_moves(moves, backend)
+        # endgame_empties=0 supaya yang diukur benar-benar alpha_beta dengan depth tetap
+        ai = AIPlayer(game.current_player, difficulty_depth=depth, endgame_empties=0, stats_callback=None,
+                      evaluator=evaluator, search_algorithm=algorithm)
+        started = time.perf_counter()
+        stats = ai.search(game)
+        elapsed = time.perf_counter() - started
+        result = {
+            "name": name,
+            "backend": backend,
+            "algorithm": algorithm,
+            "depth": depth,
+            "move": stats.move,
+            "score": json_score(stats.score),
+            "nodes": stats.nodes,
+            "leaf_evals": stats.leaf_evals,
+            "cutoffs": stats.cutoffs,
+            "effective_branching_factor": round(stats.effective_branching_factor(), 3),
+            "tt_hit_rate": round(stats.tt_hit_rate(), 4),
+            "seconds": round(elapsed, 4),
+            "nodes_per_second": round(stats.nodes / elapsed) if elapsed > 0 else None,
+        }
+
+        # Memory diukur di run terpisah, karena tracemalloc membuat search-nya jauh lebih lambat
+        if measure_memory:
+            ai = AIPlayer(game.current_player, difficulty_depth=depth, endgame_empties=0, stats_callback=None,
+                          evaluator=evaluator, search_algorithm=algorithm)
+            tracemalloc.start()
+            try:
+                ai.search(game)
+                result["peak_memory_kb"] = round(tracemalloc.get_traced_memory()[1] / 1024)
+            finally:
+                tracemalloc.stop()
+
+        ai.close()
+        results.append(result)
+    return results
+
+
+# Iterative deepening dengan batas waktu time_ms per posisi, pvs tanpa ProbCut lalu dengan ProbCut
+def run_probcut(backend, spec, time_ms, confidence=None, evaluator=None):
+    results = []
+    for name, moves in SEARCH_POSITIONS:
+        game = play_moves(moves, backend)
+        for probcut in (None, spec):
+            ai = AIPlayer(game.current_player, difficulty_depth=1, endgame_empties=0, stats_callback=None,
+                          evaluator=evaluator, search_algorithm="pvs", probcut=probcut, probcut_confidence=confidence)
+            stats = ai.search(game, time_limit_ms=time_ms)
+            results.append({
+                "name": name,
+                "backend": backend,
+                "probcut": probcut,
+                "confidence": ai.probcut.confidence if ai.probcut is not None else None,
+                "time_ms": time_ms,
+                "depth": stats.depth,
+                "move": stats.move,
+                "score": json_score(stats.score),
+                "nodes": stats.nodes,
+                "probcut_cuts": stats.probcut_cuts,
+                "seconds": round(stats.seconds, 4),
+            })
+            ai.close()
+    return results
+
+
+# Semua posisi yang dicapai setelah plies move dari posisi-posisi SEARCH_POSITIONS, sebagai game terpisah
+def leaf_positions(backend, plies):
+    games = []
+
+    def walk(game, depth):
+        valid_moves = game.get_valid_moves()
+        if depth == 0 or not valid_moves:
+            games.append(game_from_string(board_to_string(game), backend))
+            return
+        for row, col in valid_moves:
+            undo = game.make_move(row, col)
+            walk(game, depth - 1)
+            game.unmake_move(undo)
+
+    for _, moves in SEARCH_POSITIONS:
+        walk(play_moves(moves, backend), plies)
+    return games
+
+
+def run_eval(backend, evaluators, rounds=20):
+    games = leaf_positions(backend, 2)
+    boards = [game.board for game in games]
+    ais = {"weights": AIPlayer(games[0].current_player, stats_callback=None)}
+    for spec in evaluators:
+        ais[spec] = AIPlayer(games[0].current_player, stats_callback=None, evaluator=spec)
+
+    def timed(evaluate, items):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            for item in items:
+                evaluate(item, False)
+        return (time.perf_counter() - started) / (rounds * len(items)) * 1e6
+
+    # "weights_loop" = scan 64 kotak seperti evaluate_board (board list-nya sudah dibuat duluan, jadi yang diukur hanya loop-nya)
+    results = [{"name": "weights_loop", "backend": backend, "us_per_leaf": timed(ais["weights"].evaluate_board, boards)}]
+    for name, ai in ais.items():
+        results.append({"name": name, "backend": backend, "us_per_leaf": timed(ai.evaluate, games)})
+    for item in results:
+        item["us_per_leaf"] = round(item["us_per_leaf"], 3)
+        item["positions"] = len(games)
+    return results
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Bandingkan jumlah node alphabeta vs pvs per posisi; return False kalau ada move / score yang berbeda
+def compare_algorithms(results):
+    by_key = {(item["name"], item["backend"], item["algorithm"]): item for item in results}
+    identical = True
+    for item in results:
+        if item["algorithm"] != "alphabeta":
+            continue
+        pvs = by_key.get((item["name"], item["backend"], "pvs"))
+        if pvs is None:
+            continue
+        same = item["move"] == pvs["move"] and item["score"] == pvs["score"]
+        identical = identical and same
+        status = "identical" if same else f"DIFFERENT (pvs move {pvs['move']} score {pvs['score']})"
+        print(
+            f"algo   {item['name']:8} {item['backend']:8} depth {item['depth']}: "
+            f"alphabeta {item['nodes']} nodes, pvs {pvs['nodes']} nodes ({pvs['nodes'] / item['nodes'] - 1:+.1%}), "
+            f"{item['seconds']:.2f}s -> {pvs['seconds']:.2f}s, {status}"
+        )
+    return identical
+
+
+# Bandingkan nodes/sec dengan hasil benchmark sebelumnya (positif = lebih cepat)
+def compare(report, previous):
+    old_results = {
+        (item["name"], item["backend"], item.get("algorithm", "alphabeta"), item["depth"]): item
+        for item in previous.get("search", [])
+    }
+    for item in report["search"]:
+        old = old_results.get((item["name"], item["backend"], item["algorithm"], item["depth"]))
+        if old is None or not old.get("nodes_per_second") or not item["nodes_per_second"]:
+            continue
+        change = item["nodes_per_second"] / old["nodes_per_second"] - 1
+        nodes_note = "" if old["nodes"] == item["nodes"] else f", nodes {old['nodes']} -> {item['nodes']}"
+        print(
+            f"search {item['name']:8} {item['backend']:8} depth {item['depth']}: "
+            f"{old['nodes_per_second']} -> {item['nodes_per_second']} nodes/s ({change:+.1%}){nodes_note}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Perft validation, fixed-depth search and fixed-time ProbCut benchmark")
+    parser.add_argument("--backend", choices=BACKENDS + ("all",), default="all")
+    parser.add_argument("--perft-depth", type=int, default=6, choices=range(1, len(START_PERFT)), metavar="DEPTH",
+                        help=f"perft depth from the start position (1-{len(START_PERFT) - 1})")
+    parser.add_argument("--search-depth", type=int, default=5)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak memory runs")
+    parser.add_argument("--skip-perft", action="store_true")
+    parser.add_argument("--skip-search", action="store_true")
+    parser.add_argument("--skip-eval", action="store_true")
+    parser.add_argument("--eval", help="evaluator for the search benchmark: 'pattern' or a weight file (default: positional weights)")
+    parser.add_argument("--algorithm", choices=SEARCH_ALGORITHMS, default="alphabeta", help="search algorithm for the search benchmark")
+    parser.add_argument("--compare-algorithms", action="store_true",
+                        help="run the search benchmark with every algorithm and check that moves and scores are identical")
+    parser.add_argument("--probcut", help="ProbCut parameters ('default' or a file) to compare against plain pvs at a fixed time")
+    parser.add_argument("--probcut-time", type=int, default=3000, help="time per position in ms for the ProbCut comparison")
+    parser.add_argument("--probcut-confidence", type=float, default=None, help="ProbCut confidence in sigmas")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="previous JSON results to compare nodes/sec against")
+    args = parser.parse_args(argv)
+
+    backends = BACKENDS if args.backend == "all" else (args.backend,)
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "perft": [],
+        "search": [],
+        "eval": [],
+        "probcut": [],
+    }
+
+    if not args.skip_perft:
+        report["perft"] = run_perft(backends, args.perft_depth)
+        for item in report["perft"]:
+            status = "ok" if item["ok"] else f"FAILED (expected {item['expected']})"
+            print(
+                f"perft  {item['name']:8} {item['backend']:8} depth {item['depth']:2}: "
+                f"{item['count']:>9} {status}, {item['seconds']:.2f}s, {item['nodes_per_second']} nodes/s"
+            )
+
+    identical = True
+    if not args.skip_search:
+        algorithms = SEARCH_ALGORITHMS if args.compare_algorithms else (args.algorithm,)
+        for backend in backends:
+            for algorithm in algorithms:
+                report["search"] += run_search(backend, args.search_depth, not args.no_memory, args.eval, algorithm)
+        for item in report["search"]:
+            memory = f", peak {item['peak_memory_kb']} KB" if "peak_memory_kb" in item else ""
+            print(
+                f"search {item['name']:8} {item['backend']:8} {item['algorithm']:9} depth {item['depth']}: move {item['move']} "
+                f"score {item['score']}, {item['nodes']} nodes, {item['seconds']:.2f}s, "
+                f"{item['nodes_per_second']} nodes/s{memory}"
+            )
+        if args.compare_algorithms:
+            identical = compare_algorithms(report["search"])
+
+    if not args.skip_eval:
+        evaluators = ["pattern"] + ([args.eval] if args.eval and args.eval != "pattern" else [])
+        for backend in backends:
+            report["eval"] += run_eval(backend, evaluators)
+        for item in report["eval"]:
+            print(f"eval   {item['name']:14} {item['backend']:8}: {item['us_per_leaf']:.2f} us per leaf")
+
+    if args.probcut:
+        for backend in backends:
+            report["probcut"] += run_probcut(backend, args.probcut, args.probcut_time, args.probcut_confidence, args.eval)
+        for item in report["probcut"]:
+            label = f"probcut {item['confidence']}" if item["probcut"] else "plain"
+            print(
+                f"mpc    {item['name']:8} {item['backend']:8} {label:12} {item['time_ms']} ms: depth {item['depth']}, "
+                f"move {item['move']} score {item['score']}, {item['nodes']} nodes, {item['probcut_cuts']} cuts"
+            )
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+    if args.compare:
+        with open(args.compare) as previous:
+            compare(report, json.load(previous))
+
+    if not all(item["ok"] for item in report["perft"]) or not identical:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
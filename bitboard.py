@@ -0,0 +1,274 @@
+# --- Bitboard helpers ---
+# Papan direpresentasikan sebagai 2 integer 64-bit, satu untuk tiap warna
+# Bit ke-(row * 8 + col) menyala kalau kotak (row, col) berisi disk warna tersebut
+# Semua fungsi di sini murni (tidak menyimpan state), jadi bisa dipakai oleh GameLogic maupun AI
+
+FULL_MASK = 0xFFFFFFFFFFFFFFFF
+
+# Mask untuk mencegah "wrap around" waktu bit digeser ke kiri/kanan
+# Kalau digeser ke timur (col + 1), bit yang jatuh di kolom 0 berarti berasal dari kolom 7 di baris sebelumnya
+NOT_COL_0 = 0xFEFEFEFEFEFEFEFE
+NOT_COL_7 = 0x7F7F7F7F7F7F7F7F
+
+# Masing-masing arah disimpan sebagai (besar shift, mask setelah shift)
+# Shift positif = geser ke kiri (<<), shift negatif = geser ke kanan (>>)
+# Urutannya sama dengan direction vector (dr, dc) di GameLogic
+DIRECTIONS = [
+    (-9, NOT_COL_7), # (-1, -1)
+    (-8, FULL_MASK), # (-1,  0)
+    (-7, NOT_COL_0), # (-1,  1)
+    (-1, NOT_COL_7), # ( 0, -1)
+    ( 1, NOT_COL_0), # ( 0,  1)
+    ( 7, NOT_COL_7), # ( 1, -1)
+    ( 8, FULL_MASK), # ( 1,  0)
+    ( 9, NOT_COL_0), # ( 1,  1)
+]
+
+
+def square_bit(row, col):
+    return 1 << (row * 8 + col)
+
+
+def popcount(mask):
+    return mask.bit_count()
+
+
+# Iterasi semua index bit yang menyala, dari bit terendah (urutan raster: baris demi baris)
+def iter_squares(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def shift(mask, amount, wrap_mask):
+    if amount > 0:
+        return (mask << amount) & wrap_mask & FULL_MASK
+    return (mask >> -amount) & wrap_mask
+
+
+# Disk lawan di kolom 1-6; untuk arah yang bergerak ke samping, deretan lawan yang bisa dibalik tidak mungkin
+# ada di kolom 0 / 7, jadi wrap around sudah tercegah dengan menyaring lawannya sekali (bukan setiap shift)
+INNER_COLS = 0x7E7E7E7E7E7E7E7E
+
+
+# Semua kotak kosong yang merupakan legal move untuk player (p) melawan opponent (o)
+# Per arah: "isi" deretan disk lawan yang bersebelahan dengan disk kita (maksimal 6 disk),
+# lalu satu langkah lagi harus jatuh di kotak kosong. Setiap besar shift dipakai untuk 2 arah yang berlawanan
+# Hasil shift ke kiri tidak perlu dipotong ke 64 bit, karena selalu di-AND dengan mask yang sudah 64 bit
+def legal_moves(p, o):
+    empty = ~(p | o) & FULL_MASK
+    moves = 0
+    inner = o & INNER_COLS
+    for amount, o_mask in ((1, inner), (8, o), (7, inner), (9, inner)):
+        x = (p << amount) & o_mask
+        x |= (x << amount) & o_mask
+        x |= (x << amount) & o_mask
+        x |= (x << amount) & o_mask
+        x |= (x << amount) & o_mask
+        x |= (x << amount) & o_mask
+        moves |= (x << amount) & empty
+        x = (p >> amount) & o_mask
+        x |= (x >> amount) & o_mask
+        x |= (x >> amount) & o_mask
+        x |= (x >> amount) & o_mask
+        x |= (x >> amount) & o_mask
+        x |= (x >> amount) & o_mask
+        moves |= (x >> amount) & empty
+    return moves
+
+
+# Sama dengan legal_moves(p, o) != 0, tapi berhenti di pasangan arah pertama yang punya legal move
+# Dipakai di leaf pencarian (cek pass / game over), di mana jumlah move-nya tidak dibutuhkan
+def has_legal_move(p, o):
+    empty = ~(p | o) & FULL_MASK
+    inner = o & INNER_COLS
+    for amount, o_mask in ((1, inner), (8, o), (7, inner), (9, inner)):
+        x = (p << amount) & o_mask
+        x |= (x << amount) & o_mask
+        x |= (x << amount) & o_mask
+        x |= (x << amount) & o_mask
+        x |= (x << amount) & o_mask
+        x |= (x << amount) & o_mask
+        if (x << amount) & empty:
+            return True
+        x = (p >> amount) & o_mask
+        x |= (x >> amount) & o_mask
+        x |= (x >> amount) & o_mask
+        x |= (x >> amount) & o_mask
+        x |= (x >> amount) & o_mask
+        x |= (x >> amount) & o_mask
+        if (x >> amount) & empty:
+            return True
+    return False
+
+
+# Ray per kotak: RAYS[square] = list (mask ray, arah naik?) untuk setiap arah yang panjangnya minimal 2 kotak
+# (ray sepanjang 1 kotak tidak mungkin membalik apa-apa). Mask-nya tidak termasuk kotak asalnya, dan dihitung sekali di sini
+# jadi flips_for_move tidak perlu bounds check atau wrap mask sama sekali
+def _build_rays():
+    rays = []
+    for square in range(64):
+        row, col = square >> 3, square & 7
+        square_rays = []
+        for dr, dc in [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]:
+            mask = 0
+            r, c = row + dr, col + dc
+            while 0 <= r < 8 and 0 <= c < 8:
+                mask |= 1 << (r * 8 + c)
+                r += dr
+                c += dc
+            if mask.bit_count() >= 2:
+                square_rays.append((mask, dr * 8 + dc > 0))
+        rays.append(square_rays)
+    return rays
+
+
+RAYS = _build_rays()
+
+
+# Mask dari semua disk lawan yang akan dibalik kalau player menaruh disk di square
+# Hasilnya 0 kalau move tersebut tidak valid
+# Per ray: kotak pertama yang BUKAN disk lawan (bit terendah untuk arah naik, tertinggi untuk arah turun) harus disk sendiri,
+# dan semua kotak ray di antaranya dibalik
+def flips_for_move(p, o, square):
+    flipped = 0
+    not_o = ~o
+    for ray, ascending in RAYS[square]:
+        blockers = ray & not_o
+        if ascending:
+            first = blockers & -blockers
+            if first & p:
+                flipped |= ray & (first - 1)
+        elif blockers:
+            first = 1 << (blockers.bit_length() - 1)
+            if first & p:
+                flipped |= ray & ~((first << 1) - 1)
+    return flipped
+
+
+# Konversi dari board list 8x8 (format GameLogic) ke pasangan mask (black, white)
+def board_to_masks(board, black_piece, white_piece):
+    black = 0
+    white = 0
+    for r in range(8):
+        for c in range(8):
+            if board[r][c] == black_piece:
+                black |= 1 << (r * 8 + c)
+            elif board[r][c] == white_piece:
+                white |= 1 << (r * 8 + c)
+    return black, white
+
+
+# Kebalikan dari board_to_masks, dipakai supaya UI tetap bisa membaca game.board seperti biasa
+def masks_to_board(black, white, black_piece, white_piece, empty):
+    board = [[empty] * 8 for _ in range(8)]
+    for square in iter_squares(black):
+        board[square >> 3][square & 7] = black_piece
+    for square in iter_squares(white):
+        board[square >> 3][square & 7] = white_piece
+    return board
+
+
+# Key 64-bit untuk sebuah posisi dari sudut pandang player yang sedang jalan (player, opponent)
+# Berbeda dengan Zobrist hash di GameLogic, key ini tidak tergantung urutan move / tabel random,
+# jadi stabil untuk disimpan di file (misalnya opening book)
+def position_key(player, opponent):
+    return _mix64(player ^ _mix64(opponent ^ 0x9E3779B97F4A7C15))
+
+
+# Finalizer dari SplitMix64: mengacak semua bit supaya key-nya tersebar rata
+def _mix64(value):
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & FULL_MASK
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EB & FULL_MASK
+    return value ^ (value >> 31)
+
+
+# --- Symmetry ---
+# Papan Reversi punya 8 simetri (4 rotasi x cermin), dan posisi awal simetris terhadap 4 di antaranya
+# Simetri ke-s (0-7) = kombinasi dari 3 transformasi dasar yang dijalankan berurutan:
+#   bit 0: cermin kiri-kanan (col -> 7 - col), bit 1: cermin atas-bawah (row -> 7 - row), bit 2: transpose (row <-> col)
+# Semuanya dihitung langsung di mask 64-bit dengan delta swap, tanpa memutar list 8x8
+
+# Balik urutan bit di dalam setiap byte (= setiap baris), jadi kolom 0 <-> 7, 1 <-> 6, ...
+def mirror_horizontal(mask):
+    mask = ((mask >> 1) & 0x5555555555555555) | ((mask & 0x5555555555555555) << 1)
+    mask = ((mask >> 2) & 0x3333333333333333) | ((mask & 0x3333333333333333) << 2)
+    return ((mask >> 4) & 0x0F0F0F0F0F0F0F0F) | ((mask & 0x0F0F0F0F0F0F0F0F) << 4)
+
+
+# Balik urutan byte (= urutan baris), jadi baris 0 <-> 7, 1 <-> 6, ...
+def flip_vertical(mask):
+    return int.from_bytes(mask.to_bytes(8, "little"), "big")
+
+
+# Cermin di diagonal utama a1-h8: kotak (row, col) pindah ke (col, row)
+def flip_diagonal(mask):
+    t = 0x0F0F0F0F00000000 & (mask ^ (mask << 28))
+    mask ^= t ^ (t >> 28)
+    t = 0x3333000033330000 & (mask ^ (mask << 14))
+    mask ^= t ^ (t >> 14)
+    t = 0x5500550055005500 & (mask ^ (mask << 7))
+    return mask ^ t ^ (t >> 7)
+
+
+def transform(mask, symmetry):
+    if symmetry & 1:
+        mask = mirror_horizontal(mask)
+    if symmetry & 2:
+        mask = flip_vertical(mask)
+    if symmetry & 4:
+        mask = flip_diagonal(mask)
+    return mask
+
+
+def _build_symmetry_squares():
+    tables = []
+    for symmetry in range(8):
+        table = []
+        for square in range(64):
+            row, col = square >> 3, square & 7
+            if symmetry & 1:
+                col = 7 - col
+            if symmetry & 2:
+                row = 7 - row
+            if symmetry & 4:
+                row, col = col, row
+            table.append(row * 8 + col)
+        tables.append(table)
+    return tables
+
+
+# SYMMETRY_SQUARES[s][square] = kotak tujuan square setelah simetri s (sama dengan transform() untuk 1 bit)
+# SYMMETRY_INVERSE[s] = simetri yang mengembalikan hasil simetri s ke posisi aslinya
+SYMMETRY_SQUARES = _build_symmetry_squares()
+SYMMETRY_INVERSE = [
+    next(inverse for inverse in range(8)
+         if all(SYMMETRY_SQUARES[inverse][SYMMETRY_SQUARES[symmetry][square]] == square for square in range(64)))
+    for symmetry in range(8)
+]
+
+
+# Bentuk kanonik sebuah posisi: (player, opponent) terkecil dari ke-8 simetrinya, beserta simetri yang menghasilkannya
+# Posisi-posisi yang hanya berbeda rotasi / cermin punya bentuk kanonik yang sama
+# 4 simetri tanpa transpose dihitung dulu, lalu masing-masing di-transpose (totalnya 3 + 4 transformasi per mask)
+def canonical(player, opponent):
+    player_m, opponent_m = mirror_horizontal(player), mirror_horizontal(opponent)
+    candidates = [
+        (player, opponent, 0),
+        (player_m, opponent_m, 1),
+        (flip_vertical(player), flip_vertical(opponent), 2),
+        (flip_vertical(player_m), flip_vertical(opponent_m), 3),
+    ]
+    best = min(candidates)
+    for p, o, symmetry in candidates:
+        candidate = (flip_diagonal(p), flip_diagonal(o), symmetry | 4)
+        if candidate < best:
+            best = candidate
+    return best
+
+
+# position_key dari bentuk kanonik, return (key, simetri); key-nya sama untuk ke-8 simetri sebuah posisi
+def canonical_key(player, opponent):
+    player, opponent, symmetry = canonical(player, opponent)
+    return position_key(player, opponent), symmetry
@@ -0,0 +1,230 @@
+import time
+
+from bitboard import FULL_MASK, legal_moves, flips_for_move, iter_squares, popcount
+
+# --- Exact Endgame Solver ---
+# Kalau kotak kosongnya tinggal sedikit, AI tidak perlu heuristic lagi: seluruh sisa game bisa dicari sampai habis
+# Solver ini bekerja langsung di bitboard (player, opponent) dengan negamax, dan score-nya adalah
+# selisih disk di akhir game dari sudut pandang player yang sedang jalan (positif = menang)
+
+# 4 kuadran papan, untuk parity ordering
+QUADRANTS = [
+    0x000000000F0F0F0F, # kiri atas
+    0x00000000F0F0F0F0, # kanan atas
+    0x0F0F0F0F00000000, # kiri bawah
+    0xF0F0F0F000000000, # kanan bawah
+]
+QUADRANT_OF = [0] * 64
+for _index, _mask in enumerate(QUADRANTS):
+    for _square in iter_squares(_mask):
+        QUADRANT_OF[_square] = _index
+
+# Mulai dari jumlah kotak kosong ini, move di-urutkan dengan "fastest-first" (yang paling sedikit memberi move ke lawan)
+# Di bawahnya cukup parity ordering saja, karena menghitung mobility lawan lebih mahal dari manfaatnya
+FASTEST_FIRST_EMPTIES = 7
+
+# Cek deadline / stop setiap 1024 node
+CHECK_INTERVAL_MASK = 1023
+
+
+class EndgameTimeout(Exception):
+    pass
+
+
+class EndgameSolver:
+    def __init__(self):
+        self.nodes = 0
+        self.last_nodes = 0
+        self.last_time = 0.0
+        self.deadline = None
+        self.stop_event = None
+
+    # Selesaikan posisi game sampai akhir
+    # Return (best_move (row, col) atau None kalau harus pass, selisih disk akhir untuk player yang sedang jalan)
+    # Melempar EndgameTimeout kalau deadline lewat atau stop_event diset sebelum selesai
+    def solve(self, game, deadline=None, stop_event=None):
+        player, opponent = game.player_masks()
+        self.nodes = 0
+        self.deadline = deadline
+        self.stop_event = stop_event
+        started = time.perf_counter()
+        try:
+            square, score = self.solve_root(player, opponent)
+        finally:
+            self.last_nodes = self.nodes
+            self.last_time = time.perf_counter() - started
+            self.deadline = None
+            self.stop_event = None
+
+        move = None if square is None else (square >> 3, square & 7)
+        return move, score
+
+    def solve_root(self, player, opponent):
+        moves = legal_moves(player, opponent)
+        if not moves:
+            return None, -self.search(opponent, player, -64, 64, False)
+
+        empty = ~(player | opponent) & FULL_MASK
+        best_square = None
+        alpha = -65
+        for square in self.order_moves(player, opponent, moves, empty):
+            flipped = flips_for_move(player, opponent, square)
+            score = -self.search(opponent & ~flipped, player | flipped | (1 << square), -64, -alpha, False)
+            if score > alpha:
+                alpha = score
+                best_square = square
+        return best_square, alpha
+
+    def check_time(self):
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise EndgameTimeout()
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise EndgameTimeout()
+
+    # Urutan move: fastest-first (mobility lawan paling sedikit) untuk posisi yang masih agak banyak kotak kosongnya,
+    # ditambah parity ordering: kotak di kuadran yang jumlah kotak kosongnya ganjil dicoba duluan
+    # (siapa yang main terakhir di sebuah kuadran biasanya yang untung)
+    def order_moves(self, player, opponent, moves, empty):
+        odd_quadrants = 0
+        for index, quadrant in enumerate(QUADRANTS):
+            if popcount(empty & quadrant) & 1:
+                odd_quadrants |= 1 << index
+
+        if popcount(empty) >= FASTEST_FIRST_EMPTIES:
+            keyed = []
+            for square in iter_squares(moves):
+                flipped = flips_for_move(player, opponent, square)
+                new_player = player | flipped | (1 << square)
+                new_opponent = opponent & ~flipped
+                mobility = popcount(legal_moves(new_opponent, new_player))
+                parity = 0 if (odd_quadrants >> QUADRANT_OF[square]) & 1 else 1
+                keyed.append((mobility * 2 + parity, square))
+            keyed.sort()
+            return [square for _, square in keyed]
+
+        odd = [square for square in iter_squares(moves) if (odd_quadrants >> QUADRANT_OF[square]) & 1]
+        even = [square for square in iter_squares(moves) if not (odd_quadrants >> QUADRANT_OF[square]) & 1]
+        return odd + even
+
+    # Negamax dengan alpha-beta, return selisih disk akhir dari sudut pandang player
+    def search(self, player, opponent, alpha, beta, passed):
+        self.nodes += 1
+        if not (self.nodes & CHECK_INTERVAL_MASK):
+            self.check_time()
+
+        empty = ~(player | opponent) & FULL_MASK
+        empties = popcount(empty)
+        if empties == 0:
+            return popcount(player) - popcount(opponent)
+        if empties == 1:
+            return self.last_1(player, opponent, empty.bit_length() - 1)
+        if empties == 2:
+            return self.last_2(player, opponent, empty, alpha, beta)
+        if empties == 3:
+            return self.last_3(player, opponent, empty, alpha, beta)
+
+        moves = legal_moves(player, opponent)
+        if not moves:
+            if passed:
+                return popcount(player) - popcount(opponent)
+            return -self.search(opponent, player, -beta, -alpha, True)
+
+        best = -65
+        for square in self.order_moves(player, opponent, moves, empty):
+            flipped = flips_for_move(player, opponent, square)
+            score = -self.search(opponent & ~flipped, player | flipped | (1 << square), -beta, -alpha, False)
+            if score > best:
+                best = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+        return best
+
+    # --- Routine khusus untuk 1, 2, dan 3 kotak kosong terakhir ---
+    # Tanpa move generation penuh: cukup coba kotak kosong yang tersisa satu per satu
+
+    # 1 kotak kosong: player main di sana kalau bisa, kalau tidak lawan yang coba, kalau keduanya tidak bisa game selesai
+    def last_1(self, player, opponent, square):
+        self.nodes += 1
+        flipped = flips_for_move(player, opponent, square)
+        if flipped:
+            return popcount(player | flipped) + 1 - popcount(opponent & ~flipped)
+
+        flipped = flips_for_move(opponent, player, square)
+        if flipped:
+            return popcount(player & ~flipped) - (popcount(opponent | flipped) + 1)
+
+        return popcount(player) - popcount(opponent)
+
+    def last_2(self, player, opponent, empty, alpha, beta):
+        self.nodes += 1
+        first = (empty & -empty).bit_length() - 1
+        second = empty.bit_length() - 1
+
+        best = -65
+        for square, other in ((first, second), (second, first)):
+            flipped = flips_for_move(player, opponent, square)
+            if flipped:
+                score = -self.last_1(opponent & ~flipped, player | flipped | (1 << square), other)
+                if score > best:
+                    best = score
+                    if score >= beta:
+                        return best
+        if best != -65:
+            return best
+
+        # Player harus pass, sekarang giliran lawan
+        best = 65
+        for square, other in ((first, second), (second, first)):
+            flipped = flips_for_move(opponent, player, square)
+            if flipped:
+                score = self.last_1(player & ~flipped, opponent | flipped | (1 << square), other)
+                if score < best:
+                    best = score
+                    if score <= alpha:
+                        return best
+        if best != 65:
+            return best
+
+        return popcount(player) - popcount(opponent)
+
+    def last_3(self, player, opponent, empty, alpha, beta):
+        self.nodes += 1
+        squares = list(iter_squares(empty))
+
+        # Parity: kotak yang sendirian di kuadrannya dicoba duluan
+        quadrants = [QUADRANT_OF[square] for square in squares]
+        squares.sort(key=lambda square: quadrants.count(QUADRANT_OF[square]) != 1)
+
+        best = -65
+        for square in squares:
+            flipped = flips_for_move(player, opponent, square)
+            if flipped:
+                rest = empty & ~(1 << square)
+                score = -self.last_2(opponent & ~flipped, player | flipped | (1 << square), rest, -beta, -alpha)
+                if score > best:
+                    best = score
+                    if score > alpha:
+                        alpha = score
+                        if alpha >= beta:
+                            return best
+        if best != -65:
+            return best
+
+        best = 65
+        for square in squares:
+            flipped = flips_for_move(opponent, player, square)
+            if flipped:
+                rest = empty & ~(1 << square)
+                score = self.last_2(player & ~flipped, opponent | flipped | (1 << square), rest, alpha, beta)
+                if score < best:
+                    best = score
+                    if score < beta:
+                        beta = score
+                        if alpha >= beta:
+                            return best
+        if best != 65:
+            return best
+
+        return popcount(player) - popcount(opponent)
@@ -0,0 +1,281 @@
+import argparse
+import math
+import sys
+import threading
+
+from ai_worker import SearchWorker
+from game_logic import (
+    GameLogic, AIPlayer, SEARCH_ALGORITHMS,
+    square_name, parse_square, board_to_string, game_from_string,
+)
+
+# --- Engine Text Protocol ---
+# AIPlayer sebagai process sendiri yang bicara lewat stdin/stdout (1 command per baris), tanpa Pygame
+# Dipakai oleh GUI lain, script batch, atau benchmark. AIPlayer (dan transposition table-nya) tetap hidup
+# selama process-nya jalan, jadi cache-nya tetap "hangat" antar command dan antar game
+#
+# Command:
+#   isready                              -> readyok (juga dijawab langsung selagi mencari)
+#   newgame                              -> kembali ke posisi awal (cache tetap disimpan)
+#   position startpos [moves f5 d6 ...]  -> set posisi dari posisi awal + move-move
+#   position board <board string> [moves ...]
+#                                        -> board string = 64 karakter X/O/- (a1..h1, a2..h8) lalu X atau O
+#   move <square | pass>                 -> mainkan 1 move di posisi sekarang
+#   depth <n>                            -> depth pencarian (dengan batas waktu: depth minimal)
+#   time <ms>                            -> sisa jam untuk pihak yang jalan, dibagi otomatis per move (0 = mati)
+#   movetime <ms>                        -> batas waktu untuk 1 move (0 = mati)
+#   go [depth <n>] [time <ms>] [movetime <ms>]
+#                                        -> mulai mencari di background; setting di sini hanya untuk pencarian ini
+#   stop                                 -> hentikan pencarian, bestmove dari depth terakhir yang selesai tetap dikirim
+#   wait                                 -> tunggu sampai pencarian yang sedang jalan selesai
+#   board                                -> print board string posisi sekarang
+#   quit                                 -> hentikan pencarian (kalau ada) dan keluar
+# Command lain yang mengubah posisi / setting selagi mencari akan menghentikan pencarian itu dulu
+# Kalau stdin selesai (EOF), engine menunggu pencarian yang sedang jalan selesai lalu keluar
+#
+# Output:
+#   info depth <d> score <s> nodes <n> time <ms> nps <n> pv <move>   (setiap iterasi yang selesai)
+#   info source <search|book|ponder|endgame> depth <d> score <s> nodes <n> time <ms>
+#   bestmove <square | pass | none>
+#   info string <pesan>                                              (misalnya error)
+# Score dari sudut pandang pihak yang jalan; "win" / "loss" untuk menang / kalah pasti
+
+DEFAULT_DEPTH = 6
+
+
+def format_score(score):
+    if score == math.inf:
+        return "win"
+    if score == -math.inf:
+        return "loss"
+    return str(score)
+
+
+class Engine:
+    def __init__(self, output=sys.stdout, depth=DEFAULT_DEPTH, tt_size_mb=64, opening_book=None, workers=1, evaluator=None,
+                 search_algorithm="alphabeta", probcut=None, probcut_confidence=None):
+        self.output = output
+        self.output_lock = threading.Lock()
+        self.game = GameLogic(backend="bitboard")
+        self.depth = depth
+        self.time_ms = None
+        self.movetime_ms = None
+        self.tt_size_mb = tt_size_mb
+        self.opening_book = opening_book
+        self.workers = workers
+        self.evaluator = evaluator
+        self.search_algorithm = search_algorithm
+        self.probcut = probcut
+        self.probcut_confidence = probcut_confidence
+        # 1 AIPlayer per warna (AIPlayer selalu mencari dari sudut pandang warnanya sendiri), dibuat saat pertama dipakai
+        self.ais = {}
+        self.worker = None
+
+    def send(self, line):
+        # Dipanggil dari thread utama maupun thread pencarian, jadi baris-barisnya tidak boleh tercampur
+        with self.output_lock:
+            self.output.write(line + "\n")
+            self.output.flush()
+
+    def get_ai(self, piece):
+        ai = self.ais.get(piece)
+        if ai is None:
+            ai = AIPlayer(piece, difficulty_depth=self.depth, tt_size_mb=self.tt_size_mb, workers=self.workers,
+                          opening_book=self.opening_book, stats_callback=self.report, evaluator=self.evaluator,
+                          search_algorithm=self.search_algorithm, probcut=self.probcut,
+                          probcut_confidence=self.probcut_confidence)
+            self.ais[piece] = ai
+        return ai
+
+    def is_searching(self):
+        return self.worker is not None and self.worker.is_running()
+
+    def stop_search(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+
+    def wait_search(self):
+        if self.worker is not None:
+            if self.worker.thread is not None:
+                self.worker.thread.join()
+            self.worker = None
+
+    def close(self):
+        self.stop_search()
+        for ai in self.ais.values():
+            ai.close()
+        self.ais = {}
+
+    # stats_callback dari AIPlayer: 1 baris info per iterasi, dan ringkasannya waktu pencarian selesai
+    def report(self, stats):
+        if stats.finished:
+            if stats.move is not None:
+                self.send(f"info source {stats.source} depth {stats.depth} score {format_score(stats.score)} "
+                          f"nodes {stats.nodes} time {round(stats.seconds * 1000)}")
+            return
+        iteration = stats.iterations[-1]
+        self.send(f"info depth {iteration['depth']} score {format_score(iteration['score'])} nodes {stats.nodes} "
+                  f"time {round(stats.seconds * 1000)} nps {round(stats.nodes_per_second())} "
+                  f"pv {square_name(*iteration['move'])}")
+
+    # Return False kalau engine harus berhenti
+    def handle(self, line):
+        parts = line.split()
+        if not parts:
+            return True
+        command, args = parts[0].lower(), parts[1:]
+
+        if command == "quit":
+            return False
+        if command == "isready":
+            self.send("readyok")
+            return True
+        if command == "stop":
+            self.stop_search()
+            return True
+        if command == "wait":
+            self.wait_search()
+            return True
+
+        handler = getattr(self, f"command_{command}", None)
+        if handler is None:
+            self.send(f"info string error: unknown command {command!r}")
+            return True
+
+        self.stop_search()
+        try:
+            handler(args)
+        except ValueError as error:
+            self.send(f"info string error: {error}")
+        return True
+
+    def command_newgame(self, args):
+        self.game = GameLogic(backend="bitboard")
+        for ai in self.ais.values():
+            ai.ponder_results = {}
+
+    def command_position(self, args):
+        if not args:
+            raise ValueError("position needs 'startpos' or 'board <board string>'")
+        if "moves" in args:
+            moves_index = args.index("moves")
+            setup, moves = args[:moves_index], args[moves_index + 1:]
+        else:
+            setup, moves = args, []
+
+        if setup[0] == "startpos":
+            game = GameLogic(backend="bitboard")
+        elif setup[0] == "board":
+            game = game_from_string(" ".join(setup[1:]), backend="bitboard")
+        else:
+            raise ValueError(f"Unknown position type {setup[0]!r}")
+
+        for move in moves:
+            self.play(game, move)
+        self.game = game
+
+    def command_move(self, args):
+        if len(args) != 1:
+            raise ValueError("move needs exactly one square (or 'pass')")
+        self.play(self.game, args[0])
+
+    def command_depth(self, args):
+        self.depth = self.parse_int(args, "depth", minimum=1)
+
+    def command_time(self, args):
+        self.time_ms = self.parse_int(args, "time", minimum=0) or None
+
+    def command_movetime(self, args):
+        self.movetime_ms = self.parse_int(args, "movetime", minimum=0) or None
+
+    def command_board(self, args):
+        self.send(board_to_string(self.game))
+
+    def command_go(self, args):
+        depth, time_ms, movetime_ms = self.depth, self.time_ms, self.movetime_ms
+        for index in range(0, len(args), 2):
+            name, value = args[index], args[index + 1:index + 2]
+            if name == "depth":
+                depth = self.parse_int(value, "depth", minimum=1)
+            elif name == "time":
+                time_ms = self.parse_int(value, "time", minimum=0) or None
+            elif name == "movetime":
+                movetime_ms = self.parse_int(value, "movetime", minimum=0) or None
+            else:
+                raise ValueError(f"Unknown go option {name!r}")
+
+        game = self.game
+        if not game.get_valid_moves():
+            game.switch_player()
+            has_moves = bool(game.get_valid_moves())
+            game.switch_player()
+            self.send("bestmove pass" if has_moves else "bestmove none")
+            return
+
+        ai = self.get_ai(game.current_player)
+        ai.depth = depth
+        self.worker = SearchWorker(ai)
+        self.worker.start(game, task=lambda game_copy, **kwargs: self.run_search(ai, game_copy, **kwargs),
+                          time_limit_ms=movetime_ms, remaining_ms=time_ms)
+
+    # Jalan di thread pencarian
+    def run_search(self, ai, game, **search_kwargs):
+        try:
+            stats = ai.search(game, **search_kwargs)
+        except Exception as error:
+            self.send(f"info string error: search failed: {error!r}")
+            raise
+        self.send(f"bestmove {square_name(*stats.move)}")
+        return stats.move
+
+    @staticmethod
+    def play(game, move):
+        if move.lower() == "pass":
+            if game.get_valid_moves():
+                raise ValueError("Cannot pass when there are legal moves")
+            game.switch_player()
+            return
+        row, col = parse_square(move)
+        if not game.is_valid_move(row, col):
+            raise ValueError(f"Illegal move {move!r}")
+        game.make_move(row, col)
+
+    @staticmethod
+    def parse_int(args, name, minimum):
+        if len(args) != 1:
+            raise ValueError(f"{name} needs exactly one number")
+        value = int(args[0])
+        if value < minimum:
+            raise ValueError(f"{name} must be at least {minimum}")
+        return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reversi engine speaking a line-based protocol over stdin/stdout")
+    parser.add_argument("--depth", type=int, default=DEFAULT_DEPTH)
+    parser.add_argument("--tt-mb", type=int, default=64, help="transposition table size per side")
+    parser.add_argument("--book", help="opening book file (default: no book)")
+    parser.add_argument("--workers", type=int, default=1, help="processes for root-parallel search")
+    parser.add_argument("--eval", help="'pattern' or a pattern evaluator weight file (default: positional weights)")
+    parser.add_argument("--search", choices=SEARCH_ALGORITHMS, default="alphabeta", help="search algorithm")
+    parser.add_argument("--probcut", help="Multi-ProbCut parameters for --search pvs: 'default' or a probcut.py file")
+    parser.add_argument("--probcut-confidence", type=float, default=None, help="ProbCut confidence in sigmas")
+    args = parser.parse_args(argv)
+
+    engine = Engine(depth=args.depth, tt_size_mb=args.tt_mb, opening_book=args.book, workers=args.workers,
+                    evaluator=args.eval, search_algorithm=args.search, probcut=args.probcut,
+                    probcut_confidence=args.probcut_confidence)
+    try:
+        for line in sys.stdin:
+            if not engine.handle(line):
+                break
+        else:
+            # EOF: biarkan pencarian terakhir selesai, supaya "echo go | python engine.py" tetap mendapat bestmove
+            engine.wait_search()
+    finally:
+        engine.close()
+
+
+if __name__ == "__main__":
+    main()
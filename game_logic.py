@@ -1,10 +1,39 @@
-import copy
-# Diperlukan karena cara kerja algoritma MiniMax adalah AInya akan mencoba untuk melihat simulasi game dari move-move lain, jadi perlu
-# pakai copy.deepcopy untuk membuat salinan independen (cuman buat simulasi) dari state game saat ini
-
 import math
 # Buat bisa pakai value inf dan -inf di alpha beta pruning optimization dari MiniMax Algorithm
 
+import time
+# Untuk membatasi waktu pencarian AI (iterative deepening dengan deadline)
+
+import threading
+# stop_event untuk membatalkan pencarian dari thread lain (misalnya UI)
+
+from collections.abc import Mapping
+# BitboardMoves (hasil generate_moves backend bitboard) berlaku seperti dict read-only
+
+import bitboard
+# Helper untuk backend bitboard (2 integer 64-bit, satu per warna)
+
+from transposition import ZOBRIST_PIECE, ZOBRIST_SIDE, ZOBRIST_FLIP, TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+# Zobrist hash untuk GameLogic dan transposition table untuk AIPlayer
+
+from parallel_search import ParallelRootSearch
+# Root-parallel search di beberapa process (AIPlayer dengan workers > 1)
+
+from endgame import EndgameSolver, EndgameTimeout
+# Solver exact untuk beberapa kotak kosong terakhir
+
+from opening_book import OpeningBook
+# Opening book (file biner yang di-mmap) untuk move-move awal
+
+from search_stats import SearchStats, print_stats
+# Statistik dari setiap pencarian AI (nodes, cutoffs, EBF, waktu per iterasi, ...)
+
+from pattern_eval import load_evaluator
+# Evaluasi alternatif berbasis pattern table (AIPlayer dengan evaluator="pattern" / path file bobot)
+
+from probcut import load_probcut
+# Forward pruning Multi-ProbCut untuk search_algorithm="pvs" (AIPlayer dengan probcut="default" / path file parameter)
+
 # --- Constants ---
 # Dimensi dari papannya
 # Ini semua sebagai konstanta yang bisa dipakai di file UI nanti
@@ -36,14 +65,98 @@ UI_TEXT_COLOR = (73, 53, 72)
 PIECE_RADIUS = SQUARE_SIZE // 2 - 5
 HINT_RADIUS = SQUARE_SIZE // 6
 
+# Bobot dari peletakan posisi
+# Ini adalah bagian "heuristic" dari AInya
+# Heuristic = a rule or piece of information used in or enabling problem-solving or decision-making
+# Pojokkan paling tinggi karena dia bisa outflank dari 3 posisi
+# Kotak di sebelah pojokkan valuenya turun karena bisa di-outflank
+# Kotak ujung-ujung lainnya masih lebih mending
+# Ditaruh di level module karena GameLogic juga memakainya untuk menjaga jumlah bobot per warna secara incremental
+POSITIONAL_WEIGHTS = [
+    [120, -20, 20,  5,  5, 20, -20, 120],
+    [-20, -40, -5, -5, -5, -5, -40, -20],
+    [ 20,  -5, 15,  3,  3, 15,  -5,  20],
+    [  5,  -5,  3,  3,  3,  3,  -5,   5],
+    [  5,  -5,  3,  3,  3,  3,  -5,   5],
+    [ 20,  -5, 15,  3,  3, 15,  -5,  20],
+    [-20, -40, -5, -5, -5, -5, -40, -20],
+    [120, -20, 20,  5,  5, 20, -20, 120]
+]
+# Versi flat (index = row * 8 + col) untuk backend bitboard
+SQUARE_WEIGHTS = [weight for row in POSITIONAL_WEIGHTS for weight in row]
+
+
+# Zobrist XOR dan jumlah bobot dari disk-disk yang dibalik di 1 baris, per (baris, byte mask baris itu):
+# index = row * 256 + byte. Backend bitboard meng-update hash dan weight_sum per baris yang kena flip,
+# bukan per disk yang dibalik
+def build_flip_row_tables():
+    hashes = []
+    weights = []
+    for row in range(ROWS):
+        for byte in range(256):
+            key = 0
+            weight = 0
+            for col in range(COLS):
+                if byte >> col & 1:
+                    key ^= ZOBRIST_FLIP[row * COLS + col]
+                    weight += POSITIONAL_WEIGHTS[row][col]
+            hashes.append(key)
+            weights.append(weight)
+    return hashes, weights
+
+
+FLIP_ROW_HASH, FLIP_ROW_WEIGHT = build_flip_row_tables()
+
+
+# Kotak-kotak dari setiap kotak ke arah 8 direction, dihitung sekali di sini: SQUARE_RAYS[row * 8 + col] = list ray,
+# setiap ray = list (row, col) berurutan dari yang paling dekat
+# Arah yang panjangnya kurang dari 2 kotak tidak dimasukkan, karena tidak mungkin membalik apa-apa
+def build_square_rays():
+    square_rays = []
+    for row in range(8):
+        for col in range(8):
+            rays = []
+            for dr, dc in [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]:
+                ray = []
+                r, c = row + dr, col + dc
+                while 0 <= r < 8 and 0 <= c < 8:
+                    ray.append((r, c))
+                    r += dr
+                    c += dc
+                if len(ray) >= 2:
+                    rays.append(ray)
+            square_rays.append(rays)
+    return square_rays
+
+
+SQUARE_RAYS = build_square_rays()
+
 # --- Game "Brains" Class ---
 # Class ini hanya mengatur semua aturan, status papan, dan membuat move-move
 # Tidak mengurus pembuatan UI sama sekali
+# backend = "list" (default, papan berupa list 8x8) atau "bitboard" (BitboardGameLogic, jauh lebih cepat untuk AI)
+# Keduanya punya public API yang sama: board, current_player, get_valid_moves, make_move, switch_player
+BACKENDS = ("list", "bitboard")
+
 class GameLogic:
+    # Pilih class backend waktu object dibuat, jadi GameLogic(backend="bitboard") langsung menghasilkan BitboardGameLogic
+    def __new__(cls, backend="list"):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown GameLogic backend: {backend!r} (expected one of {BACKENDS})")
+        if cls is GameLogic and backend == "bitboard":
+            cls = BitboardGameLogic
+        return super().__new__(cls)
+
     # Constructor dari class GameLogic
-    def __init__(self):
+    def __init__(self, backend="list"):
+        self.backend = "list"
         self.board = self.create_board()
         self.current_player = BLACK_PIECE # Seperti rule di intro screen, player (human) selalu berwarna hitam dan main duluan
+        self.hash = self.compute_hash()
+        self.disc_count, self.weight_sum = self.compute_disc_stats()
+        # Mask (black, white) dari papan yang sama, di-update incremental oleh make_move/unmake_move
+        # supaya color_masks (pattern evaluator di setiap leaf) tidak perlu membangunnya dari list 8x8
+        self.black, self.white = bitboard.board_to_masks(self.board, BLACK_PIECE, WHITE_PIECE)
 
     # def untuk set initial state yaitu papan yang kosong tetapi 4 kotak di tengah diisi dengan hitam dan putih (memang initial state dari game REVERSI)
     def create_board(self):
@@ -56,10 +169,70 @@ class GameLogic:
         board[4][4] = WHITE_PIECE
         return board
 
+    # Hitung Zobrist hash dari nol (scan seluruh papan)
+    # Setelah ini hash-nya di-update secara incremental oleh make_move, unmake_move dan switch_player
+    def compute_hash(self):
+        key = 0
+        board = self.board
+        for r in range(ROWS):
+            for c in range(COLS):
+                if board[r][c] != EMPTY:
+                    key ^= ZOBRIST_PIECE[board[r][c]][r * COLS + c]
+        if self.current_player == WHITE_PIECE:
+            key ^= ZOBRIST_SIDE
+        return key
+
+    # Hitung jumlah disk dan jumlah POSITIONAL_WEIGHTS per warna dari nol
+    # Keduanya berupa list yang di-index dengan piece ([EMPTY, BLACK_PIECE, WHITE_PIECE]) dan di-update incremental oleh make_move/unmake_move,
+    # jadi evaluasi leaf di AI dan skor di UI tidak perlu scan 64 kotak lagi
+    def compute_disc_stats(self):
+        disc_count = [0, 0, 0]
+        weight_sum = [0, 0, 0]
+        board = self.board
+        for r in range(ROWS):
+            for c in range(COLS):
+                piece = board[r][c]
+                if piece != EMPTY:
+                    disc_count[piece] += 1
+                    weight_sum[piece] += POSITIONAL_WEIGHTS[r][c]
+        disc_count[EMPTY] = ROWS * COLS - disc_count[BLACK_PIECE] - disc_count[WHITE_PIECE]
+        return disc_count, weight_sum
+
+    # Ganti posisi dengan board list 8x8 dan giliran yang diberikan (misalnya dari board string, lihat game_from_string)
+    def set_position(self, board, current_player):
+        self.board = [list(row) for row in board]
+        self.current_player = current_player
+        self.hash = self.compute_hash()
+        self.disc_count, self.weight_sum = self.compute_disc_stats()
+        self.black, self.white = bitboard.board_to_masks(self.board, BLACK_PIECE, WHITE_PIECE)
+
+    # Mask (black, white) dari posisi sekarang, misalnya untuk pattern evaluator atau disimpan ke file (lihat records.py)
+    def color_masks(self):
+        return self.black, self.white
+
+    # Mask (player, opponent) dari sudut pandang player yang sedang jalan, untuk solver yang bekerja di bitboard
+    def player_masks(self):
+        black, white = self.color_masks()
+        if self.current_player == BLACK_PIECE:
+            return black, white
+        return white, black
+
+    # Key posisi yang sama untuk ke-8 rotasi / cermin-nya (lihat bitboard.canonical), return (key, simetri)
+    # Dari sudut pandang player yang sedang jalan, jadi cocok untuk cache yang disimpan per giliran (ponder, opening book)
+    # Transposition table tetap memakai Zobrist hash: hash itu di-update incremental, sedangkan key ini dihitung dari nol
+    def canonical_key(self):
+        player, opponent = self.player_masks()
+        return bitboard.canonical_key(player, opponent)
+
     # def yang mengatur pergantian player (antara human dan "ai"nya)
     def switch_player(self):
         # Swaps the current player.
         self.current_player = WHITE_PIECE if self.current_player == BLACK_PIECE else BLACK_PIECE
+        self.hash ^= ZOBRIST_SIDE
+
+    # Jumlah kotak yang masih kosong, dipakai AI untuk membagi sisa waktu dan membatasi kedalaman pencarian
+    def empty_count(self):
+        return self.disc_count[EMPTY]
 
     # def untuk melihat dan mendapatkan tempat-tempat yang valid untuk move selanjutnya
     def get_valid_moves(self):
@@ -74,85 +247,395 @@ class GameLogic:
     # Bagian dari function di atasnya, dia yang ngecek apakah sebuah kotak itu valid move untuk sang player yang lagi main sekarang
     # Sesuai aturan REVERSI, move valid kalau kotak itu kosong dan bisa "outflank" minimal 1 piece lawan di salah satu dari 8 arah
     # Kalau gk memenuhi syarat itu, gk dianggap sebagai valid move
-    def is_valid_move(self, row, col):
-        if self.board[row][col] != EMPTY:
+    # player = piece yang dicek (default: player yang lagi jalan)
+    def is_valid_move(self, row, col, player=None):
+        board = self.board
+        if board[row][col] != EMPTY:
             return False
 
-        opponent = WHITE_PIECE if self.current_player == BLACK_PIECE else BLACK_PIECE
+        if player is None:
+            player = self.current_player
+        opponent = WHITE_PIECE if player == BLACK_PIECE else BLACK_PIECE
 
         # Check dari 8 arah secara horizontal, vertical, diagonal
-        # (dr, dc) is the "direction vector" -> (delta_row, delta_col)
-        for dr, dc in [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]:
-            r, c = row + dr, col + dc
-            
-            # This flag tracks if we've found at least one opponent piece
-            # in this direction before finding our own.
-            found_opponent = False
-
-            # Keep moving in this direction
-            while 0 <= r < ROWS and 0 <= c < COLS:
-                if self.board[r][c] == opponent:
-                    found_opponent = True
-                elif self.board[r][c] == self.current_player:
-                    # We found our own piece!
-                    # If we found an opponent *before* this, it's a valid move.
-                    if found_opponent:
-                        return True
-                    else:
-                        # Found our own piece first, so this direction is invalid
-                        break
-                else: # self.board[r][c] == EMPTY
-                    break # Ran into an empty square, invalid direction
-                
-                # Move to the next square in this direction
-                r += dr
-                c += dc
-        
+        # Kotak-kotak di setiap arah sudah dihitung di SQUARE_RAYS, jadi tidak perlu bounds check lagi
+        for ray in SQUARE_RAYS[row * COLS + col]:
+            r, c = ray[0]
+            # Kotak pertama harus piece lawan, kalau bukan arah ini langsung gagal
+            if board[r][c] != opponent:
+                continue
+            for r, c in ray[1:]:
+                piece = board[r][c]
+                if piece == opponent:
+                    continue
+                # Ketemu piece sendiri setelah minimal 1 piece lawan = valid, ketemu kotak kosong = arah ini gagal
+                if piece == player:
+                    return True
+                break
+
         # If we checked all 8 directions and none returned True, it's invalid
         return False
 
-    def make_move(self, row, col):
-        
-        # Places a piece on the board at (row, col) and flips all
-        # outflanked opponent pieces.
-        # (Assumes the move is already validated)
+    # Ada valid move untuk player (default: player yang lagi jalan)?
+    # Berhenti di valid move pertama, jadi jauh lebih murah daripada get_valid_moves untuk cek pass / game over
+    def has_any_move(self, player=None):
+        board = self.board
+        for r in range(ROWS):
+            row = board[r]
+            for c in range(COLS):
+                if row[c] == EMPTY and self.is_valid_move(r, c, player):
+                    return True
+        return False
+
+    # Semua valid move beserta piece yang akan dibalik: {(row, col): flips}
+    # Setiap arah dari setiap kotak kosong hanya dijalani sekali, dan flips-nya bisa langsung diberikan ke make_move
+    # supaya make_move tidak perlu mencari ulang (dipakai oleh pencarian AI)
+    # Urutan key-nya sama dengan get_valid_moves (raster order)
+    def generate_moves(self):
+        board = self.board
+        player = self.current_player
+        opponent = WHITE_PIECE if player == BLACK_PIECE else BLACK_PIECE
+        moves = {}
+        for row in range(ROWS):
+            board_row = board[row]
+            for col in range(COLS):
+                if board_row[col] != EMPTY:
+                    continue
+                flips = self.collect_flips(row, col, player, opponent)
+                if flips:
+                    moves[(row, col)] = flips
+        return moves
+
+    # List semua piece lawan yang dibalik kalau player menaruh piece di (row, col)
+    def collect_flips(self, row, col, player, opponent):
+        board = self.board
+        flips = []
+        for ray in SQUARE_RAYS[row * COLS + col]:
+            r, c = ray[0]
+            if board[r][c] != opponent:
+                continue
+            for index in range(1, len(ray)):
+                r, c = ray[index]
+                piece = board[r][c]
+                if piece == opponent:
+                    continue
+                if piece == player:
+                    # Semua piece lawan di antara (row, col) dan piece sendiri ini dibalik
+                    flips.extend(ray[:index])
+                break
+        return flips
+
+    # Places a piece on the board at (row, col) and flips all outflanked opponent pieces.
+    # (Assumes the move is already validated)
+    # flips = list piece yang dibalik dari generate_moves (kalau None, dicari sendiri)
+    # Return-nya adalah "undo record" (row, col, flipped, player, previous_hash, flipped_weight, previous_masks) yang bisa dikasih ke unmake_move
+    # supaya AI bisa simulasi move langsung di state yang sama tanpa deepcopy
+    def make_move(self, row, col, flips=None):
 
         opponent = WHITE_PIECE if self.current_player == BLACK_PIECE else BLACK_PIECE
-        pieces_to_flip = []
 
         # 1. Find all pieces to flip
-        for dr, dc in [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]:
-            r, c = row + dr, col + dc
-            potential_flips_in_this_direction = []
-
-            while 0 <= r < ROWS and 0 <= c < COLS:
-                if self.board[r][c] == opponent:
-                    # Found an opponent piece, add it to our *potential* list
-                    potential_flips_in_this_direction.append((r, c))
-                elif self.board[r][c] == self.current_player:
-                    # Found our own piece, all potential flips are now *confirmed*
-                    pieces_to_flip.extend(potential_flips_in_this_direction)
-                    break
-                else: # self.board[r][c] == EMPTY
-                    # Ran into an empty square, clear potential flips for this direction
-                    break
-                
-                r += dr
-                c += dc
-        
+        pieces_to_flip = flips if flips is not None else self.collect_flips(row, col, self.current_player, opponent)
+
+        previous_hash = self.hash
+
         # 2. Place the new piece
         self.board[row][col] = self.current_player
+        self.hash ^= ZOBRIST_PIECE[self.current_player][row * COLS + col]
 
         # 3. Flip all the confirmed pieces
+        flipped_weight = 0
+        flipped_mask = 0
         for r_flip, c_flip in pieces_to_flip:
             self.board[r_flip][c_flip] = self.current_player
+            self.hash ^= ZOBRIST_FLIP[r_flip * COLS + c_flip]
+            flipped_weight += POSITIONAL_WEIGHTS[r_flip][c_flip]
+            flipped_mask |= 1 << (r_flip * COLS + c_flip)
+
+        # 4. Update jumlah disk dan bobot per warna, dan mask-nya
+        player = self.current_player
+        self.update_disc_stats(player, opponent, POSITIONAL_WEIGHTS[row][col], len(pieces_to_flip), flipped_weight)
+        previous_masks = (self.black, self.white)
+        if player == BLACK_PIECE:
+            self.black |= flipped_mask | (1 << (row * COLS + col))
+            self.white ^= flipped_mask
+        else:
+            self.white |= flipped_mask | (1 << (row * COLS + col))
+            self.black ^= flipped_mask
         
-        # 4. Switch to the other player for the next turn
+        # 5. Switch to the other player for the next turn
         self.switch_player()
 
+        return (row, col, pieces_to_flip, player, previous_hash, flipped_weight, previous_masks)
+
+    # Player menaruh 1 disk (bobotnya placed_weight) dan membalik flipped_count disk lawan (total bobotnya flipped_weight)
+    # Dipanggil dengan tanda negatif dari unmake_move untuk membatalkannya
+    def update_disc_stats(self, player, opponent, placed_weight, flipped_count, flipped_weight, sign=1):
+        disc_count = self.disc_count
+        weight_sum = self.weight_sum
+        disc_count[player] += sign * (1 + flipped_count)
+        disc_count[opponent] -= sign * flipped_count
+        disc_count[EMPTY] -= sign
+        weight_sum[player] += sign * (placed_weight + flipped_weight)
+        weight_sum[opponent] -= sign * flipped_weight
+
+    # Kembalikan papan persis ke kondisi sebelum make_move yang menghasilkan undo record ini
+    # Harus dipanggil dengan urutan terbalik (move terakhir di-unmake duluan)
+    def unmake_move(self, undo):
+        row, col, pieces_to_flip, player, previous_hash, flipped_weight, previous_masks = undo
+        opponent = WHITE_PIECE if player == BLACK_PIECE else BLACK_PIECE
+
+        self.board[row][col] = EMPTY
+        for r_flip, c_flip in pieces_to_flip:
+            self.board[r_flip][c_flip] = opponent
+
+        self.update_disc_stats(player, opponent, POSITIONAL_WEIGHTS[row][col], len(pieces_to_flip), flipped_weight, -1)
+        self.black, self.white = previous_masks
+
+        self.current_player = player
+        self.hash = previous_hash
+
+
+# Hasil generate_moves dari backend bitboard: mapping {(row, col): mask flips} seperti dict dari backend list,
+# tapi mask flips sebuah move baru dihitung waktu moves[move] diminta. Di pencarian, sebagian besar move di sebuah node
+# tidak pernah dimainkan karena cutoff, jadi flips untuk move-move itu tidak perlu dihitung sama sekali
+# Urutan iterasinya raster order, sama dengan get_valid_moves
+class BitboardMoves(Mapping):
+    __slots__ = ("player", "opponent", "mask")
+
+    def __init__(self, player, opponent, mask):
+        self.player = player
+        self.opponent = opponent
+        self.mask = mask
+
+    def __getitem__(self, move):
+        square = move[0] * 8 + move[1]
+        if not self.mask >> square & 1:
+            raise KeyError(move)
+        return bitboard.flips_for_move(self.player, self.opponent, square)
+
+    def __iter__(self):
+        return ((square >> 3, square & 7) for square in bitboard.iter_squares(self.mask))
+
+    def __len__(self):
+        return self.mask.bit_count()
+
+    def __bool__(self):
+        return self.mask != 0
+
+
+# --- Bitboard backend ---
+# Sama persis aturannya dengan GameLogic, tapi papannya disimpan sebagai 2 mask 64-bit (black, white)
+# Move generation dan flip dihitung dengan shift-and-mask, tanpa loop kotak per kotak dan tanpa bounds check
+class BitboardGameLogic(GameLogic):
+    def __init__(self, backend="bitboard"):
+        self.backend = "bitboard"
+        self.black, self.white = bitboard.board_to_masks(self.create_board(), BLACK_PIECE, WHITE_PIECE)
+        self.current_player = BLACK_PIECE
+        self.hash = self.compute_hash()
+        self.disc_count, self.weight_sum = self.compute_disc_stats()
+
+    # UI dan evaluate_board masih membaca board sebagai list 8x8, jadi dibuat on-demand dari mask-nya
+    @property
+    def board(self):
+        return bitboard.masks_to_board(self.black, self.white, BLACK_PIECE, WHITE_PIECE, EMPTY)
+
+    def set_position(self, board, current_player):
+        self.black, self.white = bitboard.board_to_masks(board, BLACK_PIECE, WHITE_PIECE)
+        self.current_player = current_player
+        self.hash = self.compute_hash()
+        self.disc_count, self.weight_sum = self.compute_disc_stats()
+
+    # Mask (player, opponent) dari sudut pandang player yang sedang jalan
+    def player_masks(self):
+        if self.current_player == BLACK_PIECE:
+            return self.black, self.white
+        return self.white, self.black
+
+    def valid_moves_mask(self):
+        player, opponent = self.player_masks()
+        return bitboard.legal_moves(player, opponent)
+
+    def get_valid_moves(self):
+        # Bit terendah = (0, 0), jadi urutannya sama dengan backend list (raster order)
+        return [(square >> 3, square & 7) for square in bitboard.iter_squares(self.valid_moves_mask())]
+
+    def is_valid_move(self, row, col, player=None):
+        if player is None or player == self.current_player:
+            return bool(self.valid_moves_mask() & bitboard.square_bit(row, col))
+        opponent, player_mask = self.player_masks()
+        return bool(bitboard.legal_moves(player_mask, opponent) & bitboard.square_bit(row, col))
+
+    def has_any_move(self, player=None):
+        if player is None:
+            player = self.current_player
+        if player == BLACK_PIECE:
+            return bitboard.has_legal_move(self.black, self.white)
+        return bitboard.has_legal_move(self.white, self.black)
+
+    # Untuk backend ini flips berupa mask, dan dihitung baru waktu diminta (lihat BitboardMoves)
+    def generate_moves(self):
+        player, opponent = self.player_masks()
+        return BitboardMoves(player, opponent, bitboard.legal_moves(player, opponent))
+
+    # make_move / unmake_move dipanggil sekali per node pencarian, jadi update_disc_stats, switch_player dan
+    # player_masks ditulis langsung di sini, dan hash / bobot flip-nya dihitung per baris (FLIP_ROW_HASH / FLIP_ROW_WEIGHT)
+    def make_move(self, row, col, flips=None):
+        # (Assumes the move is already validated)
+        square = row * 8 + col
+        mover = self.current_player
+        if mover == BLACK_PIECE:
+            player, opponent, other = self.black, self.white, WHITE_PIECE
+        else:
+            player, opponent, other = self.white, self.black, BLACK_PIECE
+        flipped = flips if flips is not None else bitboard.flips_for_move(player, opponent, square)
+        player |= flipped | (1 << square)
+        opponent &= ~flipped
+        if mover == BLACK_PIECE:
+            self.black, self.white = player, opponent
+        else:
+            self.white, self.black = player, opponent
+
+        previous_hash = self.hash
+        key = previous_hash ^ ZOBRIST_PIECE[mover][square] ^ ZOBRIST_SIDE
+        flipped_weight = 0
+        rest = flipped
+        while rest:
+            row_shift = ((rest & -rest).bit_length() - 1) & 56
+            index = (row_shift << 5) | (rest >> row_shift & 0xFF)
+            key ^= FLIP_ROW_HASH[index]
+            flipped_weight += FLIP_ROW_WEIGHT[index]
+            rest &= ~(0xFF << row_shift)
+        self.hash = key
+
+        flipped_count = flipped.bit_count()
+        disc_count = self.disc_count
+        disc_count[mover] += 1 + flipped_count
+        disc_count[other] -= flipped_count
+        disc_count[EMPTY] -= 1
+        weight_sum = self.weight_sum
+        weight_sum[mover] += SQUARE_WEIGHTS[square] + flipped_weight
+        weight_sum[other] -= flipped_weight
+        self.current_player = other
+
+        # Untuk backend ini flipped berupa mask, bukan list koordinat
+        return (row, col, flipped, mover, previous_hash, flipped_weight)
+
+    def unmake_move(self, undo):
+        row, col, flipped, player, previous_hash, flipped_weight = undo
+        square = row * 8 + col
+
+        if player == BLACK_PIECE:
+            self.black &= ~(flipped | (1 << square))
+            self.white |= flipped
+            other = WHITE_PIECE
+        else:
+            self.white &= ~(flipped | (1 << square))
+            self.black |= flipped
+            other = BLACK_PIECE
+
+        flipped_count = flipped.bit_count()
+        disc_count = self.disc_count
+        disc_count[player] -= 1 + flipped_count
+        disc_count[other] += flipped_count
+        disc_count[EMPTY] += 1
+        weight_sum = self.weight_sum
+        weight_sum[player] -= SQUARE_WEIGHTS[square] + flipped_weight
+        weight_sum[other] += flipped_weight
+        self.current_player = player
+        self.hash = previous_hash
+
+# --- Notasi posisi untuk tools tanpa UI (engine, analyze, benchmark, tournament) ---
+# Kotak ditulis dengan notasi Othello biasa: kolom a-h lalu baris 1-8, jadi (row 4, col 5) = "f5"
+SQUARE_FILES = "abcdefgh"
+
+# Board string: 64 karakter dimulai dari a1, b1, ..., h1, a2, ... ("X" = hitam, "O" = putih, "-" = kosong),
+# lalu spasi dan "X" / "O" untuk giliran yang sedang jalan. Posisi awal:
+#   ---------------------------OX------XO--------------------------- X
+BOARD_CHARS = {EMPTY: "-", BLACK_PIECE: "X", WHITE_PIECE: "O"}
+PIECE_FROM_CHAR = {"-": EMPTY, ".": EMPTY, "X": BLACK_PIECE, "x": BLACK_PIECE, "*": BLACK_PIECE, "O": WHITE_PIECE, "o": WHITE_PIECE}
+
+
+def square_name(row, col):
+    return f"{SQUARE_FILES[col]}{row + 1}"
+
+
+# Kebalikan dari square_name, melempar ValueError kalau namanya tidak valid
+def parse_square(name):
+    name = name.strip().lower()
+    if len(name) != 2 or name[0] not in SQUARE_FILES or name[1] not in "12345678":
+        raise ValueError(f"Invalid square {name!r} (expected a1..h8)")
+    return int(name[1]) - 1, SQUARE_FILES.index(name[0])
+
+
+# Move (row, col) di posisi asli -> move yang sama di bentuk kanonik-nya (simetri dari GameLogic.canonical_key)
+def canonical_move(move, symmetry):
+    square = bitboard.SYMMETRY_SQUARES[symmetry][move[0] * COLS + move[1]]
+    return square >> 3, square & 7
+
+
+# Kebalikan dari canonical_move: move di bentuk kanonik -> move di posisi asli
+def move_from_canonical(move, symmetry):
+    square = bitboard.SYMMETRY_SQUARES[bitboard.SYMMETRY_INVERSE[symmetry]][move[0] * COLS + move[1]]
+    return square >> 3, square & 7
+
+
+def board_to_string(game):
+    board = game.board
+    cells = "".join(BOARD_CHARS[board[r][c]] for r in range(ROWS) for c in range(COLS))
+    return f"{cells} {BOARD_CHARS[game.current_player]}"
+
+
+# Buat GameLogic dari board string (spasi di antara 64 karakter papannya boleh ada, supaya bisa ditulis per baris)
+def game_from_string(text, backend="list"):
+    parts = text.split()
+    if len(parts) < 2:
+        raise ValueError("Board string needs 64 squares followed by the side to move (X or O)")
+    cells = "".join(parts[:-1])
+    side = PIECE_FROM_CHAR.get(parts[-1])
+    if len(cells) != ROWS * COLS or any(cell not in PIECE_FROM_CHAR for cell in cells):
+        raise ValueError(f"Board string needs exactly 64 squares of X, O or -, got {cells!r}")
+    if side is None or side == EMPTY:
+        raise ValueError(f"Invalid side to move {parts[-1]!r} (expected X or O)")
+
+    board = [[PIECE_FROM_CHAR[cells[r * COLS + c]] for c in range(COLS)] for r in range(ROWS)]
+    game = GameLogic(backend=backend)
+    game.set_position(board, side)
+    return game
+
+# Dilempar dari dalam alpha_beta kalau waktu pencarian sudah habis
+# Ditangkap di search, yang lalu memakai hasil dari depth terakhir yang selesai dicari
+class SearchTimeout(Exception):
+    pass
+
+# Berapa bagian dari "jatah waktu rata-rata per giliran" yang boleh dipakai AI untuk 1 move
+TIME_USAGE_FACTOR = 1.0
+# Sisa waktu yang tidak boleh dipakai sama sekali (untuk overhead UI, dll), dalam ms
+TIME_SAFETY_MARGIN_MS = 100
+# Pencarian minimal diberi waktu segini walaupun jamnya hampir habis (depth 1 tetap selalu diselesaikan)
+MIN_MOVE_TIME_MS = 10
+
+# Ply maksimal di dalam tree (60 move + giliran yang diskip), untuk ukuran table killer moves
+MAX_PLY = 128
+
+# Algoritma pencarian AIPlayer: "alphabeta" (minimax dengan cabang Max / Min terpisah) atau "pvs" (negamax Principal
+# Variation Search dengan aspiration window). Di depth yang sama keduanya menghasilkan move dan score yang sama persis,
+# bedanya hanya di jumlah node (bandingkan dengan: python benchmark.py --compare-algorithms)
+SEARCH_ALGORITHMS = ("alphabeta", "pvs")
+
+# Setengah lebar aspiration window awal di sekitar score iterasi sebelumnya (dalam satuan evaluasi)
+# Setiap kali gagal, sisi yang gagal diperlebar 4x; kalau sudah lebih dari ASPIRATION_LIMIT, sisi itu dibuka sampai +-inf
+ASPIRATION_WINDOW = 64
+ASPIRATION_LIMIT = 1024
+
+# Jenis bound dari sudut pandang lawan (score-nya dinegasi, jadi batas bawah menjadi batas atas dan sebaliknya)
+FLIPPED_BOUND = {EXACT: EXACT, LOWER_BOUND: UPPER_BOUND, UPPER_BOUND: LOWER_BOUND}
+
 # Class dari AI nya
 class AIPlayer:
-    def __init__(self, player_piece, difficulty_depth=5):
+    def __init__(self, player_piece, difficulty_depth=5, tt_size_mb=16, move_ordering=True, workers=1, endgame_empties=12,
+                 opening_book=None, stats_callback=print_stats, evaluator=None, search_algorithm="alphabeta",
+                 probcut=None, probcut_confidence=None):
 
         # Menyimpan apakah AI nya sedang main sebagai dirinya sendiri (putih) atau simulasi manusianya (hitam)
         self.player_piece = player_piece 
@@ -160,27 +643,138 @@ class AIPlayer:
 
         # Difficulty depth ini adalah tingkat kedalaman tree MiniMaxnya yang akan dilihat AInya / seberapa jauh dia berusaha melihat kemungkinan masa depannya
         # Defaultnya 4 kalau tidak diset di run_game
+        # Kalau find_best_move diberi batas waktu, depth ini hanya batas minimal; AI akan terus memperdalam selama waktunya masih ada
         self.depth = difficulty_depth
 
-        # Bobot dari peletakan posisi
+        # State dari pencarian yang sedang berjalan (deadline dalam detik time.perf_counter(), None = tanpa batas waktu)
+        self.deadline = None
+        self.abortable = False
+        self.nodes = 0
+        self.leaf_evals = 0
+        # Diset oleh stop() (misalnya dari thread UI) untuk membatalkan pencarian yang sedang berjalan
+        # Di dalam worker process (parallel search) event ini diganti dengan multiprocessing.Event milik pool-nya
+        self.stop_event = threading.Event()
+
+        # workers > 1: move-move di root dicari paralel di beberapa process
+        # Pool process-nya dibuat sekali saat pertama dipakai dan dipakai terus antar move, sampai close() dipanggil
+        self.workers = workers
+        self.parallel = ParallelRootSearch(workers) if workers > 1 else None
+
+        # Transposition table: menyimpan hasil evaluasi posisi yang sudah pernah dicari (key = Zobrist hash dari GameLogic)
+        # Posisi yang sama sering muncul lagi lewat urutan move yang berbeda, jadi tidak perlu dicari ulang
+        # Table-nya dipakai terus selama AIPlayer ini hidup (antar move dalam 1 game), ukurannya tetap sesuai tt_size_mb
+        # tt_size_mb = 0 / None untuk mematikan transposition table
+        self.tt = TranspositionTable(tt_size_mb) if tt_size_mb else None
+
+        # Move ordering: move yang kemungkinan besar terbaik dicoba duluan supaya cutoff alpha-beta terjadi lebih awal
+        # Urutannya: move dari transposition table (PV), killer moves di ply itu, history heuristic, lalu POSITIONAL_WEIGHTS
+        # move_ordering = False untuk kembali ke urutan raster dari get_valid_moves (untuk membandingkan jumlah node)
+        self.move_ordering = move_ordering
+        # killers[ply] = 2 move terakhir yang menyebabkan cutoff di ply tersebut (biasanya juga bagus di posisi "saudara"-nya)
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        # history[piece][square] = seberapa sering (dibobot depth) move ke kotak itu menyebabkan cutoff
+        self.history = [[0] * 64 for _ in range(3)]
+
+        # Counter untuk melihat kualitas move ordering
+        # first_move_cutoff_rate() mendekati 1 artinya move pertama yang dicoba hampir selalu sudah cukup untuk cutoff
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.ply_cutoffs = [0] * MAX_PLY
+
+        # Kalau kotak kosongnya tinggal endgame_empties atau kurang, AI berhenti memakai heuristic
+        # dan mencari sampai akhir game untuk memaksimalkan selisih disk (0 / None untuk mematikan)
+        # Di Python, 12 kotak kosong biasanya selesai di bawah 1 detik; setiap tambahan 2 kotak kira-kira 10x lebih lama
+        self.endgame_empties = endgame_empties
+        self.endgame_solver = EndgameSolver()
+
+        # Opening book: object OpeningBook atau path ke file book-nya (None = tanpa book)
+        # Kalau posisinya ada di book, move-nya langsung dipakai tanpa mencari sama sekali
+        if isinstance(opening_book, str):
+            opening_book = OpeningBook(opening_book)
+        self.opening_book = opening_book
+
+        # Score dari move terakhir yang dikembalikan find_best_move (dari sudut pandang AI)
+        self.last_score = None
+
+        # SearchStats dari pencarian terakhir (atau yang sedang berjalan)
+        # stats_callback(stats) dipanggil setiap kali 1 iterasi selesai dan sekali lagi waktu pencariannya selesai (stats.finished)
+        # Default-nya print ringkasan 1 baris di akhir; None supaya tidak ada output sama sekali
+        self.last_stats = None
+        self.stats_callback = stats_callback
+
+        # Hasil pondering: {key kanonik posisi setelah move manusia: (move balasan AI di bentuk kanonik, score, depth)}
+        # Diisi oleh ponder() selama giliran manusia, lalu dipakai oleh find_best_move di giliran AI
+        # Karena key-nya kanonik, move-move manusia yang menghasilkan posisi simetris hanya dipikirkan sekali
+        self.ponder_results = {}
+        self.ponder_hits = 0
+
+        # Bobot dari peletakan posisi (lihat POSITIONAL_WEIGHTS di atas)
         # Ini adalah bagian "heuristic" dari AInya
-        # Heuristic = a rule or piece of information used in or enabling problem-solving or decision-making
-        # Pojokkan paling tinggi karena dia bisa outflank dari 3 posisi
-        # Kotak di sebelah pojokkan valuenya turun karena bisa di-outflank
-        # Kotak ujung-ujung lainnya masih lebih mending
-
-        self.POSITIONAL_WEIGHTS = [
-            [120, -20, 20,  5,  5, 20, -20, 120],
-            [-20, -40, -5, -5, -5, -5, -40, -20],
-            [ 20,  -5, 15,  3,  3, 15,  -5,  20],
-            [  5,  -5,  3,  3,  3,  3,  -5,   5],
-            [  5,  -5,  3,  3,  3,  3,  -5,   5],
-            [ 20,  -5, 15,  3,  3, 15,  -5,  20],
-            [-20, -40, -5, -5, -5, -5, -40, -20],
-            [120, -20, 20,  5,  5, 20, -20, 120]
-        ]
+        self.POSITIONAL_WEIGHTS = POSITIONAL_WEIGHTS
+
+        # Evaluasi leaf: None = jumlah POSITIONAL_WEIGHTS (incremental, lihat evaluate), atau PatternEvaluator
+        # ("pattern" = bobot default, path = file bobot hasil training, lihat pattern_eval.py)
+        # Pattern evaluator membaca mask hitam/putih, jadi paling cepat dengan GameLogic(backend="bitboard")
+        self.evaluator = load_evaluator(evaluator)
+        if self.evaluator is not None and self.evaluator.source is None and workers > 1:
+            raise ValueError("Save the evaluator to a file before using it with workers > 1")
+
+        # "alphabeta" atau "pvs" (lihat SEARCH_ALGORITHMS)
+        if search_algorithm not in SEARCH_ALGORITHMS:
+            raise ValueError(f"Unknown search algorithm: {search_algorithm!r} (expected one of {SEARCH_ALGORITHMS})")
+        self.search_algorithm = search_algorithm
+        # Berapa kali null window PVS gagal (fail high) dan harus dicari ulang, dan berapa kali aspiration window di root gagal
+        self.pvs_researches = 0
+        self.aspiration_failures = 0
+
+        # Multi-ProbCut (lihat probcut.py): None = tanpa forward pruning, "default" = parameter bawaan untuk POSITIONAL_WEIGHTS,
+        # path = file parameter hasil "python probcut.py fit"; probcut_confidence = berapa sigma (default probcut.DEFAULT_CONFIDENCE)
+        # Hanya dipakai oleh pvs, dan hasilnya tidak lagi sama persis dengan pencarian penuh di depth yang sama
+        self.probcut = load_probcut(probcut, probcut_confidence)
+        if self.probcut is not None and search_algorithm != "pvs":
+            raise ValueError("ProbCut needs search_algorithm='pvs'")
+        if self.probcut is not None and self.probcut.source is None and workers > 1:
+            raise ValueError("Save the ProbCut parameters to a file before using them with workers > 1")
+        # Slope/sigma-nya hanya berlaku untuk evaluator yang dipakai waktu fit ("default" = POSITIONAL_WEIGHTS)
+        # Evaluator yang belum disimpan (source None) tidak punya spec, jadi tidak bisa dicocokkan
+        if self.probcut is not None:
+            if self.evaluator is None:
+                evaluator_spec = None
+            elif self.evaluator.source is None:
+                raise ValueError("Save the evaluator to a file before using it with ProbCut")
+            else:
+                evaluator_spec = self.evaluator.source
+            if self.probcut.evaluator != evaluator_spec:
+                raise ValueError(f"ProbCut parameters were fitted for evaluator {self.probcut.evaluator!r}, "
+                                 f"not {evaluator_spec!r}")
+        self.probcut_cuts = 0
+        # True selama search dangkal dari ProbCut berjalan, supaya search itu sendiri tidak memakai ProbCut lagi
+        self.in_probcut = False
+
+    # Versi O(1) dari evaluate_board yang dipakai di dalam pencarian
+    # Jumlah disk dan jumlah bobot per warna sudah di-maintain oleh GameLogic, jadi tidak perlu scan papan
+    # Hasilnya sama persis dengan evaluate_board(game_state.board, game_over)
+    # Kalau AI-nya memakai evaluator, posisi yang belum game over dinilai oleh evaluator itu
+    def evaluate(self, game_state, game_over):
+        if game_over:
+            ai_score = game_state.disc_count[self.player_piece]
+            opp_score = game_state.disc_count[self.opponent_piece]
+            if ai_score > opp_score:
+                return math.inf  # AI wins
+            elif opp_score > ai_score:
+                return -math.inf # Human wins
+            return 0 # Draw
+
+        if self.evaluator is not None:
+            black, white = game_state.color_masks()
+            score = self.evaluator.evaluate(black, white, game_state.disc_count[EMPTY])
+            return score if self.player_piece == BLACK_PIECE else -score
+
+        weight_sum = game_state.weight_sum
+        return weight_sum[self.player_piece] - weight_sum[self.opponent_piece]
 
     # Function untuk evaluaasi nilai papan saat ini berdasarkan bobot heuristic di atas
+    # (Versi scan 64 kotak dari sebuah board list, pencarian AI sekarang memakai evaluate() di atas)
     # Function yang return nilai dari sebuah leaf node di tree MiniMaxnya
     # Apakah sebuah move akan menghasilkan nilai bobot berapa untuk si AI dan nilai bobot berapa untuk manusianya
     # Nilai positif = bagus untuk AInya, nilai negatif = semakin bagus untuk manusianya
@@ -223,111 +817,740 @@ class AIPlayer:
         return ai_total_weight - opp_total_weight
 
 
+    # Urutkan valid moves dari yang paling menjanjikan
+    # tt_move = best move yang tersimpan di transposition table untuk posisi ini (kalau ada)
+    def order_moves(self, game_state, valid_moves, tt_move, ply):
+        if not self.move_ordering or len(valid_moves) < 2:
+            return valid_moves
+
+        killer_1, killer_2 = self.killers[ply]
+        history = self.history[game_state.current_player]
+        weights = self.POSITIONAL_WEIGHTS
+
+        def move_priority(move):
+            if move == tt_move:
+                return 1 << 62
+            if move == killer_1:
+                return 1 << 61
+            if move == killer_2:
+                return 1 << 60
+            # History lebih penting, bobot posisi (-40..120, digeser supaya positif) hanya sebagai tie-breaker
+            return (history[move[0] * 8 + move[1]] << 8) + weights[move[0]][move[1]] + 128
+
+        return sorted(valid_moves, key=move_priority, reverse=True)
+
+    # Dipanggil setiap kali sebuah move menyebabkan cutoff
+    # move_index = urutan move tersebut di node-nya (0 = move pertama yang dicoba)
+    def record_cutoff(self, game_state, move, move_index, depth, ply):
+        self.cutoffs += 1
+        self.ply_cutoffs[ply] += 1
+        if move_index == 0:
+            self.first_move_cutoffs += 1
+
+        killers = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+
+        self.history[game_state.current_player][move[0] * 8 + move[1]] += depth * depth
+
+    def first_move_cutoff_rate(self):
+        if self.cutoffs == 0:
+            return 0.0
+        return self.first_move_cutoffs / self.cutoffs
+
+    # Minta pencarian yang sedang berjalan untuk berhenti secepatnya
+    # Aman dipanggil dari thread lain; find_best_move tetap mengembalikan hasil dari depth terakhir yang selesai
+    def stop(self):
+        self.stop_event.set()
+        if self.parallel is not None:
+            self.parallel.stop()
+
+    # Matikan pool process dari parallel search dan tutup file opening book (kalau ada)
+    def close(self):
+        if self.parallel is not None:
+            self.parallel.close()
+        if self.opening_book is not None:
+            self.opening_book.close()
+            self.opening_book = None
+
+    # Bagi sisa waktu di jam game untuk 1 move AI
+    # Jamnya dipakai bersama oleh manusia dan AI, dan setiap kotak kosong kurang lebih = 1 giliran lagi,
+    # jadi jatah rata-rata per giliran = sisa waktu / jumlah kotak kosong
+    def allocate_time(self, remaining_ms, empties):
+        usable_ms = remaining_ms - TIME_SAFETY_MARGIN_MS
+        budget_ms = usable_ms / max(1, empties) * TIME_USAGE_FACTOR
+        return max(MIN_MOVE_TIME_MS, budget_ms)
+
     # Function untuk mencari move dengan nilai bobot tertinggi
-    def find_best_move(self, game_logic_instance):
+    # Return move-nya saja, detail pencariannya ada di self.last_stats (lihat search)
+    def find_best_move(self, game_logic_instance, time_limit_ms=None, remaining_ms=None, deadline=None):
+        return self.search(game_logic_instance, time_limit_ms, remaining_ms, deadline).move
+
+    # Pencariannya pakai iterative deepening: depth 1, 2, 3, ... dan selalu memakai hasil dari depth terakhir yang selesai
+    # time_limit_ms = batas waktu untuk move ini
+    # remaining_ms = sisa waktu di jam game, batas waktunya dihitung otomatis dengan allocate_time
+    # deadline = waktu absolut (time.perf_counter()) kapan pencarian harus berhenti
+    # Kalau ketiganya None, AI mencari sampai self.depth seperti biasa tanpa batas waktu
+    # Return SearchStats (stats.move = move terbaik, None kalau tidak ada valid move)
+    def search(self, game_logic_instance, time_limit_ms=None, remaining_ms=None, deadline=None):
+        stats = SearchStats()
+        self.last_stats = stats
+
+        # Ambilkan semua valid move untuk AI nya saat ini
+        valid_moves = game_logic_instance.get_valid_moves()
+        self.nodes = 0
+        if not valid_moves:
+            return self.finish_stats(stats, None, None)
+
+        # Cek opening book dulu, kalau ada tidak perlu mencari
+        if self.opening_book is not None:
+            book_entry = self.opening_book.probe(game_logic_instance)
+            if book_entry is not None:
+                move, score = book_entry
+                stats.source = "book"
+                return self.finish_stats(stats, move, score)
+
+        # Entry dari move-move sebelumnya tetap ada di table, hanya ditandai sebagai generation lama
+        if self.tt is not None:
+            self.tt.new_search()
+            tt_probes, tt_hits = self.tt.probes, self.tt.hits
+
+        empties = game_logic_instance.empty_count()
+        if deadline is None:
+            if time_limit_ms is None and remaining_ms is not None:
+                time_limit_ms = self.allocate_time(remaining_ms, empties)
+            if time_limit_ms is not None:
+                deadline = time.perf_counter() + time_limit_ms / 1000
+
+        # Hasil pondering untuk posisi ini (kalau manusia memainkan move yang sudah dipikirkan duluan)
+        # Kalau depth-nya sudah cukup, langsung dipakai; kalau belum, iterative deepening dilanjutkan dari depth berikutnya
+        key, symmetry = game_logic_instance.canonical_key()
+        pondered = self.ponder_results.get(key)
+        self.ponder_results = {}
+        if pondered is not None:
+            pondered = (move_from_canonical(pondered[0], symmetry), pondered[1], pondered[2])
+        if pondered is not None and pondered[0] not in valid_moves:
+            pondered = None
+        if pondered is not None:
+            self.ponder_hits += 1
+            if deadline is None and pondered[2] >= self.depth:
+                move, score, stats.depth = pondered
+                stats.source = "ponder"
+                return self.finish_stats(stats, move, score)
+
+        # Endgame: cari sampai akhir game kalau kotak kosongnya sudah cukup sedikit
+        # Kalau solver-nya kehabisan waktu, AI kembali ke pencarian heuristic biasa di bawah
+        if self.endgame_empties and empties <= self.endgame_empties:
+            move = self.solve_endgame(game_logic_instance, deadline)
+            if move is not None:
+                stats.source = "endgame"
+                stats.depth = empties
+                stats.nodes = self.nodes
+                return self.finish_stats(stats, move, self.last_score)
+            stats.endgame_timed_out = True
+
+        # Dengan batas waktu, AI boleh terus memperdalam sampai semua kotak kosong terisi
+        if deadline is None:
+            max_depth = self.depth
+        else:
+            max_depth = max(self.depth, empties)
+
+        self.deadline = deadline
+        self.reset_search_state()
+        valid_moves = self.order_root_moves(game_logic_instance, valid_moves)
+
+        best_move = valid_moves[0]
+        best_score = -math.inf
+        start_depth = 1
+        if pondered is not None:
+            best_move, best_score, ponder_depth = pondered
+            start_depth = ponder_depth + 1
+            stats.depth = ponder_depth
+            valid_moves.remove(best_move)
+            valid_moves.insert(0, best_move)
+
+        for depth in range(start_depth, max_depth + 1):
+            # Depth 1 tidak boleh dibatalkan, supaya selalu ada move yang bisa dikembalikan
+            # (kecuali sudah ada hasil dari pondering)
+            self.abortable = depth > start_depth or pondered is not None
+            iteration_started = time.perf_counter()
+            iteration_nodes = self.nodes
+            try:
+                if self.parallel is not None:
+                    move, score = self.parallel.search_root(self, game_logic_instance, valid_moves, depth)
+                elif self.search_algorithm == "pvs":
+                    move, score = self.aspiration_search(game_logic_instance, valid_moves, depth, best_score)
+                else:
+                    move, score = self.search_root(game_logic_instance, valid_moves, depth)
+            except SearchTimeout:
+                stats.timed_out = True
+                break
+
+            best_move, best_score = move, score
+            stats.depth = depth
+            stats.move, stats.score = move, score
+            stats.iterations.append({
+                "depth": depth,
+                "move": move,
+                "score": score,
+                "nodes": self.nodes - iteration_nodes,
+                "seconds": round(time.perf_counter() - iteration_started, 4),
+            })
+            self.update_stats(stats)
+            if self.tt is not None:
+                stats.tt_probes, stats.tt_hits = self.tt.probes - tt_probes, self.tt.hits - tt_hits
+            if self.stats_callback is not None:
+                self.stats_callback(stats)
+
+            # Move terbaik dari depth sebelumnya dicoba duluan di depth berikutnya, supaya pruning-nya lebih cepat terjadi
+            valid_moves.remove(move)
+            valid_moves.insert(0, move)
+
+            # Kalau sudah ketemu menang/kalah pasti, mencari lebih dalam tidak akan mengubah hasilnya
+            if score == math.inf or score == -math.inf:
+                break
+
+        self.deadline = None
+        self.abortable = False
+        self.stop_event.clear()
+
+        # Node dari iterasi yang dibatalkan juga dihitung
+        self.update_stats(stats)
+        if self.tt is not None:
+            stats.tt_probes, stats.tt_hits = self.tt.probes - tt_probes, self.tt.hits - tt_hits
+        return self.finish_stats(stats, best_move, best_score)
+
+    # Salin counter pencarian dari AIPlayer ke stats
+    def update_stats(self, stats):
+        stats.nodes = self.nodes
+        stats.leaf_evals = self.leaf_evals
+        stats.cutoffs_per_ply = list(self.ply_cutoffs)
+        stats.first_move_cutoffs = self.first_move_cutoffs
+        stats.pvs_researches = self.pvs_researches
+        stats.aspiration_failures = self.aspiration_failures
+        stats.probcut_cuts = self.probcut_cuts
+        stats.seconds = time.perf_counter() - stats.started
+
+    # Tandai pencarian selesai dan laporkan hasilnya ke stats_callback (default: print 1 baris log)
+    def finish_stats(self, stats, move, score):
+        stats.move = move
+        stats.score = score
+        stats.seconds = time.perf_counter() - stats.started
+        stats.finished = True
+        if move is not None:
+            self.last_score = score
+        if self.stats_callback is not None:
+            self.stats_callback(stats)
+        return stats
+
+    def reset_search_state(self):
+        self.nodes = 0
+        self.leaf_evals = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.ply_cutoffs = [0] * MAX_PLY
+        self.pvs_researches = 0
+        self.aspiration_failures = 0
+        self.probcut_cuts = 0
+        self.in_probcut = False
+
+        # Killer moves hanya relevan untuk posisi-posisi di pencarian ini, history cukup diperkecil supaya yang lama tidak mendominasi
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        for piece_history in self.history:
+            for square in range(64):
+                piece_history[square] >>= 1
+
+    # Urutan root untuk depth 1: best move dari pencarian sebelumnya (kalau posisinya ada di table), lalu heuristic biasa
+    def order_root_moves(self, game_logic_instance, valid_moves):
+        root_tt_move = None
+        if self.tt is not None:
+            entry = self.tt.probe(game_logic_instance.hash)
+            if entry is not None:
+                root_tt_move = entry[3]
+        return self.order_moves(game_logic_instance, valid_moves, root_tt_move, 0)
+
+    # Pondering: berpikir di waktu giliran manusia
+    # game_logic_instance = posisi saat manusia yang harus jalan (biasanya salinan, karena dipanggil dari background thread)
+    # Untuk setiap move manusia yang mungkin, AI mencari balasannya dengan iterative deepening (semua balasan di depth d dulu,
+    # baru depth d + 1), dan hasilnya disimpan di ponder_results; transposition table juga ikut terisi
+    # Berjalan terus sampai max_depth (default: sampai papan penuh) atau sampai stop() dipanggil
+    def ponder(self, game_logic_instance, max_depth=None):
+        self.ponder_results = {}
+        human_moves = game_logic_instance.get_valid_moves()
+        if not human_moves or game_logic_instance.current_player == self.player_piece:
+            return
+
+        # Endgame solver sudah cukup cepat, tidak perlu pondering
+        empties = game_logic_instance.empty_count()
+        if self.endgame_empties and empties - 1 <= self.endgame_empties:
+            return
+
+        if max_depth is None:
+            max_depth = empties - 1
+
+        # Move manusia yang paling mungkin dicoba duluan: best move yang diperkirakan AI di pencarian sebelumnya (dari table)
+        self.reset_search_state()
+        human_moves = self.order_root_moves(game_logic_instance, human_moves)
+
+        # Balasan AI yang sudah diurutkan, per move manusia (disimpan supaya urutan dari depth sebelumnya tetap dipakai)
+        replies = {}
+        self.abortable = True
+        try:
+            for depth in range(1, max_depth + 1):
+                for human_move in human_moves:
+                    undo = game_logic_instance.make_move(human_move[0], human_move[1])
+                    try:
+                        # Kalau setelah move ini AI harus pass, tidak ada yang perlu dipikirkan
+                        if game_logic_instance.current_player != self.player_piece:
+                            continue
+                        # Posisi simetris dari move manusia lain yang sudah dipikirkan di depth ini tidak perlu dicari lagi
+                        canonical, symmetry = game_logic_instance.canonical_key()
+                        previous = self.ponder_results.get(canonical)
+                        if previous is not None and previous[2] >= depth:
+                            continue
+                        key = game_logic_instance.hash
+                        ai_moves = replies.get(key)
+                        if ai_moves is None:
+                            ai_moves = game_logic_instance.get_valid_moves()
+                            if not ai_moves:
+                                continue
+                            ai_moves = self.order_root_moves(game_logic_instance, ai_moves)
+                            replies[key] = ai_moves
+
+                        move, score = self.search_root(game_logic_instance, ai_moves, depth)
+                        self.ponder_results[canonical] = (canonical_move(move, symmetry), score, depth)
+                        ai_moves.remove(move)
+                        ai_moves.insert(0, move)
+                    finally:
+                        game_logic_instance.unmake_move(undo)
+        except SearchTimeout:
+            pass
+        finally:
+            self.abortable = False
+            self.stop_event.clear()
+
+    # Analisis untuk hint di UI: score dari SETIAP valid move (bukan hanya yang terbaik) di posisi game_logic_instance,
+    # dari sudut pandang player_piece AI ini (jadi AIPlayer-nya dibuat untuk warna yang sedang jalan)
+    # Setiap move dicari dengan full window supaya score-nya exact, dengan iterative deepening dari start_depth sampai max_depth
+    # on_result(move, score, depth) dipanggil setiap kali 1 move selesai di 1 depth, jadi hasilnya bisa ditampilkan bertahap
+    # Berjalan sampai max_depth (default: sampai papan penuh) atau sampai stop() dipanggil
+    def analyze_moves(self, game_logic_instance, on_result, max_depth=None, start_depth=1):
+        moves = game_logic_instance.get_valid_moves()
+        if not moves or game_logic_instance.current_player != self.player_piece:
+            return
+
+        if max_depth is None:
+            max_depth = game_logic_instance.empty_count()
+
+        self.reset_search_state()
+        moves = self.order_root_moves(game_logic_instance, moves)
+        self.abortable = True
+        try:
+            for depth in range(start_depth, max_depth + 1):
+                scores = {}
+                for move in moves:
+                    undo = game_logic_instance.make_move(move[0], move[1])
+                    try:
+                        scores[move] = self.search_reply(game_logic_instance, depth - 1)
+                    finally:
+                        game_logic_instance.unmake_move(undo)
+                    on_result(move, scores[move], depth)
+                # Move terbaik dicari duluan di depth berikutnya
+                moves.sort(key=lambda move: scores[move], reverse=True)
+        except SearchTimeout:
+            pass
+        finally:
+            self.abortable = False
+            self.stop_event.clear()
+
+    # Return move terbaik dari endgame solver, atau None kalau solver-nya dibatalkan (deadline / stop)
+    def solve_endgame(self, game_logic_instance, deadline):
+        solver = self.endgame_solver
+        try:
+            move, disc_diff = solver.solve(game_logic_instance, deadline=deadline, stop_event=self.stop_event)
+        except EndgameTimeout:
+            return None
+
+        self.last_score = disc_diff
+        self.nodes = solver.last_nodes
+        return move
+
+    # Score (dari sudut pandang AI) dari posisi setelah AI jalan, dicari dengan search_algorithm yang dipilih
+    # Dipakai oleh semua yang menilai 1 move di root secara terpisah (analyze_moves, parallel search, opening book)
+    def search_reply(self, game_state, depth, alpha=-math.inf, beta=math.inf):
+        if self.search_algorithm == "pvs":
+            # Yang jalan di game_state adalah lawan, jadi window-nya dibalik dan score-nya dinegasi
+            return -self.pvs(game_state, depth, -beta, -alpha)
+        return self.alpha_beta(game_state, depth, alpha, beta, False)
+
+    # 1 iterasi dari iterative deepening: cari semua move di root sampai kedalaman depth
+    # Return (move terbaik, score-nya)
+    def search_root(self, game_logic_instance, valid_moves, depth):
+        if self.search_algorithm == "pvs":
+            return self.search_root_pvs(game_logic_instance, valid_moves, depth)
 
         best_move = None # Variable yang akan menampung posisi kotak untuk move terbaik (r, c)
         best_score = -math.inf # Untuk AI yang mau maximize scorenya, dia menyimpan kemungkinan terburuk dulu
         alpha = -math.inf # Alpha adalah nilai terbaik yang Maximizer (AI) nya bisa jamin untuk sekarang
         beta = math.inf # Beta adalah nilai terbaik yang Minimizer (AI) nya bisa jamin untuk sekarang
 
-        # Ambilkan semua valid move untuk AI nya saat ini
-        valid_moves = game_logic_instance.get_valid_moves()
-
         # Looping untuk mencoba semua valid move yang bisa dilakukan si AI
         # Untuk setiap valid move yang bisa dilakukan AI nya sekarang, dia akan bikin tree of the possibilities pakai function alpha_beta
         for move in valid_moves:
-            # Game nya di-deepcopy dulu untuk kepentingan simulasi saja, karena evaluasi MiniMaxnya tidak boleh mengubah state game yang asli
-            simulated_game = copy.deepcopy(game_logic_instance)
-            simulated_game.make_move(move[0], move[1])
-            
-            # Panggil function alpha_beta yang rekursif (bukan rekursif di sini, tapi rekursif di dalam dirinya sendiri nanti) -
-            # - untuk mendapatkan score dari move yang sedang disimulasikan ini
-            # depth - 1 karena kita sudah melakukan 1 move di level ini, jadi mengurangi difficulty depth yang bisa dia lakukan next
-            # Diset False karena setelah AI (Maximizer) jalan, next manusianya yang jalan (Minimizer)
-            move_score = self.alpha_beta(simulated_game, self.depth - 1, alpha, beta, False)
+            # Move-nya disimulasikan langsung di state game yang asli, lalu di-unmake lagi setelah dievaluasi
+            # Jadi tidak ada deepcopy per node, dan state game yang asli tetap sama persis setelah pencarian selesai
+            # (termasuk kalau pencariannya dibatalkan di tengah jalan karena waktunya habis)
+            undo = game_logic_instance.make_move(move[0], move[1])
+            try:
+                # Panggil function alpha_beta yang rekursif (bukan rekursif di sini, tapi rekursif di dalam dirinya sendiri nanti) -
+                # - untuk mendapatkan score dari move yang sedang disimulasikan ini
+                # depth - 1 karena kita sudah melakukan 1 move di level ini, jadi mengurangi difficulty depth yang bisa dia lakukan next
+                # Diset False karena setelah AI (Maximizer) jalan, next manusianya yang jalan (Minimizer)
+                move_score = self.alpha_beta(game_logic_instance, depth - 1, alpha, beta, False)
+            finally:
+                game_logic_instance.unmake_move(undo)
 
             # Untuk pertama, best_score pasti akan tergantikan oleh move_score karena best_score awalnya -inf
-            if move_score > best_score:
+            if best_move is None or move_score > best_score:
                 best_score = move_score
                 best_move = move
             
             # Update alpha for the root node, the best score yang bisa AI nya jamin untuk dirinya sendiri saat ini
             alpha = max(alpha, best_score)
-            
-        # Log hasil pemikirannya
-        print(f"AI chose move: {best_move} with score: {best_score}")
-        return best_move
+
+        # Root dicari dengan full window, jadi best_score-nya adalah nilai exact
+        if self.tt is not None:
+            self.tt.store(game_logic_instance.hash, depth, EXACT, best_score, best_move)
+
+        return best_move, best_score
 
     # Function yang rekursif
-    # game_state = Kondisi game saat ini (hasil deepcopy dari instance game_logic)
+    # game_state = Kondisi game saat ini (instance game_logic yang sama, move disimulasikan dengan make_move/unmake_move)
     # depth = Seberapa jauh AI nya boleh menerawang/melihat
     # alpha, beta = Variable yang dipakai untuk pruning
     # is_maximizing_player = Boolean untuk menandai apakah yang lagi dicek ini si AI atau manusianya
-    def alpha_beta(self, game_state, depth, alpha, beta, is_maximizing_player):
+    # ply = jarak node ini dari root (root = 0), untuk killer moves
+    def alpha_beta(self, game_state, depth, alpha, beta, is_maximizing_player, ply=1):
+
+        # Cek waktu (dan permintaan stop) setiap 256 node saja, karena time.perf_counter() juga ada biayanya
+        self.nodes += 1
+        if self.abortable and not (self.nodes & 255) and (
+            self.stop_event.is_set() or (self.deadline is not None and time.perf_counter() >= self.deadline)
+        ):
+            raise SearchTimeout()
 
-        # Ambil semua valid move untuk player yang lagi dievaluasi sekarang
-        valid_moves = game_state.get_valid_moves()
+        # Kalau sudah mencapai ujung kedalaman yang boleh dievaluasi, dia akan mengembalikan nilai evaluasi papan saat ini
+        # Di sini cukup dicek apakah player-nya masih bisa jalan (has_any_move), move-move-nya tidak perlu dibuat
+        if depth == 0: # ****
+            if game_state.has_any_move():
+                self.leaf_evals += 1
+                return self.evaluate(game_state, game_over=False)
+            moves = None
+        else:
+            # Ambil semua valid move untuk player yang lagi dievaluasi sekarang, sekalian dengan piece yang akan dibalik
+            # (generate_moves), jadi make_move di bawah tidak perlu mencari ulang
+            moves = game_state.generate_moves()
         
         # Cek kalau sudah tidak ada valid move untuk keduanya
         # Kalau keduanya sudah tidak ada valid move, kembalikan board evaluation sebagai game over
-        if not valid_moves:
-            temp_game = copy.deepcopy(game_state)
-            temp_game.switch_player()
-            if not temp_game.get_valid_moves():
-                return self.evaluate_board(game_state.board, game_over=True)
+        if not moves:
+            other_player = WHITE_PIECE if game_state.current_player == BLACK_PIECE else BLACK_PIECE
+            if not game_state.has_any_move(other_player):
+                self.leaf_evals += 1
+                return self.evaluate(game_state, game_over=True)
             else:
                 # Ini adalah kondisi kalau player yang lagi dievaluasi sekarang sudah tidak punya valid move
                 # Tetap lanjutnya evaluasi MiniMax dari sudut pandang player lain
                 # Kedalamannya tidak berkurang kareng ini dipaksa untuk diskip
-                if is_maximizing_player:
-                    # Kalau AI harus skip, jadi Min dicek
-                    return self.alpha_beta(temp_game, depth, alpha, beta, False)
-                else:
-                    # Kalau manusia harus skip, evaluasi lanjut untuk Max/AI
-                    return self.alpha_beta(temp_game, depth, alpha, beta, True)
+                # switch_player adalah kebalikan dirinya sendiri, jadi cukup di-switch lagi untuk mengembalikan state-nya
+                game_state.switch_player()
+                try:
+                    if is_maximizing_player:
+                        # Kalau AI harus skip, jadi Min dicek
+                        value = self.alpha_beta(game_state, depth, alpha, beta, False, ply + 1)
+                    else:
+                        # Kalau manusia harus skip, evaluasi lanjut untuk Max/AI
+                        value = self.alpha_beta(game_state, depth, alpha, beta, True, ply + 1)
+                finally:
+                    game_state.switch_player()
+                return value
 
-        # Kalau sudah mencapai ujung kedalaman yang boleh dievaluasi, dia akan mengembalikan nilai evaluasi papan saat ini
-        if depth == 0: # ****
-            return self.evaluate_board(game_state.board, game_over=False)
+        # Cek transposition table dulu
+        # Score di table selalu dari sudut pandang AI (sama seperti evaluate), jadi bisa dipakai di node Max maupun Min
+        # Entry hanya dipakai kalau dulu dicari minimal sedalam depth yang sekarang
+        # Best move yang tersimpan tetap dipakai untuk move ordering walaupun depth-nya kurang
+        tt = self.tt
+        tt_move = None
+        if tt is not None:
+            key = game_state.hash
+            entry = tt.probe(key)
+            if entry is not None:
+                tt_move = entry[3]
+            if entry is not None and entry[0] >= depth:
+                _, bound, score, _ = entry
+                if bound == EXACT:
+                    return score
+                if bound == LOWER_BOUND:
+                    alpha = max(alpha, score)
+                elif bound == UPPER_BOUND:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        # Window yang benar-benar dipakai untuk node ini, untuk menentukan bound type waktu disimpan ke table
+        alpha_start, beta_start = alpha, beta
+        best_move = None
+
+        valid_moves = self.order_moves(game_state, list(moves), tt_move, ply)
 
         # Bagian yang rekursif
         if is_maximizing_player:
             best_value = -math.inf
-            for move in valid_moves:
-                # Simulasikan move yang bisa diambil pada copy-an dari game statenya
-                new_game_state = copy.deepcopy(game_state)
-                new_game_state.make_move(move[0], move[1])
-                
-                # Setelah Max jalan, next cek untuk Min
-                value = self.alpha_beta(new_game_state, depth - 1, alpha, beta, False)
+            for move_index, move in enumerate(valid_moves):
+                # Simulasikan move yang bisa diambil langsung di game statenya, lalu di-unmake lagi
+                undo = game_state.make_move(move[0], move[1], moves[move])
+                try:
+                    # Setelah Max jalan, next cek untuk Min
+                    value = self.alpha_beta(game_state, depth - 1, alpha, beta, False, ply + 1)
+                finally:
+                    game_state.unmake_move(undo)
                 # Kalau udh mentok nanti akan return positional weightnya di ****
 
                 # Cek perbandingan antara best_value yang ditetapkan pertama dengan value yang baru didapat
-                best_value = max(best_value, value)
+                if value > best_value:
+                    best_value = value
+                    best_move = move
                 alpha = max(alpha, best_value)
                 
                 # Bagian pruning dari loopnya, kalau manusia sudah punya nilai beta (skor terendah yang bisa dia jamin untuk dirinya sendiri) 
                 # yang lebih kecil atau sama dengan alpha (skor tertinggi yang bisa AI jamin untuk dirinya sendiri)
                 # Skip karena gamungkin si manusia (berdasarkan algoritma MiniMax) akan ambil move tersebut
                 if alpha >= beta:
+                    self.record_cutoff(game_state, move, move_index, depth, ply)
                     break # Beta cutoff
-            return best_value
             
         else: # Minimizing player
             best_value = math.inf
-            for move in valid_moves:
+            for move_index, move in enumerate(valid_moves):
                 # Simulate the move
-                new_game_state = copy.deepcopy(game_state)
-                new_game_state.make_move(move[0], move[1])
-                
-                # Recurse (it's now the maximizer's turn)
-                value = self.alpha_beta(new_game_state, depth - 1, alpha, beta, True)
+                undo = game_state.make_move(move[0], move[1], moves[move])
+                try:
+                    # Recurse (it's now the maximizer's turn)
+                    value = self.alpha_beta(game_state, depth - 1, alpha, beta, True, ply + 1)
+                finally:
+                    game_state.unmake_move(undo)
                 
-                best_value = min(best_value, value)
+                if value < best_value:
+                    best_value = value
+                    best_move = move
                 beta = min(beta, best_value)
                 
                 # Pruning
                 if alpha >= beta:
+                    self.record_cutoff(game_state, move, move_index, depth, ply)
                     break # Alpha cutoff
-            return best_value
+
+        if tt is not None:
+            if best_value <= alpha_start:
+                bound = UPPER_BOUND
+            elif best_value >= beta_start:
+                bound = LOWER_BOUND
+            else:
+                bound = EXACT
+            tt.store(key, depth, bound, best_value, best_move)
+
+        return best_value
+
+    # --- Principal Variation Search (search_algorithm="pvs") ---
+    # Aspiration window: root dicari dulu dengan window sempit di sekitar score iterasi sebelumnya (guess)
+    # Kalau hasilnya jatuh di luar window (fail low / fail high), sisi yang gagal diperlebar lalu root dicari ulang
+    # Hasil akhirnya selalu exact, jadi sama dengan pencarian full window
+    def aspiration_search(self, game_logic_instance, valid_moves, depth, guess):
+        if guess == math.inf or guess == -math.inf:
+            return self.search_root_pvs(game_logic_instance, valid_moves, depth)
+
+        delta = ASPIRATION_WINDOW
+        alpha, beta = guess - delta, guess + delta
+        while True:
+            move, score = self.search_root_pvs(game_logic_instance, valid_moves, depth, alpha, beta)
+            if (score > alpha or alpha == -math.inf) and (score < beta or beta == math.inf):
+                return move, score
+            self.aspiration_failures += 1
+            delta *= 4
+            if score <= alpha:
+                alpha = -math.inf if delta > ASPIRATION_LIMIT else score - delta
+            else:
+                beta = math.inf if delta > ASPIRATION_LIMIT else score + delta
+
+    # Sama seperti search_root, tapi move ke-2 dan seterusnya dicari dengan null window (lihat pvs)
+    # Dengan window (alpha, beta) yang bukan full window, score-nya hanya exact kalau jatuh di dalam window tersebut
+    def search_root_pvs(self, game_logic_instance, valid_moves, depth, alpha=-math.inf, beta=math.inf):
+        alpha_start, beta_start = alpha, beta
+        best_move = None
+        best_score = -math.inf
+
+        for move_index, move in enumerate(valid_moves):
+            undo = game_logic_instance.make_move(move[0], move[1])
+            try:
+                if move_index == 0 or alpha == -math.inf:
+                    score = -self.pvs(game_logic_instance, depth - 1, -beta, -alpha)
+                else:
+                    score = -self.pvs(game_logic_instance, depth - 1, -alpha - 1, -alpha)
+                    if alpha < score < beta:
+                        self.pvs_researches += 1
+                        score = -self.pvs(game_logic_instance, depth - 1, -beta, -alpha)
+            finally:
+                game_logic_instance.unmake_move(undo)
+
+            if best_move is None or score > best_score:
+                best_score = score
+                best_move = move
+            alpha = max(alpha, best_score)
+            if alpha >= beta:
+                break
+
+        if self.tt is not None:
+            if best_score <= alpha_start:
+                bound = UPPER_BOUND
+            elif best_score >= beta_start:
+                bound = LOWER_BOUND
+            else:
+                bound = EXACT
+            self.tt.store(game_logic_instance.hash, depth, bound, best_score, best_move)
+
+        return best_move, best_score
+
+    # Negamax: score selalu dari sudut pandang pihak yang sedang jalan di game_state, jadi hanya ada 1 cabang
+    # (score anak = -score dari sudut pandang lawan), bukan cabang Max dan Min yang terpisah seperti alpha_beta
+    # Move pertama (biasanya PV dari transposition table) dicari dengan window (alpha, beta); move-move berikutnya dengan
+    # null window (alpha, alpha + 1) yang hanya membuktikan "tidak lebih baik dari alpha". Kalau ternyata lebih baik
+    # (fail high), move itu dicari ulang dengan window penuh. Score evaluasi selalu integer, jadi null window selebar 1 cukup
+    # Transposition table tetap menyimpan score dari sudut pandang AI (dipakai bersama alpha_beta / search_root),
+    # jadi score dan jenis bound-nya dibalik di node di mana lawan yang jalan
+    def pvs(self, game_state, depth, alpha, beta, ply=1):
+        self.nodes += 1
+        if self.abortable and not (self.nodes & 255) and (
+            self.stop_event.is_set() or (self.deadline is not None and time.perf_counter() >= self.deadline)
+        ):
+            raise SearchTimeout()
+
+        ai_to_move = game_state.current_player == self.player_piece
+
+        if depth == 0:
+            if game_state.has_any_move():
+                self.leaf_evals += 1
+                score = self.evaluate(game_state, game_over=False)
+                return score if ai_to_move else -score
+            moves = None
+        else:
+            moves = game_state.generate_moves()
+
+        if not moves:
+            other_player = WHITE_PIECE if game_state.current_player == BLACK_PIECE else BLACK_PIECE
+            if not game_state.has_any_move(other_player):
+                self.leaf_evals += 1
+                score = self.evaluate(game_state, game_over=True)
+                return score if ai_to_move else -score
+            # Pass: depth tidak berkurang, giliran (dan sudut pandang score-nya) pindah ke lawan
+            game_state.switch_player()
+            try:
+                value = -self.pvs(game_state, depth, -beta, -alpha, ply + 1)
+            finally:
+                game_state.switch_player()
+            return value
+
+        tt = self.tt
+        tt_move = None
+        if tt is not None:
+            key = game_state.hash
+            entry = tt.probe(key)
+            if entry is not None:
+                tt_move = entry[3]
+            if entry is not None and entry[0] >= depth:
+                _, bound, score, _ = entry
+                if not ai_to_move:
+                    score = -score
+                    bound = FLIPPED_BOUND[bound]
+                if bound == EXACT:
+                    return score
+                if bound == LOWER_BOUND:
+                    alpha = max(alpha, score)
+                elif bound == UPPER_BOUND:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        # Multi-ProbCut: search dangkal memprediksi apakah search sampai depth ini akan cutoff
+        # Tidak dipakai kalau search-nya sampai ke akhir game (depth >= jumlah kotak kosong), karena hasilnya exact
+        empties = game_state.disc_count[EMPTY]
+        if self.probcut is not None and not self.in_probcut and depth < empties:
+            checks = self.probcut.checks_for(depth, empties)
+            if checks:
+                cut = self.probcut_cut(game_state, checks, alpha, beta, ply)
+                if cut is not None:
+                    return cut
+
+        alpha_start, beta_start = alpha, beta
+        best_value = -math.inf
+        best_move = None
+
+        valid_moves = self.order_moves(game_state, list(moves), tt_move, ply)
+
+        for move_index, move in enumerate(valid_moves):
+            undo = game_state.make_move(move[0], move[1], moves[move])
+            try:
+                # Null window tidak bisa dibuat di sekitar -inf, jadi selama alpha masih -inf semua move dicari dengan window penuh
+                if move_index == 0 or alpha == -math.inf:
+                    value = -self.pvs(game_state, depth - 1, -beta, -alpha, ply + 1)
+                else:
+                    value = -self.pvs(game_state, depth - 1, -alpha - 1, -alpha, ply + 1)
+                    if alpha < value < beta:
+                        self.pvs_researches += 1
+                        value = -self.pvs(game_state, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                game_state.unmake_move(undo)
+
+            if value > best_value:
+                best_value = value
+                best_move = move
+            alpha = max(alpha, best_value)
+            if alpha >= beta:
+                self.record_cutoff(game_state, move, move_index, depth, ply)
+                break
+
+        if tt is not None:
+            if best_value <= alpha_start:
+                bound = UPPER_BOUND
+            elif best_value >= beta_start:
+                bound = LOWER_BOUND
+            else:
+                bound = EXACT
+            if ai_to_move:
+                tt.store(key, depth, bound, best_value, best_move)
+            else:
+                tt.store(key, depth, FLIPPED_BOUND[bound], -best_value, best_move)
+
+        return best_value
+
+    # checks = [(depth dangkal, slope, intercept, margin), ...] dari ProbCut.checks_for
+    # Prediksi score depth penuh = slope * score dangkal + intercept; node di-cutoff kalau prediksinya melewati beta (atau alpha)
+    # dengan jarak minimal margin (= confidence * sigma). Setiap check cukup 1 search dangkal dengan null window di batasnya
+    # Return beta / alpha kalau di-cutoff (fail hard, tidak disimpan di transposition table), None kalau tidak
+    def probcut_cut(self, game_state, checks, alpha, beta, ply):
+        self.in_probcut = True
+        try:
+            for shallow, slope, intercept, margin in checks:
+                if beta != math.inf:
+                    bound = math.ceil((beta + margin - intercept) / slope)
+                    if self.pvs(game_state, shallow, bound - 1, bound, ply) >= bound:
+                        self.probcut_cuts += 1
+                        return beta
+                if alpha != -math.inf:
+                    bound = math.floor((alpha - margin - intercept) / slope)
+                    if self.pvs(game_state, shallow, bound, bound + 1, ply) <= bound:
+                        self.probcut_cuts += 1
+                        return alpha
+        finally:
+            self.in_probcut = False
+        return None
@@ -1,8 +1,172 @@
 import pygame
+import os
 import sys
-from game_logic import GameLogic, AIPlayer
+from game_logic import GameLogic, AIPlayer, canonical_move
+from ai_worker import SearchWorker
 import game_logic as const
 
+# AI tetap "berpikir" minimal selama ini (ms) supaya manusia sempat melihat hasil move-nya sendiri
+AI_MIN_THINK_MS = 1000
+
+# Jumlah process untuk pencarian AI, > 1 untuk root-parallel search di beberapa core (1 = tanpa process tambahan)
+AI_WORKERS = 1
+
+# Opening book yang dibuat dengan "python opening_book.py build", dipakai kalau file-nya ada
+AI_OPENING_BOOK = "opening_book.bin"
+
+# Pondering: AI memikirkan balasan untuk move-move manusia selama giliran manusia
+AI_PONDER = True
+
+# Hint score: score dari analisis engine di setiap titik hint manusia, dihitung di background (tombol H untuk on/off)
+# Depth-nya naik terus sampai HINT_MAX_DEPTH; hasilnya muncul bertahap dan disimpan per posisi
+UI_HINT_SCORES = False
+HINT_MAX_DEPTH = 8
+HINT_TT_MB = 8
+
+# Render mode: True = hanya bagian layar yang berubah yang digambar ulang (pygame.display.update(rects)),
+# dan kalau tidak ada yang berubah loop-nya tidur menunggu event, jadi game yang idle hampir tidak memakai CPU
+# False = seluruh layar digambar ulang dan di-flip setiap frame (60 fps)
+UI_DIRTY_RECTS = True
+
+# Event yang di-post oleh SearchWorker begitu pencarian AI selesai, supaya loop yang sedang menunggu langsung bangun
+AI_DONE_EVENT = pygame.USEREVENT + 1
+
+# Event yang di-post setiap kali analisis hint menghasilkan score baru, supaya loop yang sedang tidur ikut menggambarnya
+HINT_EVENT = pygame.USEREVENT + 2
+
+# Event dari window manager kalau isi window perlu digambar ulang semua (misalnya setelah tertutup window lain)
+WINDOW_EXPOSE_EVENTS = {pygame.VIDEOEXPOSE, getattr(pygame, "WINDOWEXPOSED", pygame.VIDEOEXPOSE)}
+
+# --- Render Cache ---
+# Semua yang bisa dipakai ulang antar frame dibuat sekali saja di sini:
+# font, permukaan papan + garis grid, sprite disk dan titik hint, dan teks yang sudah di-render
+# Dibuat "lazy" (waktu pertama kali dipakai), karena pygame.init() baru dipanggil di run_game
+class RenderCache:
+    def __init__(self):
+        self.fonts = {}
+        self.board_surface = None
+        self.piece_sprites = {}
+        self.hint_sprite = None
+        self.hover_sprite = None
+        # slot -> (font, teks, warna, surface); teks hanya di-render ulang kalau isinya / warnanya berubah
+        self.texts = {}
+
+    def font(self, name, size, bold=False, italic=False):
+        key = (name, size, bold, italic)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(name, size, bold=bold, italic=italic)
+            self.fonts[key] = font
+        return font
+
+    def text(self, slot, font, text, color):
+        cached = self.texts.get(slot)
+        if cached is not None and cached[0] is font and cached[1] == text and cached[2] == color:
+            return cached[3]
+        surface = font.render(text, True, color)
+        self.texts[slot] = (font, text, color, surface)
+        return surface
+
+    # Papan hijau + semua garis grid dalam 1 surface
+    def board(self):
+        if self.board_surface is None:
+            surface = pygame.Surface((const.WIDTH, const.BOARD_HEIGHT))
+            surface.fill(const.BOARD_COLOR)
+            for i in range(const.ROWS + 1):
+                pygame.draw.line(surface, const.LINE_COLOR, (0, i * const.SQUARE_SIZE), (const.WIDTH, i * const.SQUARE_SIZE), 2)
+                pygame.draw.line(surface, const.LINE_COLOR, (i * const.SQUARE_SIZE, 0), (i * const.SQUARE_SIZE, const.BOARD_HEIGHT), 2)
+            self.board_surface = surface
+        return self.board_surface
+
+    # Sprite seukuran 1 kotak (transparan) dengan disk di tengahnya
+    def piece(self, piece):
+        sprite = self.piece_sprites.get(piece)
+        if sprite is None:
+            color = const.BLACK if piece == const.BLACK_PIECE else const.WHITE
+            sprite = self.circle_sprite(color, const.PIECE_RADIUS)
+            self.piece_sprites[piece] = sprite
+        return sprite
+
+    def hint(self):
+        if self.hint_sprite is None:
+            self.hint_sprite = self.circle_sprite(const.VALID_MOVE_COLOR, const.HINT_RADIUS)
+        return self.hint_sprite
+
+    # Bayangan disk manusia (transparan) di kotak valid move yang sedang di-hover mouse
+    def hover(self):
+        if self.hover_sprite is None:
+            self.hover_sprite = self.circle_sprite(const.BLACK + (110,), const.PIECE_RADIUS)
+        return self.hover_sprite
+
+    @staticmethod
+    def circle_sprite(color, radius):
+        sprite = pygame.Surface((const.SQUARE_SIZE, const.SQUARE_SIZE), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, color, (const.SQUARE_SIZE // 2, const.SQUARE_SIZE // 2), radius)
+        return sprite
+
+
+# --- Hint Analysis ---
+# Score untuk setiap valid move manusia, dicari oleh AIPlayer terpisah yang bermain sebagai warna manusia
+# (jadi tidak berebut state / transposition table dengan AI lawan dan pondering-nya) di background thread
+# Hasilnya disimpan per posisi dengan key kanonik (GameLogic.canonical_key), jadi setelah takeback, atau di posisi yang
+# simetris, score-nya langsung muncul lagi dan analisisnya dilanjutkan dari depth terakhir yang sudah selesai
+class HintAnalysis:
+    def __init__(self, player_piece, on_update=None):
+        self.ai = AIPlayer(player_piece, tt_size_mb=HINT_TT_MB, endgame_empties=0, stats_callback=None)
+        self.worker = SearchWorker(self.ai)
+        self.on_update = on_update
+        # key kanonik posisi -> {move kanonik: (score, depth)}
+        self.results = {}
+        # key kanonik dari posisi yang sedang dianalisis (None = tidak ada)
+        self.position = None
+
+    # Dipanggil setiap frame selama giliran manusia: mulai menganalisis posisi game kalau posisinya berganti
+    def update(self, game):
+        key, symmetry = game.canonical_key()
+        if key == self.position:
+            return
+        self.cancel()
+        self.position = key
+
+        scores = self.results.setdefault(key, {})
+        moves = game.get_valid_moves()
+        done_depth = min(depth for _, depth in scores.values()) if len(scores) == len(moves) else 0
+        if done_depth >= HINT_MAX_DEPTH:
+            return
+
+        # Jalan di background thread; dict-nya hanya ditambah / ditimpa, jadi aman dibaca loop UI kapan saja
+        def on_result(move, score, depth):
+            scores[canonical_move(move, symmetry)] = (score, depth)
+            if self.on_update is not None:
+                self.on_update()
+
+        self.worker.start(game, task=self.ai.analyze_moves, on_result=on_result, max_depth=HINT_MAX_DEPTH,
+                          start_depth=done_depth + 1)
+
+    # Hentikan analisis yang sedang jalan (takeback, game baru, giliran AI, hint dimatikan)
+    # Hasil yang sudah ada tetap disimpan
+    def cancel(self):
+        self.worker.cancel()
+        self.position = None
+
+    # Return {move: label} untuk posisi game, hanya untuk move yang sudah punya score
+    def labels(self, game):
+        key, symmetry = game.canonical_key()
+        scores = self.results.get(key)
+        if not scores:
+            return {}
+        labels = {}
+        for move in game.get_valid_moves():
+            result = scores.get(canonical_move(move, symmetry))
+            if result is not None:
+                labels[move] = GameUI.score_label(result[0])
+        return labels
+
+    def close(self):
+        self.cancel()
+        self.ai.close()
+
+
 # --- Game Drawing Class ---
 # This class ONLY handles drawing to the screen.
 # It uses "static methods" so we can call them without creating an instance.
@@ -10,9 +174,13 @@ class GameUI:
     WIDTH = const.WIDTH
     HEIGHT = const.HEIGHT
 
+    # Dipakai bersama oleh semua method draw_*
+    cache = RenderCache()
+
 
     @staticmethod
     def draw_intro_screen(screen, start_btn_rect, min_input_rect, sec_input_rect, min_str, sec_str, active_input):
+        cache = GameUI.cache
 
         text_color = (23, 42, 58)
         box_fill_color = (255, 255, 255)
@@ -22,23 +190,21 @@ class GameUI:
         screen.fill((117, 221, 221))
         
         # Set fontsnya
-        title_font = pygame.font.SysFont(None, 80, bold=True)
-        subtitle_font = pygame.font.SysFont(None, 40, italic=True)
-        rules_font = pygame.font.SysFont(None, 28)
-        btn_font = pygame.font.SysFont(None, 42, bold=True)
+        title_font = cache.font(None, 80, bold=True)
+        subtitle_font = cache.font(None, 40, italic=True)
+        rules_font = cache.font(None, 28)
 
         # Tambahan fitur timer
-        timer_label_font = pygame.font.SysFont(None, 36, bold=True)
-        timer_font = pygame.font.SysFont("monospace", 50, bold=True)
-        timer_btn_font = pygame.font.SysFont(None, 50, bold=True)
+        timer_label_font = cache.font(None, 36, bold=True)
+        timer_font = cache.font("monospace", 50, bold=True)
 
         # Title Text
-        title_text = title_font.render("REVERSI", True, text_color)
+        title_text = cache.text("intro_title", title_font, "REVERSI", text_color)
         title_rect = title_text.get_rect(center=(const.WIDTH // 2, const.HEIGHT // 8))
         screen.blit(title_text, title_rect)
 
         # Subtitle text
-        subtitle_text = subtitle_font.render("Human vas AI", True, text_color)
+        subtitle_text = cache.text("intro_subtitle", subtitle_font, "Human vas AI", text_color)
         subtitle_rect = subtitle_text.get_rect(center=(const.WIDTH // 2, title_rect.bottom + 30))
         screen.blit(subtitle_text, subtitle_rect)
 
@@ -55,17 +221,17 @@ class GameUI:
 
         start_y = subtitle_rect.bottom + 40
         for i, rule in enumerate(rules):
-            rule_text = rules_font.render(rule, True, text_color)
+            rule_text = cache.text(("intro_rule", i), rules_font, rule, text_color)
             rule_rect = rule_text.get_rect(center=(const.WIDTH // 2, start_y + i * 35))
             screen.blit(rule_text, rule_rect)
 
         # Bagian timer
         timer_position_y = start_y + (len(rules) * 30) + 47
-        timer_label = timer_label_font.render("Set Game Timer", True, text_color)
+        timer_label = cache.text("intro_timer_label", timer_label_font, "Set Game Timer", text_color)
         timer_label_rect = timer_label.get_rect(center=(const.WIDTH // 2, timer_position_y))
         screen.blit(timer_label, timer_label_rect)
 
-        colon_text = timer_font.render(":", True, text_color)
+        colon_text = cache.text("intro_colon", timer_font, ":", text_color)
         colon_rect = colon_text.get_rect(center=(const.WIDTH // 2, timer_label_rect.bottom + 45))
         screen.blit(colon_text, colon_rect)
 
@@ -74,7 +240,7 @@ class GameUI:
         pygame.draw.rect(screen, box_fill_color, min_input_rect)
         pygame.draw.rect(screen, min_border_color, min_input_rect, 3) # 3px border
         # Format string to always show two digits, e.g., "05" or "5" -> "05"
-        min_surf = timer_font.render(f"{min_str.zfill(2)}", True, text_color)
+        min_surf = cache.text("intro_min", timer_font, f"{min_str.zfill(2)}", text_color)
         min_surf_rect = min_surf.get_rect(center=min_input_rect.center)
         screen.blit(min_surf, min_surf_rect)
 
@@ -82,15 +248,15 @@ class GameUI:
         sec_border_color = active_border_color if active_input == 'sec' else inactive_border_color
         pygame.draw.rect(screen, box_fill_color, sec_input_rect)
         pygame.draw.rect(screen, sec_border_color, sec_input_rect, 3) # 3px border
-        sec_surf = timer_font.render(f"{sec_str.zfill(2)}", True, text_color)
+        sec_surf = cache.text("intro_sec", timer_font, f"{sec_str.zfill(2)}", text_color)
         sec_surf_rect = sec_surf.get_rect(center=sec_input_rect.center)
         screen.blit(sec_surf, sec_surf_rect)
 
         # Draw labels under boxes
-        min_label = rules_font.render("MIN", True, text_color)
+        min_label = cache.text("intro_min_label", rules_font, "MIN", text_color)
         min_label_rect = min_label.get_rect(center=(min_input_rect.centerx, min_input_rect.bottom + 20))
         screen.blit(min_label, min_label_rect)
-        sec_label = rules_font.render("SEC", True, text_color)
+        sec_label = cache.text("intro_sec_label", rules_font, "SEC", text_color)
         sec_label_rect = sec_label.get_rect(center=(sec_input_rect.centerx, sec_input_rect.bottom + 20))
         screen.blit(sec_label, sec_label_rect)
         
@@ -99,72 +265,132 @@ class GameUI:
         pygame.draw.rect(screen, text_color, start_btn_rect, border_radius=10)
 
         # Draw the text on the button
-        btn_font = pygame.font.SysFont(None, 40)
-        btn_text = btn_font.render("START", True, const.WHITE)
+        btn_font = cache.font(None, 40)
+        btn_text = cache.text("intro_start", btn_font, "START", const.WHITE)
         btn_rect = btn_text.get_rect(center=start_btn_rect.center)
         screen.blit(btn_text, btn_rect)
 
 
     @staticmethod
     def draw_board(screen):
-        # Draws the board background and grid line
-        screen.fill(const.BOARD_COLOR)
-        for i in range(const.ROWS + 1):
-            pygame.draw.line(screen, const.LINE_COLOR, (0, i * const.SQUARE_SIZE), (const.WIDTH, i * const.SQUARE_SIZE), 2)
-            pygame.draw.line(screen, const.LINE_COLOR, (i * const.SQUARE_SIZE, 0), (i * const.SQUARE_SIZE, const.BOARD_HEIGHT), 2)
+        # Draws the board background and grid line (sudah di-render sekali di cache)
+        screen.blit(GameUI.cache.board(), (0, 0))
 
 
     @staticmethod
     def draw_pieces(screen, board):
         # Draws all the pieces currently on the boar
+        cache = GameUI.cache
         for row in range(const.ROWS):
             for col in range(const.COLS):
                 piece = board[row][col]
                 if piece != const.EMPTY:
-                    color = const.BLACK if piece == const.BLACK_PIECE else const.WHITE
-                    center_x = col * const.SQUARE_SIZE + const.SQUARE_SIZE // 2
-                    center_y = row * const.SQUARE_SIZE + const.SQUARE_SIZE // 2
-                    pygame.draw.circle(screen, color, (center_x, center_y), const.PIECE_RADIUS)
+                    screen.blit(cache.piece(piece), (col * const.SQUARE_SIZE, row * const.SQUARE_SIZE))
 
 
     @staticmethod
-    def draw_valid_moves(screen, moves_list):
+    def draw_valid_moves(screen, moves_list, hint_labels=None):
         
         # Draws hint dots for all valid moves.
+        hint = GameUI.cache.hint()
         for row, col in moves_list:
-            center_x = col * const.SQUARE_SIZE + const.SQUARE_SIZE // 2
-            center_y = row * const.SQUARE_SIZE + const.SQUARE_SIZE // 2
-            pygame.draw.circle(screen, const.VALID_MOVE_COLOR, (center_x, center_y), const.HINT_RADIUS)
+            screen.blit(hint, (col * const.SQUARE_SIZE, row * const.SQUARE_SIZE))
+            if hint_labels and (row, col) in hint_labels:
+                GameUI.draw_hint_label(screen, row, col, hint_labels[(row, col)])
+
+
+    @staticmethod
+    def score_label(score):
+        # Score dari sudut pandang manusia: "+12", "-3", atau "WIN" / "LOSS" untuk menang / kalah pasti
+        if score == float("inf"):
+            return "WIN"
+        if score == -float("inf"):
+            return "LOSS"
+        return f"{score:+d}" if isinstance(score, int) else f"{score:+.0f}"
+
+
+    @staticmethod
+    def draw_hint_label(screen, row, col, label):
+        # Score ditulis di bawah titik hint-nya
+        cache = GameUI.cache
+        label_surface = cache.text(("hint_label", row, col), cache.font(None, 22, bold=True), label, const.VALID_MOVE_COLOR)
+        center = (col * const.SQUARE_SIZE + const.SQUARE_SIZE // 2, row * const.SQUARE_SIZE + const.SQUARE_SIZE // 2 + 24)
+        screen.blit(label_surface, label_surface.get_rect(center=center))
+
+
+    @staticmethod
+    def draw_hover(screen, square):
+        row, col = square
+        screen.blit(GameUI.cache.hover(), (col * const.SQUARE_SIZE, row * const.SQUARE_SIZE))
+
+
+    @staticmethod
+    def board_square(pos):
+        # Kotak (row, col) di posisi pixel pos, atau None kalau di luar papan (misalnya di panel timer)
+        x, y = pos
+        if not (0 <= x < const.WIDTH and 0 <= y < const.BOARD_HEIGHT):
+            return None
+        return y // const.SQUARE_SIZE, x // const.SQUARE_SIZE
+
+
+    # --- Dirty rect drawing ---
+    # Isi yang harus terlihat di tiap kotak: (piece, titik hint?, hover?, label score hint), urut per baris
+    @staticmethod
+    def square_states(board, hint_moves, hover_square, hint_labels=None):
+        hints = set(hint_moves)
+        hint_labels = hint_labels or {}
+        states = []
+        for row in range(const.ROWS):
+            for col in range(const.COLS):
+                square = (row, col)
+                states.append((board[row][col], square in hints, square == hover_square, hint_labels.get(square)))
+        return states
+
+
+    @staticmethod
+    def draw_square(screen, row, col, state):
+        # Gambar ulang 1 kotak saja: potongan papan dari cache (termasuk garis grid-nya), lalu disk / hint di atasnya
+        cache = GameUI.cache
+        square_rect = pygame.Rect(col * const.SQUARE_SIZE, row * const.SQUARE_SIZE, const.SQUARE_SIZE, const.SQUARE_SIZE)
+        screen.blit(cache.board(), square_rect, area=square_rect)
+        piece, hint, hover, label = state
+        if piece != const.EMPTY:
+            screen.blit(cache.piece(piece), square_rect)
+        elif hover:
+            screen.blit(cache.hover(), square_rect)
+        elif hint:
+            screen.blit(cache.hint(), square_rect)
+        if label is not None and piece == const.EMPTY:
+            GameUI.draw_hint_label(screen, row, col, label)
+        return square_rect
+
+
+    @staticmethod
+    def draw_changed_squares(screen, states, drawn_states):
+        # Hanya kotak yang isinya berbeda dari yang terakhir digambar (disk yang dibalik, hint yang muncul / hilang, hover)
+        # Return rect-rect yang digambar ulang, untuk pygame.display.update
+        rects = []
+        for index, state in enumerate(states):
+            if drawn_states[index] != state:
+                rects.append(GameUI.draw_square(screen, index // const.COLS, index % const.COLS, state))
+                drawn_states[index] = state
+        return rects
     
 
     @staticmethod
-    def get_final_score(board):
-        ai_score = 0
-        human_score = 0
-        for r in range(const.ROWS):
-            for c in range(const.COLS):
-                if board[r][c] == const.BLACK_PIECE:
-                    human_score += 1
-                elif board[r][c] == const.WHITE_PIECE:
-                    ai_score += 1
+    def get_final_score(game):
+        # Jumlah disk per warna sudah di-maintain oleh GameLogic, jadi tidak perlu scan papan setiap frame
+        human_score = game.disc_count[const.BLACK_PIECE]
+        ai_score = game.disc_count[const.WHITE_PIECE]
         return human_score, ai_score
     
 
     @staticmethod
-    def draw_timer_panel(screen, game, remaining_ms):
-        panel_rect = pygame.Rect(0, const.BOARD_HEIGHT, const.WIDTH, const.UI_PANEL_HEIGHT)
-        pygame.draw.rect(screen, const.UI_PANEL_COLOR, panel_rect)
-        
-        score_font = pygame.font.SysFont(None, 36)
-        timer_font = pygame.font.SysFont("monospace", 42, bold=True)
-
-        human_score, ai_score = GameUI.get_final_score(game.board)
+    def timer_panel_texts(game, remaining_ms, ai_thinking=False, ai_stats=None):
+        # Semua teks yang ditampilkan di panel, supaya loop bisa mengecek apakah panelnya perlu digambar ulang
+        human_score, ai_score = GameUI.get_final_score(game)
         score_text = f"Human: {human_score} AI: {ai_score}"
-        score_surface = score_font.render(score_text, True, const.UI_TEXT_COLOR)
-        score_rect = score_surface.get_rect(center=panel_rect.center, left=panel_rect.left + 20)
-        screen.blit(score_surface, score_rect)
 
-        # Draw the timer
         remaining_seconds = max(0, remaining_ms // 1000)
         minutes = remaining_seconds // 60
         seconds = remaining_seconds % 60
@@ -173,20 +399,56 @@ class GameUI:
         timer_color = const.UI_TEXT_COLOR
         if remaining_seconds < 10:
             timer_color = (97, 28, 53)
+
+        # Indikator kalau AI sedang mencari move di background (titiknya bergerak supaya kelihatan tidak freeze)
+        thinking_text = None
+        if ai_thinking:
+            dots = "." * (pygame.time.get_ticks() // 400 % 4)
+            thinking_text = f"AI thinking{dots}"
+            # Depth yang sudah selesai dicari, dari SearchStats yang di-update live oleh pencarian di background
+            if ai_stats is not None and not ai_stats.finished and ai_stats.depth:
+                thinking_text = f"AI thinking (depth {ai_stats.depth}){dots}"
+
+        return score_text, timer_str, timer_color, thinking_text
+
+
+    @staticmethod
+    def draw_timer_panel(screen, panel_texts):
+        cache = GameUI.cache
+        score_text, timer_str, timer_color, thinking_text = panel_texts
+        panel_rect = pygame.Rect(0, const.BOARD_HEIGHT, const.WIDTH, const.UI_PANEL_HEIGHT)
+        pygame.draw.rect(screen, const.UI_PANEL_COLOR, panel_rect)
         
-        timer_surface = timer_font.render(timer_str, True, timer_color)
+        score_font = cache.font(None, 36)
+        timer_font = cache.font("monospace", 42, bold=True)
+
+        score_surface = cache.text("panel_score", score_font, score_text, const.UI_TEXT_COLOR)
+        score_rect = score_surface.get_rect(center=panel_rect.center, left=panel_rect.left + 20)
+        screen.blit(score_surface, score_rect)
+
+        # Draw the timer
+        timer_surface = cache.text("panel_timer", timer_font, timer_str, timer_color)
         timer_rect = timer_surface.get_rect(centery=panel_rect.centery, right=panel_rect.right - 20)
         screen.blit(timer_surface, timer_rect)
 
+        if thinking_text is not None:
+            thinking_font = cache.font(None, 28, italic=True)
+            thinking_surface = cache.text("panel_thinking", thinking_font, thinking_text, const.UI_TEXT_COLOR)
+            thinking_rect = thinking_surface.get_rect(midleft=(panel_rect.centerx - 50, panel_rect.centery))
+            screen.blit(thinking_surface, thinking_rect)
+
+        return panel_rect
+
 
     @staticmethod
     def draw_game_over_screen(screen, game, reset_btn_rect):
+        cache = GameUI.cache
         screen.fill((117, 221, 221))
 
         text_color = (23, 42, 58)
 
         # Calculate the final scores
-        human_score, ai_score = GameUI.get_final_score(game.board)
+        human_score, ai_score = GameUI.get_final_score(game)
         
         # Determine the winner
         if ai_score > human_score:
@@ -197,26 +459,26 @@ class GameUI:
             winner_text = "IT'S A DRAW!"
         
         # Draw the text
-        title_font = pygame.font.SysFont(None, 80, bold=True)
-        score_font = pygame.font.SysFont(None, 50)
-        winner_font = pygame.font.SysFont(None, 60, bold=True)
+        title_font = cache.font(None, 80, bold=True)
+        score_font = cache.font(None, 50)
+        winner_font = cache.font(None, 60, bold=True)
 
         # Title
-        title_text = title_font.render("GAME OVER", True, text_color)
+        title_text = cache.text("over_title", title_font, "GAME OVER", text_color)
         title_rect = title_text.get_rect(center=(const.WIDTH // 2, const.HEIGHT // 5))
         screen.blit(title_text, title_rect)
 
         # Scores
-        ai_score_text = score_font.render(f"AI (White): {ai_score}", True, text_color)
+        ai_score_text = cache.text("over_ai_score", score_font, f"AI (White): {ai_score}", text_color)
         ai_score_rect = ai_score_text.get_rect(center=(const.WIDTH // 2, title_rect.bottom + 60))
         screen.blit(ai_score_text, ai_score_rect)
 
-        human_score_text = score_font.render(f"HUMAN (Black): {human_score}", True, const.WHITE)
+        human_score_text = cache.text("over_human_score", score_font, f"HUMAN (Black): {human_score}", const.WHITE)
         human_score_rect = human_score_text.get_rect(center=(const.WIDTH // 2, ai_score_rect.bottom + 30))
         screen.blit(human_score_text, human_score_rect)
 
         # Winner
-        winner_text = winner_font.render(winner_text, True, text_color)
+        winner_text = cache.text("over_winner", winner_font, winner_text, text_color)
         winner_rect = winner_text.get_rect(center=(const.WIDTH // 2, human_score_rect.bottom + 60))
         screen.blit(winner_text, winner_rect)
 
@@ -225,12 +487,49 @@ class GameUI:
         pygame.draw.rect(screen, text_color, reset_btn_rect, border_radius=10)
 
         # Draw Play Again Button
-        btn_font = pygame.font.SysFont(None, 40)
-        btn_text = btn_font.render("PLAY AGAIN", True, const.WHITE)
+        btn_font = cache.font(None, 40)
+        btn_text = cache.text("over_play_again", btn_font, "PLAY AGAIN", const.WHITE)
         btn_text_rect = btn_text.get_rect(center=reset_btn_rect.center)
         screen.blit(btn_text, btn_text_rect)
 
 
+    @staticmethod
+    def idle_timeout_ms(game_state, game, timer_active, game_end_time, ai_worker, ai_player):
+        # Berapa lama (ms) loop boleh tidur menunggu event sebelum ada yang perlu berubah di layar
+        # None = tidak ada yang berubah sendiri, tunggu input saja (intro, game over, timer tidak aktif)
+        if game_state != "PLAYING" or not timer_active:
+            return None
+
+        # Angka detik di timer berganti
+        remaining_ms = game_end_time - pygame.time.get_ticks()
+        timeout = max(0, remaining_ms) % 1000 + 1
+
+        if game.current_player == ai_player:
+            # Animasi titik "AI thinking..."
+            timeout = min(timeout, 400 - pygame.time.get_ticks() % 400)
+            # Hasil AI sudah ada (AI_DONE_EVENT sudah diterima), tinggal menunggu waktu minimal berpikirnya lewat
+            if ai_worker.finished:
+                timeout = min(timeout, int(AI_MIN_THINK_MS - ai_worker.elapsed_ms()) + 1)
+        return max(1, timeout)
+
+
+    @staticmethod
+    def take_back(game, history, human_player):
+        # Kembalikan posisi ke sebelum move terakhir manusia (termasuk balasan AI dan pass sesudahnya)
+        # history = list (player, undo record dari make_move, atau None untuk pass) dengan urutan dimainkan
+        # Return False kalau manusia belum pernah jalan
+        if not any(player == human_player and undo is not None for player, undo in history):
+            return False
+        while True:
+            player, undo = history.pop()
+            if undo is None:
+                game.switch_player()
+            else:
+                game.unmake_move(undo)
+            if player == human_player and undo is not None:
+                return True
+
+
     def run_game(self):
         # Initialize all Pygame modules
         pygame.init()
@@ -255,8 +554,13 @@ class GameUI:
         # 4 is decent. 5-6 is much stronger but slower.
         # Initialize the game objects as empty first because hrs melalui screen intro dulu
         ai = None
+        ai_worker = None # SearchWorker yang menjalankan pencarian AI di background thread
+        ponder_worker = None # SearchWorker yang menjalankan pondering selama giliran manusia
+        hints = None # HintAnalysis untuk score di titik hint manusia
+        show_hint_scores = UI_HINT_SCORES
         game = None
         valid_moves = []
+        history = [] # (player, undo record / None untuk pass) dari setiap giliran, untuk takeback
 
         game_end_time = 0
         remaining_ms = 0
@@ -303,9 +607,26 @@ class GameUI:
             box_height
         )
 
+        full_redraw = True # Seluruh layar harus digambar ulang (pertama kali, ganti screen, window ter-expose)
+        drawn_state = None # game_state dari frame terakhir yang digambar
+        drawn_squares = [None] * (const.ROWS * const.COLS) # Isi tiap kotak yang terakhir digambar (lihat square_states)
+        drawn_panel = None # Teks panel yang terakhir digambar
+        hover_square = None # Kotak papan di bawah kursor mouse
+
         running = True
         while running:
 
+            # --- Wait for events ---
+            # Mode dirty rect: loop tidur di event.wait sampai ada input, pencarian AI selesai (AI_DONE_EVENT),
+            # atau ada yang perlu berubah di layar (detik timer, animasi "AI thinking")
+            # Kalau screen-nya baru berganti, jangan tidur dulu supaya screen barunya langsung digambar
+            if UI_DIRTY_RECTS and game_state == drawn_state:
+                timeout = self.idle_timeout_ms(game_state, game, timer_active, game_end_time, ai_worker, AI_PLAYER)
+                first_event = pygame.event.wait() if timeout is None else pygame.event.wait(timeout)
+                events = [first_event] + pygame.event.get()
+            else:
+                events = pygame.event.get()
+
             if timer_active and game_state == "PLAYING":
                 current_ticks = pygame.time.get_ticks()
                 remaining_ms = game_end_time - current_ticks
@@ -314,11 +635,28 @@ class GameUI:
                     timer_active = False
                     game_state = "GAME_OVER"
                     print("Time's up! Game Over.")
+                    # Jam habis di tengah pencarian AI, jadi pencariannya langsung dibatalkan
+                    if ai_worker is not None:
+                        ponder_worker.cancel()
+                        ai_worker.cancel()
+                        hints.cancel()
 
             # --- Event Handling ---
-            for event in pygame.event.get():
+            for event in events:
+                if event.type in WINDOW_EXPOSE_EVENTS:
+                    full_redraw = True
+                elif event.type == pygame.MOUSEMOTION:
+                    hover_square = self.board_square(event.pos)
+
                 if event.type == pygame.QUIT:
                     running = False
+                    if ai_worker is not None:
+                        ponder_worker.cancel()
+                        ai_worker.cancel()
+                        hints.close()
+                        ai.close()
+                    # Event lain di frame ini tidak diproses lagi
+                    break
 
                 if game_state == "INTRO":
                     if event.type == pygame.MOUSEBUTTONDOWN:
@@ -326,9 +664,14 @@ class GameUI:
                             game_state = "PLAYING"
                             # Sekarang baru bikin objek-objek gamenya
                             # --- Create an instance of the game logic ---
-                            game = GameLogic()
-                            ai = AIPlayer(AI_PLAYER)
+                            game = GameLogic(backend="bitboard")
+                            book_path = AI_OPENING_BOOK if os.path.exists(AI_OPENING_BOOK) else None
+                            ai = AIPlayer(AI_PLAYER, workers=AI_WORKERS, opening_book=book_path)
+                            ai_worker = SearchWorker(ai, on_finished=lambda: pygame.event.post(pygame.event.Event(AI_DONE_EVENT)))
+                            ponder_worker = SearchWorker(ai)
+                            hints = HintAnalysis(HUMAN_PLAYER, on_update=lambda: pygame.event.post(pygame.event.Event(HINT_EVENT)))
                             valid_moves = game.get_valid_moves()
+                            history = []
 
                             try:
                                 selected_min = int(min_input_str)
@@ -388,7 +731,22 @@ class GameUI:
                             sec_input_str = current_str
 
                 elif game_state == "PLAYING":
-                    if event.type == pygame.MOUSEBUTTONDOWN and game.current_player == HUMAN_PLAYER and timer_active:
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_h:
+                        # Score hint on/off; hasil yang sudah dihitung tetap disimpan
+                        show_hint_scores = not show_hint_scores
+                        if not show_hint_scores:
+                            hints.cancel()
+
+                    elif event.type == pygame.KEYDOWN and event.key == pygame.K_u and timer_active:
+                        # Takeback (U): semua pekerjaan di background untuk posisi yang sekarang dihentikan dulu
+                        ponder_worker.cancel()
+                        ai_worker.cancel()
+                        hints.cancel()
+                        if self.take_back(game, history, HUMAN_PLAYER):
+                            valid_moves = game.get_valid_moves()
+                            pygame.display.set_caption("Othello (Reversi)")
+
+                    elif event.type == pygame.MOUSEBUTTONDOWN and game.current_player == HUMAN_PLAYER and timer_active:
                         # 1. Get mouse position in pixels
                         mouse_x, mouse_y = pygame.mouse.get_pos()
                         
@@ -398,9 +756,14 @@ class GameUI:
                         
                         # 3. Check if the clicked square is in our list of valid moves
                         if (clicked_row, clicked_col) in valid_moves:
+
+                            # Pondering harus berhenti dulu sebelum AI mulai mencari (mereka memakai AIPlayer yang sama)
+                            # Hasil pondering untuk move yang dipilih tetap tersimpan di ai.ponder_results
+                            ponder_worker.cancel()
+                            hints.cancel()
                             
                             # --- Make the move ---
-                            game.make_move(clicked_row, clicked_col)
+                            history.append((HUMAN_PLAYER, game.make_move(clicked_row, clicked_col)))
                             
                             # --- Get the valid moves for the *next* player ---
                             valid_moves = game.get_valid_moves()
@@ -409,6 +772,7 @@ class GameUI:
                             # If the new player has no valid moves, skip their turn
                             if not valid_moves:
                                 print(f"Player {game.current_player} (AI) has no moves! Skipping turn.")
+                                history.append((game.current_player, None))
                                 game.switch_player()
                                 valid_moves = game.get_valid_moves()
                                 
@@ -423,9 +787,18 @@ class GameUI:
                         # Check if kita click di reset buttonnya
                         if reset_btn_rect.collidepoint(event.pos):
                             # Reset game => Sama kek mulai game baru tadi
+                            if ai_worker is not None:
+                                ponder_worker.cancel()
+                                ai_worker.cancel()
+                                hints.close()
+                                ai.close()
                             game = None
                             ai = None
+                            ai_worker = None
+                            ponder_worker = None
+                            hints = None
                             valid_moves = []
+                            history = []
                             game_end_time = 0
                             remaining_ms = 0
                             timer_active = False
@@ -435,34 +808,49 @@ class GameUI:
                             active_input = None
 
                             game_state = "INTRO"
-            
+
+            # AI dan worker-nya sudah ditutup waktu QUIT, jadi bagian game logic / drawing di bawah tidak boleh jalan lagi
+            # (misalnya memulai pencarian baru yang membuat process pool baru tepat sebelum pygame.quit)
+            if not running:
+                break
+
             # Game Logic dan Drawing (based on the states)
+            # Intro dan game over hanya berubah karena input, jadi di mode dirty rect cukup digambar ulang kalau ada event
+            if game_state != drawn_state:
+                full_redraw = True
+            had_input = any(event.type != pygame.NOEVENT for event in events)
+            redraw_screen = full_redraw or had_input or not UI_DIRTY_RECTS
+            dirty_rects = []
+            drawing_state = game_state
+
             if game_state == "INTRO":
-                self.draw_intro_screen(screen, start_btn_rect, min_input_rect, sec_input_rect, min_input_str, sec_input_str, active_input)
+                if redraw_screen:
+                    self.draw_intro_screen(screen, start_btn_rect, min_input_rect, sec_input_rect, min_input_str, sec_input_str, active_input)
+                    full_redraw = True
             elif game_state == "PLAYING":
-                # --- Update display to show Human's last move ---
-                # (We do this here so the player sees the board *before* the AI thinks)
-                self.draw_board(screen)
-                self.draw_pieces(screen, game.board)
-                self.draw_timer_panel(screen, game, remaining_ms)
-
             # --- AI's Turn (No event checking needed) ---
+                # Pencariannya berjalan di background thread, loop ini hanya mengecek apakah hasilnya sudah ada
+                # Jadi window tetap responsif dan jamnya tetap jalan selama AI berpikir
                 if game.current_player == AI_PLAYER and timer_active:
-                    pygame.display.flip() # Show the board
-
-                    pygame.time.wait(1000)
-                    
-                    # --- Get the AI's move ---
-                    pygame.display.set_caption("Othello (Reversi) - AI is thinking...")
-                    best_move = ai.find_best_move(game)
-                    pygame.display.set_caption("Othello (Reversi)")
-
-                    if not timer_active:
-                        break
+                    best_move = None
+                    ai_move_ready = False
+
+                    if not ai_worker.is_running() and not ai_worker.finished:
+                        # AI membagi sisa waktu di jam game sendiri (iterative deepening sampai jatah waktunya habis)
+                        # Waktu "minimal berpikir" di bawah juga ikut memakai jam, jadi ikut diperhitungkan
+                        remaining_ms = max(0, game_end_time - pygame.time.get_ticks())
+                        pygame.display.set_caption("Othello (Reversi) - AI is thinking...")
+                        ai_worker.start(game, remaining_ms=max(0, remaining_ms - AI_MIN_THINK_MS))
+                    else:
+                        search_done, best_move = ai_worker.poll()
+                        if search_done and ai_worker.elapsed_ms() >= AI_MIN_THINK_MS:
+                            ai_worker.reset()
+                            ai_move_ready = True
+                            pygame.display.set_caption("Othello (Reversi)")
 
-                    if best_move:
+                    if ai_move_ready and best_move:
                         # --- Make the AI's move ---
-                        game.make_move(best_move[0], best_move[1])
+                        history.append((AI_PLAYER, game.make_move(best_move[0], best_move[1])))
                         
                         # --- Get valid moves for the *next* player (Human) ---
                         valid_moves = game.get_valid_moves()
@@ -470,6 +858,7 @@ class GameUI:
                         # --- Handle skipped turn (if Human has no moves) ---
                         if not valid_moves:
                             print(f"Player {game.current_player} (Human) has no moves! Skipping turn.")
+                            history.append((game.current_player, None))
                             game.switch_player()
                             valid_moves = game.get_valid_moves() # Get moves for AI again
                             
@@ -478,10 +867,11 @@ class GameUI:
                                 print("Game Over! No players have valid moves.")
                                 game_state = "GAME_OVER"
                                 timer_active = False
-                    else:
+                    elif ai_move_ready:
                         # This case handles if the AI *starts* its turn but has no moves
                         # (which should be caught by the human's turn logic, but this is safe)
                         print(f"Player {game.current_player} (AI) has no moves! Skipping turn.")
+                        history.append((game.current_player, None))
                         game.switch_player()
                         valid_moves = game.get_valid_moves() # Get moves for Human
                         if not valid_moves:
@@ -489,20 +879,61 @@ class GameUI:
                             game_state = "GAME_OVER"
                             timer_active = False
 
-                if game.current_player == HUMAN_PLAYER:
-                    self.draw_valid_moves(screen, valid_moves)
-                
-                self.draw_timer_panel(screen, game, remaining_ms)
+                # --- Human's Turn: ponder in the background while the human thinks ---
+                if AI_PONDER and game_state == "PLAYING" and game.current_player == HUMAN_PLAYER and timer_active:
+                    if not ponder_worker.is_running() and not ponder_worker.finished:
+                        ponder_worker.start(game, task=ai.ponder)
+
+                # --- Hint scores: analisis hanya selama giliran manusia, supaya tidak berebut CPU dengan pencarian AI ---
+                hint_labels = None
+                if show_hint_scores and game_state == "PLAYING" and game.current_player == HUMAN_PLAYER and timer_active:
+                    hints.update(game)
+                    hint_labels = hints.labels(game)
+                else:
+                    hints.cancel()
+
+                # --- Draw the board *after* the AI step, so a finished AI move shows up in this frame ---
+                # Hint dan hover hanya untuk giliran manusia, hover hanya di kotak yang valid
+                hint_moves = valid_moves if game.current_player == HUMAN_PLAYER else []
+                hovered = hover_square if hover_square in hint_moves else None
+                panel_texts = self.timer_panel_texts(game, remaining_ms, ai_thinking=game.current_player == AI_PLAYER and timer_active,
+                                                     ai_stats=ai.last_stats)
+
+                if UI_DIRTY_RECTS:
+                    if full_redraw:
+                        drawn_squares = [None] * (const.ROWS * const.COLS)
+                        drawn_panel = None
+                    states = self.square_states(game.board, hint_moves, hovered, hint_labels)
+                    dirty_rects += self.draw_changed_squares(screen, states, drawn_squares)
+                    # Panel hanya digambar ulang kalau teksnya berubah (skor, detik timer, status AI)
+                    if panel_texts != drawn_panel:
+                        dirty_rects.append(self.draw_timer_panel(screen, panel_texts))
+                        drawn_panel = panel_texts
+                else:
+                    self.draw_board(screen)
+                    self.draw_pieces(screen, game.board)
+                    self.draw_valid_moves(screen, hint_moves, hint_labels)
+                    if hovered is not None:
+                        self.draw_hover(screen, hovered)
+                    self.draw_timer_panel(screen, panel_texts)
 
             elif game_state == "GAME_OVER":
-                pygame.time.wait(1000)
-                self.draw_game_over_screen(screen, game, reset_btn_rect)
+                if redraw_screen:
+                    self.draw_game_over_screen(screen, game, reset_btn_rect)
+                    full_redraw = True
+
+            drawn_state = drawing_state
 
             # --- Update Display ---
-            pygame.display.flip()
-            
-            # --- Frame Limiting ---
-            clock.tick(60)
+            if not UI_DIRTY_RECTS:
+                pygame.display.flip()
+                # --- Frame Limiting ---
+                clock.tick(60)
+            elif full_redraw:
+                pygame.display.flip()
+            elif dirty_rects:
+                pygame.display.update(dirty_rects)
+            full_redraw = False
 
         # --- Shutdown ---
         pygame.quit()
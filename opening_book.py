@@ -0,0 +1,222 @@
+import argparse
+import math
+import mmap
+import os
+import struct
+import sys
+import time
+
+import bitboard
+
+# --- Opening Book ---
+# File biner berisi hasil pencarian dalam untuk posisi-posisi pembukaan, supaya AI tidak perlu mencarinya lagi setiap game
+#
+# Format file (little-endian):
+#   header : magic "RVBK" (4 byte), version (uint16), padding (2 byte), jumlah record (uint32)
+#   record : key posisi (uint64), kotak move terbaik 0-63 (uint8), padding (1 byte), score (int16)
+# Record diurutkan berdasarkan key, jadi lookup cukup binary search langsung di file yang di-mmap
+# (tidak ada yang di-parse jadi object Python waktu startup)
+#
+# Sejak version 2 key-nya adalah bitboard.canonical_key, dan kotak move-nya disimpan di bentuk kanonik posisinya,
+# jadi 1 record berlaku untuk ke-8 rotasi / cermin posisi tersebut (book version 1 harus di-build ulang)
+
+BOOK_MAGIC = b"RVBK"
+BOOK_VERSION = 2
+HEADER = struct.Struct("<4sHxxI")
+RECORD = struct.Struct("<QBxh")
+KEY = struct.Struct("<Q")
+
+# Score disimpan sebagai int16, jadi menang/kalah pasti (+-inf) dipotong ke batas ini
+SCORE_LIMIT = 32767
+
+DEFAULT_BOOK_PATH = "opening_book.bin"
+
+
+# Reader: file dibuka dengan mmap, lalu setiap lookup hanya membaca beberapa record yang dilewati binary search-nya
+class OpeningBook:
+    def __init__(self, path=DEFAULT_BOOK_PATH):
+        self.path = path
+        self.file = open(path, "rb")
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap tidak bisa untuk file kosong
+            self.file.close()
+            raise ValueError(f"{path} is not an opening book (empty file)")
+
+        if len(self.data) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is truncated")
+        magic, version, count = HEADER.unpack_from(self.data, 0)
+        if magic != BOOK_MAGIC or version != BOOK_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {BOOK_VERSION} opening book")
+        if HEADER.size + count * RECORD.size > len(self.data):
+            self.close()
+            raise ValueError(f"{path} is truncated")
+        self.count = count
+
+        self.lookups = 0
+        self.hits = 0
+
+    def __len__(self):
+        return self.count
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    # Return (square 0-63, score) untuk posisi (player, opponent), atau None kalau tidak ada di book
+    # Square-nya sudah dikembalikan dari bentuk kanonik ke orientasi posisi yang diberikan
+    def lookup(self, player, opponent):
+        self.lookups += 1
+        key, symmetry = bitboard.canonical_key(player, opponent)
+        data = self.data
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            middle_key = KEY.unpack_from(data, HEADER.size + middle * RECORD.size)[0]
+            if middle_key < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count:
+            record_key, square, score = RECORD.unpack_from(data, HEADER.size + low * RECORD.size)
+            if record_key == key:
+                self.hits += 1
+                return bitboard.SYMMETRY_SQUARES[bitboard.SYMMETRY_INVERSE[symmetry]][square], score
+        return None
+
+    # Return move (row, col) dari book untuk posisi game saat ini, atau None
+    # Move-nya dicek lagi legal atau tidak, untuk jaga-jaga kalau ada key yang bentrok
+    def probe(self, game):
+        player, opponent = game.player_masks()
+        entry = self.lookup(player, opponent)
+        if entry is None:
+            return None
+        square, score = entry
+        if not bitboard.legal_moves(player, opponent) >> square & 1:
+            return None
+        return (square >> 3, square & 7), score
+
+
+# --- Offline Builder ---
+# Bangun book dengan mencari semua posisi sampai max_ply dari posisi awal
+# Untuk setiap warna, sisi "book" hanya mengikuti width move terbaiknya, sedangkan sisi lawan dicoba semua move-nya,
+# jadi apapun yang dimainkan manusia, posisi AI berikutnya tetap ada di book
+# Posisi yang merupakan rotasi / cermin dari posisi yang sudah dikunjungi dilewati (key kanonik-nya sama)
+def build_book(max_ply, depth, width=1, tt_size_mb=64, progress=None):
+    from game_logic import GameLogic, AIPlayer, BLACK_PIECE, WHITE_PIECE
+
+    entries = {}
+    for book_side in (BLACK_PIECE, WHITE_PIECE):
+        ai = AIPlayer(book_side, difficulty_depth=depth, tt_size_mb=tt_size_mb, endgame_empties=0, stats_callback=None)
+        game = GameLogic(backend="bitboard")
+        visited = set()
+        expand_position(game, ai, book_side, 0, max_ply, width, entries, visited, progress)
+    return entries
+
+
+def expand_position(game, ai, book_side, ply, max_ply, width, entries, visited, progress):
+    if ply >= max_ply:
+        return
+
+    valid_moves = game.get_valid_moves()
+    if not valid_moves:
+        return
+
+    player, opponent = game.player_masks()
+    key, symmetry = bitboard.canonical_key(player, opponent)
+    if (key, book_side) in visited:
+        return
+    visited.add((key, book_side))
+
+    if game.current_player == book_side:
+        scored_moves = search_moves(game, ai, valid_moves, width)
+        best_move, best_score = scored_moves[0]
+        entries[key] = (bitboard.SYMMETRY_SQUARES[symmetry][best_move[0] * 8 + best_move[1]], best_score)
+        if progress is not None:
+            progress(len(entries), ply)
+        next_moves = [move for move, _ in scored_moves]
+    else:
+        next_moves = valid_moves
+
+    for move in next_moves:
+        undo = game.make_move(move[0], move[1])
+        expand_position(game, ai, book_side, ply + 1, max_ply, width, entries, visited, progress)
+        game.unmake_move(undo)
+
+
+# Return width move terbaik [(move, score), ...] untuk posisi game, diurutkan dari yang terbaik
+def search_moves(game, ai, valid_moves, width):
+    stats = ai.search(game)
+    best_move = stats.move
+    scored = [(best_move, stats.score)]
+    if width <= 1:
+        return scored
+
+    # Move lain dinilai dengan mencari posisi setelah move tersebut (AI sebagai pihak yang meminimalkan)
+    for move in valid_moves:
+        if move == best_move:
+            continue
+        undo = game.make_move(move[0], move[1])
+        score = ai.search_reply(game, ai.depth - 1)
+        game.unmake_move(undo)
+        scored.append((move, score))
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return scored[:width]
+
+
+def clamp_score(score):
+    if score == math.inf:
+        return SCORE_LIMIT
+    if score == -math.inf:
+        return -SCORE_LIMIT
+    return max(-SCORE_LIMIT, min(SCORE_LIMIT, int(round(score))))
+
+
+# Tulis book ke file (ditulis ke file sementara dulu, supaya reader tidak pernah melihat file setengah jadi)
+def write_book(entries, path):
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as book_file:
+        book_file.write(HEADER.pack(BOOK_MAGIC, BOOK_VERSION, len(entries)))
+        for key in sorted(entries):
+            square, score = entries[key]
+            book_file.write(RECORD.pack(key, square, clamp_score(score)))
+    os.replace(temp_path, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or inspect the Reversi opening book")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    build = subcommands.add_parser("build", help="search opening positions and write a book file")
+    build.add_argument("--ply", type=int, default=8, help="number of plies from the start position to cover")
+    build.add_argument("--depth", type=int, default=6, help="search depth used for every book position")
+    build.add_argument("--width", type=int, default=1, help="number of best moves of the book side to expand")
+    build.add_argument("--tt-mb", type=int, default=64, help="transposition table size used while building")
+    build.add_argument("--output", default=DEFAULT_BOOK_PATH)
+
+    info = subcommands.add_parser("info", help="print the number of positions in a book file")
+    info.add_argument("path", nargs="?", default=DEFAULT_BOOK_PATH)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        started = time.perf_counter()
+
+        def progress(count, ply):
+            if count % 100 == 0:
+                print(f"{count} positions ({time.perf_counter() - started:.0f}s, ply {ply})", file=sys.stderr)
+
+        entries = build_book(args.ply, args.depth, args.width, args.tt_mb, progress)
+        write_book(entries, args.output)
+        print(f"Wrote {len(entries)} positions to {args.output} in {time.perf_counter() - started:.1f}s")
+    else:
+        book = OpeningBook(args.path)
+        print(f"{args.path}: {len(book)} positions")
+        book.close()
+
+
+if __name__ == "__main__":
+    main()
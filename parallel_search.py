@@ -0,0 +1,186 @@
+import math
+import multiprocessing
+# Shared alpha dan stop flag antar proses
+
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from transposition import EXACT
+
+# Score yang dipakai sebagai alpha kalau root sudah menemukan move yang pasti menang (+inf)
+# Dengan window (inf, inf) semua move lain akan langsung di-cutoff dan hasilnya tidak bisa dibandingkan,
+# jadi dipakai angka besar yang masih finite supaya move lain yang juga menang tetap mengembalikan +inf
+WIN_PROBE_ALPHA = 10 ** 9
+
+# Seberapa sering (detik) proses utama mengecek deadline / permintaan stop selagi menunggu worker
+POLL_INTERVAL = 0.01
+
+
+# --- Bagian yang jalan di dalam worker process ---
+# Setiap worker menyimpan AIPlayer-nya sendiri (termasuk transposition table-nya) selama pool-nya hidup,
+# jadi table-nya tetap "hangat" antar depth dan antar move
+_worker_ais = {}
+# Generation transposition table proses utama yang terakhir dilihat per AIPlayer worker (key = config)
+_worker_generations = {}
+_shared_alpha = None
+_stop_event = None
+
+
+def _init_worker(shared_alpha, stop_event):
+    global _shared_alpha, _stop_event
+    _shared_alpha = shared_alpha
+    _stop_event = stop_event
+
+
+def _worker_ai(config):
+    # Import di sini supaya module ini bisa di-import oleh game_logic tanpa circular import
+    from game_logic import AIPlayer
+
+    ai = _worker_ais.get(config)
+    if ai is None:
+        player_piece, tt_size_mb, move_ordering, evaluator, search_algorithm, probcut, probcut_confidence = config
+        ai = AIPlayer(player_piece, tt_size_mb=tt_size_mb, move_ordering=move_ordering, evaluator=evaluator,
+                      search_algorithm=search_algorithm, probcut=probcut, probcut_confidence=probcut_confidence)
+        ai.stop_event = _stop_event
+        _worker_ais[config] = ai
+    return ai
+
+
+# Cari 1 move di root sampai kedalaman depth, dengan alpha dari shared value
+# Return (score, counters), score = None kalau pencariannya dibatalkan
+# counters = (nodes, leaf_evals, cutoffs per ply, first move cutoffs) dari pencarian ini saja, untuk SearchStats di proses utama
+# generation = generation transposition table proses utama; kalau berubah (search baru), table worker juga maju 1 generation
+# supaya entry dari move / game sebelumnya boleh ditimpa
+def _search_root_move(config, game, move, depth, time_left, abortable, generation):
+    from game_logic import SearchTimeout, MAX_PLY
+
+    ai = _worker_ai(config)
+    if ai.tt is not None and _worker_generations.get(config) != generation:
+        _worker_generations[config] = generation
+        ai.tt.new_search()
+    ai.deadline = None if time_left is None else time.perf_counter() + time_left
+    ai.abortable = abortable
+    ai.nodes = 0
+    ai.leaf_evals = 0
+    ai.ply_cutoffs = [0] * MAX_PLY
+    ai.first_move_cutoffs = 0
+
+    # alpha - 1 (bukan alpha) supaya move yang score-nya SAMA dengan best move sekarang tetap mendapat score exact,
+    # karena kalau seri, pencarian sequential memilih move yang urutannya lebih awal
+    alpha = _shared_alpha.value
+    if alpha == math.inf:
+        alpha = WIN_PROBE_ALPHA
+    else:
+        alpha -= 1
+
+    undo = game.make_move(move[0], move[1])
+    try:
+        score = ai.search_reply(game, depth - 1, alpha, math.inf)
+    except SearchTimeout:
+        score = None
+    finally:
+        game.unmake_move(undo)
+        ai.deadline = None
+        ai.abortable = False
+
+    return score, (ai.nodes, ai.leaf_evals, ai.ply_cutoffs, ai.first_move_cutoffs)
+
+
+# --- Bagian yang jalan di proses utama ---
+# Root-parallel search: move-move di root dibagi ke beberapa worker process
+# Move pertama (PV dari depth sebelumnya) dicari dulu sendirian untuk mendapat alpha yang bagus,
+# lalu sisanya dicari bersamaan dengan alpha yang di-share lewat multiprocessing.Value
+class ParallelRootSearch:
+    def __init__(self, workers):
+        self.workers = workers
+        self.executor = None
+        # "spawn" supaya aman dipakai dari program yang punya thread lain (misalnya SearchWorker di UI)
+        self.context = multiprocessing.get_context("spawn")
+        self.shared_alpha = self.context.Value("d", -math.inf)
+        self.stop_event = self.context.Event()
+
+    # Pool dibuat sekali saat pertama dibutuhkan, lalu dipakai terus sampai close()
+    def get_executor(self):
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=self.context,
+                initializer=_init_worker,
+                initargs=(self.shared_alpha, self.stop_event),
+            )
+        return self.executor
+
+    def stop(self):
+        self.stop_event.set()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+
+    # Sama seperti AIPlayer.search_root: return (move terbaik, score-nya) dan melempar SearchTimeout kalau dibatalkan
+    # Hasilnya sama dengan pencarian sequential di depth yang sama: score tertinggi, kalau seri ambil yang urutannya paling awal
+    def search_root(self, ai, game, valid_moves, depth):
+        from game_logic import SearchTimeout
+
+        executor = self.get_executor()
+        config = (ai.player_piece, ai.tt.size_mb if ai.tt is not None else 0, ai.move_ordering,
+                  ai.evaluator.source if ai.evaluator is not None else None, ai.search_algorithm,
+                  ai.probcut.source if ai.probcut is not None else None,
+                  ai.probcut.confidence if ai.probcut is not None else None)
+        generation = ai.tt.generation if ai.tt is not None else 0
+        self.shared_alpha.value = -math.inf
+        self.stop_event.clear()
+
+        def submit(move):
+            time_left = None if ai.deadline is None else max(0.0, ai.deadline - time.perf_counter())
+            return executor.submit(_search_root_move, config, game, move, depth, time_left, ai.abortable, generation)
+
+        scores = {}
+
+        def collect(done_futures, futures):
+            for future in done_futures:
+                score, (nodes, leaf_evals, ply_cutoffs, first_move_cutoffs) = future.result()
+                ai.nodes += nodes
+                ai.leaf_evals += leaf_evals
+                ai.first_move_cutoffs += first_move_cutoffs
+                for ply, cutoffs in enumerate(ply_cutoffs):
+                    if cutoffs:
+                        ai.ply_cutoffs[ply] += cutoffs
+                        ai.cutoffs += cutoffs
+                if score is None:
+                    raise SearchTimeout()
+                scores[futures.pop(future)] = score
+                if score > self.shared_alpha.value:
+                    self.shared_alpha.value = score
+
+        def wait_all(futures):
+            try:
+                while futures:
+                    if ai.abortable and (ai.stop_event.is_set() or (ai.deadline is not None and time.perf_counter() >= ai.deadline)):
+                        raise SearchTimeout()
+                    done, _ = wait(list(futures), timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                    collect(done, futures)
+            except SearchTimeout:
+                # Hentikan semua worker yang masih jalan dan tunggu sampai mereka selesai, supaya tidak ada
+                # hasil basi yang masuk ke depth berikutnya
+                self.stop_event.set()
+                wait(list(futures))
+                raise
+
+        # Young brothers wait: move pertama dulu, baru sisanya paralel
+        first = {submit(valid_moves[0]): 0}
+        wait_all(first)
+        rest = {submit(move): index for index, move in enumerate(valid_moves) if index > 0}
+        wait_all(rest)
+
+        best_index = 0
+        for index in range(1, len(valid_moves)):
+            if scores[index] > scores[best_index]:
+                best_index = index
+
+        best_move = valid_moves[best_index]
+        best_score = scores[best_index]
+        if ai.tt is not None:
+            ai.tt.store(game.hash, depth, EXACT, best_score, best_move)
+        return best_move, best_score
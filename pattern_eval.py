@@ -0,0 +1,364 @@
+import array
+import math
+import random
+import struct
+import sys
+
+import bitboard
+
+# --- Pattern Evaluator ---
+# Evaluasi alternatif untuk AIPlayer (lihat parameter evaluator di AIPlayer), pengganti jumlah POSITIONAL_WEIGHTS
+# Papan dilihat sebagai beberapa "pattern" (sekumpulan kotak, misalnya 1 sisi papan), dan setiap kemungkinan isi pattern
+# (kosong / hitam / putih per kotak = bilangan basis 3) punya bobot sendiri di sebuah table
+# Ditambah mobility (kotak kosong di sebelah disk lawan) dan frontier (disk yang bersebelahan dengan kotak kosong)
+#
+# Pattern yang simetris (misalnya 4 sisi papan) memakai table bobot yang sama, masing-masing dibaca dari pojoknya sendiri
+# Index ternary-nya tidak dihitung kotak per kotak: setiap baris papan (1 byte hitam, 1 byte putih) langsung dipetakan
+# ke bagian index dari SEMUA pattern sekaligus lewat table (lihat ROW_LANES), jadi per posisi hanya ada 16 lookup
+#
+# Table-nya dipisah per fase game (berdasarkan jumlah kotak kosong), karena nilai sebuah pattern di opening
+# berbeda jauh dengan di endgame
+#
+# Score-nya selalu dari sudut pandang hitam (positif = bagus untuk hitam), AIPlayer yang membaliknya untuk putih
+# Bobot hasil training (train()) dalam satuan 1/EVAL_SCALE disk selisih akhir game
+# Tanpa file bobot, table-nya diisi dari POSITIONAL_WEIGHTS (lihat default_evaluator) supaya tetap bisa langsung dipakai
+#
+# Contoh training dari file posisi (lihat records.py):
+#   python tournament.py --games 2000 --positions-out positions.bin
+#   python pattern_eval.py train positions.bin --output weights.eval
+
+EVAL_MAGIC = b"RVEV"
+EVAL_VERSION = 1
+EVAL_HEADER = struct.Struct("<4sHH8x")
+
+EVAL_SCALE = 16
+N_PHASES = 6
+
+# Fase game dari jumlah kotak kosong (60 kotak kosong = posisi awal)
+PHASE_OF_EMPTIES = [min(N_PHASES - 1, (60 - empties) * N_PHASES // 61) for empties in range(61)] + [0] * 4
+
+# (nama, kotak-kotaknya di orientasi referensi, urutannya = urutan digit ternary)
+PATTERNS = [
+    ("edge_2x", [(0, col) for col in range(8)] + [(1, 1), (1, 6)]),
+    ("corner_3x3", [(row, col) for row in range(3) for col in range(3)]),
+    ("hor_2", [(1, col) for col in range(8)]),
+    ("hor_3", [(2, col) for col in range(8)]),
+    ("hor_4", [(3, col) for col in range(8)]),
+    ("diag_8", [(index, index) for index in range(8)]),
+]
+PATTERN_SIZES = [len(squares) for _, squares in PATTERNS]
+
+# Simetri papan: (row, col) di orientasi referensi -> (row, col) di papan
+IDENTITY = lambda row, col: (row, col)
+FLIP_VERTICAL = lambda row, col: (7 - row, col)
+FLIP_HORIZONTAL = lambda row, col: (row, 7 - col)
+ROTATE_180 = lambda row, col: (7 - row, 7 - col)
+TRANSPOSE = lambda row, col: (col, row)
+ROTATE_90 = lambda row, col: (col, 7 - row)
+
+# Semua "instance" pattern di papan: (pattern, simetri)
+# Misalnya edge_2x dengan FLIP_VERTICAL = sisi bawah, dengan TRANSPOSE = sisi kiri, dengan ROTATE_90 = sisi kanan
+# PatternEvaluator.evaluate menulis ulang (meng-inline) daftar ini, urutannya harus tetap sama
+INSTANCES = [
+    (0, IDENTITY), (0, FLIP_VERTICAL), (0, TRANSPOSE), (0, ROTATE_90),
+    (1, IDENTITY), (1, FLIP_VERTICAL), (1, FLIP_HORIZONTAL), (1, ROTATE_180),
+    (2, IDENTITY), (2, FLIP_VERTICAL), (2, TRANSPOSE), (2, ROTATE_90),
+    (3, IDENTITY), (3, FLIP_VERTICAL), (3, TRANSPOSE), (3, ROTATE_90),
+    (4, IDENTITY), (4, FLIP_VERTICAL), (4, TRANSPOSE), (4, ROTATE_90),
+    (5, IDENTITY), (5, FLIP_VERTICAL),
+]
+
+# (pattern, index kotak di papan per digit) untuk setiap instance
+INSTANCE_SQUARES = [
+    (pattern, [row * 8 + col for row, col in (symmetry(r, c) for r, c in PATTERNS[pattern][1])])
+    for pattern, symmetry in INSTANCES
+]
+
+# Index semua instance dihitung sekaligus dalam 1 integer besar, 16 bit per instance ("lane", index terbesar 3^10 - 1
+# masih muat dan tidak pernah carry ke lane sebelahnya)
+# ROW_LANES[row][byte] = jumlah 3 ** digit (digeser ke lane instance-nya) untuk semua kotak di baris row yang menyala di byte,
+# ROW_LANES_WHITE sama tapi 2x (digit putih = 2)
+# Jadi jumlah ROW_LANES[row][byte hitam] + ROW_LANES_WHITE[row][byte putih] untuk 8 baris = semua index ternary-nya
+LANE_BITS = 16
+LANES = struct.Struct(f"<{len(INSTANCES)}H")
+
+
+def build_row_lanes(multiplier):
+    lanes = [[0] * 256 for _ in range(8)]
+    for lane, (_, squares) in enumerate(INSTANCE_SQUARES):
+        for digit, square in enumerate(squares):
+            row, col = square >> 3, square & 7
+            value = multiplier * 3 ** digit << (lane * LANE_BITS)
+            for byte in range(256):
+                if byte >> col & 1:
+                    lanes[row][byte] += value
+    return lanes
+
+
+ROW_LANES = build_row_lanes(1)
+ROW_LANES_WHITE = build_row_lanes(2)
+
+
+FULL_MASK = bitboard.FULL_MASK
+NOT_COL_0 = bitboard.NOT_COL_0
+NOT_COL_7 = bitboard.NOT_COL_7
+
+
+# Semua kotak di mask dan 8 tetangganya
+def dilate(mask):
+    mask |= mask << 1 & NOT_COL_0 | mask >> 1 & NOT_COL_7
+    return (mask | mask << 8 | mask >> 8) & FULL_MASK
+
+
+class PatternEvaluator:
+    # tables[phase][pattern] = list bobot dengan panjang 3 ** jumlah kotak pattern-nya
+    # mobility[phase], frontier[phase] = bobot per selisih mobility / frontier disk (hitam - putih)
+    # source = nama yang bisa dipakai lagi untuk load_evaluator (path file bobot atau "pattern"), misalnya di worker process
+    def __init__(self, tables=None, mobility=None, frontier=None, source="pattern"):
+        if tables is None:
+            tables = [[[0] * 3 ** size for size in PATTERN_SIZES] for _ in range(N_PHASES)]
+        self.tables = tables
+        self.mobility = mobility if mobility is not None else [0] * N_PHASES
+        self.frontier = frontier if frontier is not None else [0] * N_PHASES
+        self.source = source
+
+    # Score dari sudut pandang hitam
+    # Sama dengan menjumlah bobot dari feature_indexes, tapi di-inline karena ini dipanggil di setiap leaf
+    def evaluate(self, black, white, empties):
+        phase = PHASE_OF_EMPTIES[empties]
+        edge, corner, hor_2, hor_3, hor_4, diag = self.tables[phase]
+        l0, l1, l2, l3, l4, l5, l6, l7 = ROW_LANES
+        m0, m1, m2, m3, m4, m5, m6, m7 = ROW_LANES_WHITE
+        b0, b1, b2, b3, b4, b5, b6, b7 = black.to_bytes(8, "little")
+        w0, w1, w2, w3, w4, w5, w6, w7 = white.to_bytes(8, "little")
+        packed = (l0[b0] + l1[b1] + l2[b2] + l3[b3] + l4[b4] + l5[b5] + l6[b6] + l7[b7]
+                  + m0[w0] + m1[w1] + m2[w2] + m3[w3] + m4[w4] + m5[w5] + m6[w6] + m7[w7])
+        (e0, e1, e2, e3, c0, c1, c2, c3, h0, h1, h2, h3, i0, i1, i2, i3, j0, j1, j2, j3, d0, d1
+         ) = LANES.unpack(packed.to_bytes(LANES.size, "little"))
+        score = (edge[e0] + edge[e1] + edge[e2] + edge[e3] + corner[c0] + corner[c1] + corner[c2] + corner[c3]
+                 + hor_2[h0] + hor_2[h1] + hor_2[h2] + hor_2[h3] + hor_3[i0] + hor_3[i1] + hor_3[i2] + hor_3[i3]
+                 + hor_4[j0] + hor_4[j1] + hor_4[j2] + hor_4[j3] + diag[d0] + diag[d1])
+
+        # Mobility di sini adalah "potential mobility" (kotak kosong yang bersebelahan dengan disk lawan):
+        # legal_moves untuk kedua pihak lebih mahal daripada semua pattern di atas
+        mobility = self.mobility[phase]
+        frontier = self.frontier[phase]
+        if mobility or frontier:
+            # Sama dengan dilate(), di-inline
+            empty = ~(black | white) & FULL_MASK
+            near = empty | empty << 1 & NOT_COL_0 | empty >> 1 & NOT_COL_7
+            near_empty = near | near << 8 | near >> 8
+            near = black | black << 1 & NOT_COL_0 | black >> 1 & NOT_COL_7
+            near_black = near | near << 8 | near >> 8
+            near = white | white << 1 & NOT_COL_0 | white >> 1 & NOT_COL_7
+            near_white = near | near << 8 | near >> 8
+            score += (mobility * ((empty & near_white).bit_count() - (empty & near_black).bit_count())
+                      + frontier * ((black & near_empty).bit_count() - (white & near_empty).bit_count()))
+        return score
+
+    def evaluate_game(self, game):
+        black, white = game.color_masks()
+        return self.evaluate(black, white, game.disc_count[0])
+
+    def save(self, path):
+        values = array.array("i")
+        for phase in range(N_PHASES):
+            for table in self.tables[phase]:
+                values.extend(table)
+            values.extend((self.mobility[phase], self.frontier[phase]))
+        if sys.byteorder != "little":
+            values.byteswap()
+        with open(path, "wb") as eval_file:
+            eval_file.write(EVAL_HEADER.pack(EVAL_MAGIC, EVAL_VERSION, N_PHASES))
+            eval_file.write(values.tobytes())
+        self.source = path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as eval_file:
+            header = eval_file.read(EVAL_HEADER.size)
+            data = eval_file.read()
+        if len(header) < EVAL_HEADER.size:
+            raise ValueError(f"{path} is not an evaluator weight file (header too short)")
+        magic, version, phases = EVAL_HEADER.unpack(header)
+        if magic != EVAL_MAGIC or version != EVAL_VERSION or phases != N_PHASES:
+            raise ValueError(f"{path} is not a version {EVAL_VERSION} evaluator weight file with {N_PHASES} phases")
+
+        values = array.array("i")
+        values.frombytes(data)
+        if sys.byteorder != "little":
+            values.byteswap()
+        phase_size = sum(3 ** size for size in PATTERN_SIZES) + 2
+        if len(values) != phase_size * N_PHASES:
+            raise ValueError(f"{path} has {len(values)} weights, expected {phase_size * N_PHASES}")
+
+        tables, mobility, frontier = [], [], []
+        offset = 0
+        for _ in range(N_PHASES):
+            phase_tables = []
+            for size in PATTERN_SIZES:
+                phase_tables.append(values[offset:offset + 3 ** size].tolist())
+                offset += 3 ** size
+            tables.append(phase_tables)
+            mobility.append(values[offset])
+            frontier.append(values[offset + 1])
+            offset += 2
+        return cls(tables, mobility, frontier, source=path)
+
+
+# Index (pattern, index di table-nya) dari semua instance pattern di sebuah posisi, plus selisih mobility dan frontier
+# Versi kotak per kotak (lambat tapi jelas) dari PatternEvaluator.evaluate, untuk training dan untuk mengecek evaluate
+def feature_indexes(black, white):
+    indexes = []
+    for pattern, squares in INSTANCE_SQUARES:
+        index = 0
+        for digit, square in enumerate(squares):
+            if black >> square & 1:
+                index += 3 ** digit
+            elif white >> square & 1:
+                index += 2 * 3 ** digit
+        indexes.append((pattern, index))
+
+    empty = ~(black | white) & FULL_MASK
+    near_empty = dilate(empty)
+    mobility = (empty & dilate(white)).bit_count() - (empty & dilate(black)).bit_count()
+    frontier = (black & near_empty).bit_count() - (white & near_empty).bit_count()
+    return indexes, mobility, frontier
+
+
+# Evaluator tanpa training: setiap isi pattern bernilai jumlah POSITIONAL_WEIGHTS dari kotak-kotaknya
+# (kotak yang dilihat oleh beberapa pattern, bobotnya dibagi rata), ditambah sedikit bobot mobility dan frontier
+# Hasilnya kurang lebih evaluasi bawaan AIPlayer, dalam satuan yang sama
+DEFAULT_MOBILITY_WEIGHT = 8
+DEFAULT_FRONTIER_WEIGHT = -4
+
+
+def default_evaluator():
+    # Import di sini karena game_logic juga meng-import module ini
+    from game_logic import POSITIONAL_WEIGHTS
+
+    # Hitung berapa instance pattern yang melihat setiap kotak
+    coverage = [0] * 64
+    for _, squares in INSTANCE_SQUARES:
+        for square in squares:
+            coverage[square] += 1
+
+    # Bobot per digit (dikali kelipatan persekutuan coverage-nya supaya tetap integer, jadi pembulatannya tidak tergantung
+    # urutan penjumlahan); karena POSITIONAL_WEIGHTS simetris, semua instance dari 1 pattern memberi nilai yang sama
+    scale = math.lcm(*coverage)
+    tables = []
+    for pattern, (_, squares) in enumerate(PATTERNS):
+        digit_weights = [POSITIONAL_WEIGHTS[row][col] * scale // coverage[row * 8 + col] for row, col in squares]
+        table = []
+        for index in range(3 ** len(squares)):
+            value = 0
+            for digit, weight in enumerate(digit_weights):
+                state = index // 3 ** digit % 3
+                if state == 1:
+                    value += weight
+                elif state == 2:
+                    value -= weight
+            table.append(round(value / scale))
+        tables.append(table)
+
+    return PatternEvaluator(
+        [tables] * N_PHASES, [DEFAULT_MOBILITY_WEIGHT] * N_PHASES, [DEFAULT_FRONTIER_WEIGHT] * N_PHASES, source="pattern"
+    )
+
+
+# Evaluator dari parameter AIPlayer: None (evaluasi bawaan), "pattern" (default_evaluator), path file bobot,
+# atau object PatternEvaluator yang sudah jadi
+_loaded = {}
+
+
+def load_evaluator(spec):
+    if spec is None or isinstance(spec, PatternEvaluator):
+        return spec
+    evaluator = _loaded.get(spec)
+    if evaluator is None:
+        evaluator = default_evaluator() if spec == "pattern" else PatternEvaluator.load(spec)
+        _loaded[spec] = evaluator
+    return evaluator
+
+
+# --- Training ---
+# Stochastic gradient descent (least squares) dari file posisi records.py
+# Label di file posisi dari sudut pandang pihak yang jalan, di sini dibalik ke sudut pandang hitam
+# Hanya file berlabel selisih disk (LABEL_DISC_DIFF, misalnya tournament.py --positions-out) yang diterima;
+# score AI dari analyze.py satuannya lain dan tidak boleh tercampur
+def read_training_positions(paths):
+    from game_logic import BLACK_PIECE
+    from records import PositionReader, LABEL_DISC_DIFF, LABEL_NAMES
+
+    samples = []
+    for path in paths:
+        with PositionReader(path) as reader:
+            if reader.label != LABEL_DISC_DIFF:
+                raise ValueError(f"{path} holds {LABEL_NAMES.get(reader.label, reader.label)} labels; "
+                                 f"training needs final disc differences (tournament.py --positions-out)")
+            for black, white, side, score in reader:
+                label = score if side == BLACK_PIECE else -score
+                empties = 64 - (black | white).bit_count()
+                samples.append((PHASE_OF_EMPTIES[empties], feature_indexes(black, white), label))
+    return samples
+
+
+def train(paths, epochs=20, learning_rate=0.002, seed=0, log=print):
+    samples = read_training_positions(paths)
+    if not samples:
+        raise ValueError("No usable positions in the training files")
+
+    # Dilatih dalam satuan disk (float), baru dikali EVAL_SCALE dan dibulatkan di akhir
+    tables = [[[0.0] * 3 ** size for size in PATTERN_SIZES] for _ in range(N_PHASES)]
+    mobility = [0.0] * N_PHASES
+    frontier = [0.0] * N_PHASES
+    # Mobility / frontier bisa bernilai puluhan, jadi learning rate-nya diperkecil supaya tidak meledak
+    scalar_rate = learning_rate / 16
+
+    rng = random.Random(seed)
+    for epoch in range(1, epochs + 1):
+        rng.shuffle(samples)
+        squared_error = 0.0
+        for phase, (indexes, mobility_diff, frontier_diff), label in samples:
+            phase_tables = tables[phase]
+            prediction = mobility[phase] * mobility_diff + frontier[phase] * frontier_diff
+            for pattern, index in indexes:
+                prediction += phase_tables[pattern][index]
+            error = label - prediction
+            squared_error += error * error
+
+            step = learning_rate * error
+            for pattern, index in indexes:
+                phase_tables[pattern][index] += step
+            mobility[phase] += scalar_rate * error * mobility_diff
+            frontier[phase] += scalar_rate * error * frontier_diff
+        log(f"epoch {epoch}: RMS error {(squared_error / len(samples)) ** 0.5:.3f} discs over {len(samples)} positions")
+
+    return PatternEvaluator(
+        [[[round(value * EVAL_SCALE) for value in table] for table in phase_tables] for phase_tables in tables],
+        [round(value * EVAL_SCALE) for value in mobility],
+        [round(value * EVAL_SCALE) for value in frontier],
+        source=None,
+    )
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Train pattern evaluator weights from binary position files")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    train_parser = subparsers.add_parser("train")
+    train_parser.add_argument("positions", nargs="+", help="position record files (see records.py)")
+    train_parser.add_argument("--output", required=True, help="weight file to write")
+    train_parser.add_argument("--epochs", type=int, default=20)
+    train_parser.add_argument("--learning-rate", type=float, default=0.002)
+    train_parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    evaluator = train(args.positions, epochs=args.epochs, learning_rate=args.learning_rate, seed=args.seed)
+    evaluator.save(args.output)
+    print(f"Saved weights to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
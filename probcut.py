@@ -0,0 +1,289 @@
+import json
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pattern_eval import N_PHASES, PHASE_OF_EMPTIES
+
+# --- Multi-ProbCut ---
+# Forward pruning untuk AIPlayer dengan search_algorithm="pvs" (lihat parameter probcut di AIPlayer)
+# Score search dalam (depth d) dan score search dangkal (depth d') dari posisi yang sama hampir linear:
+#   score_d ~= slope * score_d' + intercept, dengan error (standar deviasi) sigma
+# Jadi sebelum sebuah node dicari sampai depth d, node itu dicari dulu sampai d' dengan null window. Kalau hasilnya
+# sudah memprediksi score_d >= beta (atau <= alpha) dengan keyakinan confidence * sigma, node-nya langsung di-cutoff
+#
+# "Multi": parameternya dipisah per pasangan depth (d, d') dan per fase game (jumlah kotak kosong, fase yang sama
+# dengan pattern_eval), dan 1 depth boleh punya beberapa d' yang dicoba dari yang paling murah
+# d' dipilih dengan paritas yang sama dengan d, karena score Reversi berayun antara depth ganjil dan genap
+#
+# Parameternya di-fit offline dari posisi self-play (file posisi records.py) dan disimpan sebagai JSON:
+#   python tournament.py --games 100 --positions-out positions.bin
+#   python probcut.py fit positions.bin --output probcut.json
+# Parameter yang di-fit berlaku untuk evaluator yang dipakai waktu fit (default: POSITIONAL_WEIGHTS); spec evaluator-nya
+# disimpan di file dan AIPlayer menolak parameter yang di-fit untuk evaluator lain
+# Tanpa file sendiri, probcut="default" memakai DEFAULT_PARAMS di bawah
+
+PROBCUT_VERSION = 1
+
+# Pasangan depth yang dicek: depth sisa node -> depth search dangkalnya
+DEPTH_PAIRS = {
+    3: (1,),
+    4: (2,),
+    5: (1,),
+    6: (2,),
+    7: (3,),
+    8: (4,),
+}
+
+# Parameter bawaan (spec "default"): di-fit dari 400 posisi self-play (tournament depth 2 vs 3) dengan POSITIONAL_WEIGHTS
+# Format sama dengan ProbCut.params: (depth, depth dangkal) -> (slope, intercept, sigma) per fase, None = sampel kurang
+DEFAULT_PARAMS = {
+    (3, 1): [
+        (1.1151, 0.32, 10.41),
+        (1.0232, 5.0, 16.31),
+        (1.052, 0.38, 19.37),
+        (1.0461, -0.15, 23.1),
+        (1.0717, -0.89, 55.72),
+        (1.114, 2.06, 89.14),
+    ],
+    (4, 2): [
+        (1.0696, -1.2, 7.64),
+        (1.0138, 1.13, 13.38),
+        (1.0213, 1.36, 18.34),
+        (1.0277, 5.18, 22.07),
+        (1.0719, 3.79, 54.39),
+        (0.992, 0.77, 88.65),
+    ],
+    (5, 1): [
+        (1.1807, -0.69, 12.85),
+        (0.9909, 4.79, 21.61),
+        (1.0574, 0.44, 25.26),
+        (1.1132, 1.93, 37.38),
+        (1.1568, -7.52, 83.04),
+        None,
+    ],
+    (6, 2): [
+        (1.1342, -1.36, 14.05),
+        (0.9736, 1.13, 18.8),
+        (1.062, 2.87, 25.66),
+        (1.1186, 8.29, 32.42),
+        (1.1192, 10.91, 88.15),
+        None,
+    ],
+    (7, 3): [
+        (1.0708, -0.27, 12.47),
+        (0.9537, 3.28, 16.08),
+        (1.0443, 0.49, 25.83),
+        (1.1606, 1.86, 33.91),
+        (1.1229, -1.23, 100.55),
+        None,
+    ],
+    (8, 4): [
+        (1.1415, -0.73, 11.85),
+        (0.9742, 2.37, 13.75),
+        (1.1069, 4.92, 19.03),
+        (1.182, 6.8, 39.78),
+        (1.1456, 9.64, 87.01),
+        None,
+    ],
+}
+
+# Berapa sigma prediksinya harus melewati alpha / beta supaya node di-cutoff
+# Makin besar makin aman (makin jarang salah cutoff) tapi makin sedikit yang terpotong
+DEFAULT_CONFIDENCE = 1.5
+
+# Jumlah sampel minimal per (pasangan depth, fase); kalau kurang, pasangan itu tidak dicek di fase tersebut
+MIN_SAMPLES = 30
+
+
+class ProbCut:
+    # params = {(depth, shallow): [(slope, intercept, sigma) atau None, ... 1 per fase]}
+    # evaluator = spec evaluator waktu fit (None = POSITIONAL_WEIGHTS, "pattern", atau path file bobot)
+    def __init__(self, params, confidence=DEFAULT_CONFIDENCE, source=None, evaluator=None):
+        self.params = params
+        self.confidence = confidence
+        self.source = source
+        self.evaluator = evaluator
+        # checks[depth][phase] = [(shallow, slope, intercept, margin), ...], dihitung sekali supaya pvs cukup 2 lookup
+        self.checks = {}
+        for (depth, shallow), phase_params in sorted(params.items()):
+            per_phase = self.checks.setdefault(depth, [[] for _ in range(N_PHASES)])
+            for phase, fitted in enumerate(phase_params):
+                if fitted is not None and fitted[0] > 0:
+                    slope, intercept, sigma = fitted
+                    per_phase[phase].append((shallow, slope, intercept, confidence * sigma))
+
+    # Return list check untuk node dengan depth sisa depth dan empties kotak kosong (kosong = tidak ada check)
+    def checks_for(self, depth, empties):
+        per_phase = self.checks.get(depth)
+        if per_phase is None:
+            return ()
+        return per_phase[PHASE_OF_EMPTIES[empties]]
+
+    def save(self, path):
+        data = {
+            "version": PROBCUT_VERSION,
+            "evaluator": self.evaluator,
+            "phases": N_PHASES,
+            "pairs": [
+                {"depth": depth, "shallow": shallow, "params": phase_params}
+                for (depth, shallow), phase_params in sorted(self.params.items())
+            ],
+        }
+        with open(path, "w") as params_file:
+            json.dump(data, params_file, indent=1)
+        self.source = path
+
+    @classmethod
+    def load(cls, path, confidence=DEFAULT_CONFIDENCE):
+        with open(path) as params_file:
+            try:
+                data = json.load(params_file)
+            except (json.JSONDecodeError, UnicodeDecodeError) as error:
+                raise ValueError(f"{path} is not a ProbCut parameter file ({error})")
+        if data.get("version") != PROBCUT_VERSION or data.get("phases") != N_PHASES:
+            raise ValueError(f"{path} is not a version {PROBCUT_VERSION} ProbCut parameter file with {N_PHASES} phases")
+        params = {}
+        for pair in data["pairs"]:
+            params[(pair["depth"], pair["shallow"])] = [
+                tuple(fitted) if fitted is not None else None for fitted in pair["params"]
+            ]
+        return cls(params, confidence, source=path, evaluator=data.get("evaluator"))
+
+
+# ProbCut dari spec: None (tanpa ProbCut), "default" (DEFAULT_PARAMS), path file parameter, atau object ProbCut yang sudah jadi
+# File yang sama hanya dibaca sekali per confidence
+_loaded = {}
+
+
+def load_probcut(spec, confidence=None):
+    if spec is None or isinstance(spec, ProbCut):
+        return spec
+    if confidence is None:
+        confidence = DEFAULT_CONFIDENCE
+    probcut = _loaded.get((spec, confidence))
+    if probcut is None:
+        if spec == "default":
+            probcut = ProbCut(DEFAULT_PARAMS, confidence, source="default")
+        else:
+            probcut = ProbCut.load(spec, confidence)
+        _loaded[(spec, confidence)] = probcut
+    return probcut
+
+
+# --- Fitting ---
+# Untuk setiap posisi sampel: score full window di setiap depth yang dibutuhkan DEPTH_PAIRS (dari sudut pandang pihak
+# yang jalan), lalu regresi linear least squares score_d terhadap score_d' per (pasangan depth, fase)
+# Posisi tanpa legal move dan score menang/kalah pasti (+-inf) dilewati
+# Search-nya dibagi ke beberapa worker process; setiap worker membuat AIPlayer-nya sendiri (1 per warna)
+_worker_ais = {}
+
+
+def _position_scores(position, depths, evaluator):
+    # Import di sini karena game_logic juga meng-import module ini
+    from game_logic import AIPlayer, EMPTY, game_from_string
+    from records import position_string
+
+    black, white, side = position
+    game = game_from_string(position_string(black, white, side), backend="bitboard")
+    ai = _worker_ais.get(side)
+    if ai is None:
+        ai = AIPlayer(side, tt_size_mb=32, endgame_empties=0, stats_callback=None, evaluator=evaluator,
+                      search_algorithm="pvs")
+        _worker_ais[side] = ai
+    scores = {}
+    for depth in depths:
+        ai.reset_search_state()
+        scores[depth] = ai.pvs(game, depth, -math.inf, math.inf)
+    return game.disc_count[EMPTY], scores
+
+
+def collect_scores(paths, max_positions, depths, evaluator=None, seed=0, workers=1, log=print):
+    import bitboard
+    from game_logic import BLACK_PIECE
+    from records import PositionReader
+
+    positions = []
+    for path in paths:
+        with PositionReader(path) as reader:
+            for black, white, side, _ in reader:
+                player, opponent = (black, white) if side == BLACK_PIECE else (white, black)
+                if bitboard.legal_moves(player, opponent):
+                    positions.append((black, white, side))
+    rng = random.Random(seed)
+    rng.shuffle(positions)
+    positions = positions[:max_positions]
+
+    samples = []
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for sample in executor.map(_position_scores, positions, [depths] * len(positions), [evaluator] * len(positions)):
+            samples.append(sample)
+            if len(samples) % 50 == 0:
+                log(f"{len(samples)}/{len(positions)} positions ({time.perf_counter() - started:.0f}s)")
+    return samples
+
+
+def fit_line(pairs):
+    count = len(pairs)
+    mean_x = sum(x for x, _ in pairs) / count
+    mean_y = sum(y for _, y in pairs) / count
+    variance_x = sum((x - mean_x) ** 2 for x, _ in pairs)
+    if variance_x == 0:
+        return None
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in pairs) / variance_x
+    intercept = mean_y - slope * mean_x
+    sigma = (sum((y - slope * x - intercept) ** 2 for x, y in pairs) / count) ** 0.5
+    return round(slope, 4), round(intercept, 2), round(sigma, 2)
+
+
+def fit(paths, max_positions=500, max_depth=8, evaluator=None, seed=0, workers=1, log=print):
+    pairs = {(depth, shallow) for depth, shallows in DEPTH_PAIRS.items() if depth <= max_depth for shallow in shallows}
+    depths = sorted({depth for pair in pairs for depth in pair})
+    samples = collect_scores(paths, max_positions, depths, evaluator, seed, workers, log)
+    if not samples:
+        raise ValueError("No usable positions in the input files")
+
+    params = {}
+    for depth, shallow in sorted(pairs):
+        phase_params = []
+        for phase in range(N_PHASES):
+            points = [
+                (scores[shallow], scores[depth]) for empties, scores in samples
+                if PHASE_OF_EMPTIES[empties] == phase and math.isfinite(scores[shallow]) and math.isfinite(scores[depth])
+            ]
+            fitted = fit_line(points) if len(points) >= MIN_SAMPLES else None
+            phase_params.append(fitted)
+            if fitted is not None:
+                log(f"depth {depth} <- {shallow}, phase {phase}: slope {fitted[0]}, intercept {fitted[1]}, "
+                    f"sigma {fitted[2]} ({len(points)} positions)")
+        params[(depth, shallow)] = phase_params
+    return ProbCut(params, evaluator=evaluator)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fit Multi-ProbCut parameters from binary position files")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    fit_parser = subparsers.add_parser("fit")
+    fit_parser.add_argument("positions", nargs="+", help="position record files (see records.py)")
+    fit_parser.add_argument("--output", required=True, help="parameter file to write (JSON)")
+    fit_parser.add_argument("--max-positions", type=int, default=500, help="number of sampled positions to search")
+    fit_parser.add_argument("--max-depth", type=int, default=max(DEPTH_PAIRS), help="deepest depth pair to fit")
+    fit_parser.add_argument("--eval", help="evaluator the parameters are fitted for (default: positional weights)")
+    fit_parser.add_argument("--seed", type=int, default=0)
+    fit_parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    probcut = fit(args.positions, args.max_positions, args.max_depth, args.eval, args.seed, args.workers,
+                  log=lambda message: print(message, file=sys.stderr))
+    probcut.save(args.output)
+    print(f"Saved ProbCut parameters to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+import mmap
+import os
+import struct
+
+import bitboard
+from game_logic import BLACK_PIECE, WHITE_PIECE, BOARD_CHARS
+
+# --- Binary Position / Game Records ---
+# Format file yang ringkas untuk menyimpan banyak posisi dan game (self-play, analisis, data training evaluator)
+#
+# Setiap file diawali header 16 byte (little-endian):
+#   magic (4 byte), version (uint16), ukuran 1 record (uint16), jenis label (uint8), padding (7 byte)
+# lalu record-record dengan ukuran tetap. Jumlah record dihitung dari ukuran file, jadi writer cukup menambahkan
+# record di akhir file (append-only) tanpa pernah menulis ulang header-nya
+#
+# Posisi (19 byte):  mask hitam (uint64), mask putih (uint64), giliran (uint8: 1 = hitam, 2 = putih), score (int16)
+#   score = label dari pembuat file-nya, selalu dari sudut pandang pihak yang jalan:
+#   selisih disk akhir game untuk self-play, atau score AI untuk hasil analisis
+#   Satuannya beda, jadi jenis labelnya dicatat di header (LABEL_*) oleh writer-nya dan dicek oleh pemakai data-nya
+#   (file lama yang byte-nya masih padding 0 terbaca sebagai LABEL_UNKNOWN)
+# Game (64 byte):    jumlah move (uint8), 60 byte kotak move (0-63, sisanya 0xFF), disk hitam & putih di akhir game (uint8),
+#                    padding (1 byte). Pass tidak disimpan: kalau pihak yang jalan tidak punya move, gilirannya otomatis pindah
+#
+# Reader memakai numpy.memmap kalau numpy ter-install, jadi jutaan record bisa dibaca sebagai array tanpa membuat
+# object Python per record; tanpa numpy, record dibaca satu per satu langsung dari file yang di-mmap
+
+HEADER = struct.Struct("<4sHHB7x")
+RECORD_VERSION = 1
+
+# Jenis label score di file posisi (file game selalu LABEL_UNKNOWN)
+LABEL_UNKNOWN = 0
+LABEL_DISC_DIFF = 1       # selisih disk akhir game (tournament.py)
+LABEL_SEARCH_SCORE = 2    # score pencarian AI (analyze.py): satuannya tergantung evaluator, menang/kalah pasti dipotong
+LABEL_NAMES = {LABEL_UNKNOWN: "unknown", LABEL_DISC_DIFF: "disc difference", LABEL_SEARCH_SCORE: "search score"}
+
+POSITION_MAGIC = b"RVPS"
+POSITION_RECORD = struct.Struct("<QQBh")
+
+GAME_MAGIC = b"RVGM"
+GAME_RECORD = struct.Struct("<B60sBBx")
+NO_MOVE = 0xFF
+
+# Score posisi disimpan sebagai int16, jadi menang/kalah pasti (+-inf) dipotong ke batas ini
+SCORE_LIMIT = 32767
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if numpy is not None:
+    POSITION_DTYPE = numpy.dtype([("black", "<u8"), ("white", "<u8"), ("side", "u1"), ("score", "<i2")])
+    GAME_DTYPE = numpy.dtype([("count", "u1"), ("moves", "u1", (60,)), ("black_discs", "u1"), ("white_discs", "u1"), ("padding", "V1")])
+else:
+    POSITION_DTYPE = None
+    GAME_DTYPE = None
+
+
+# --- Writer ---
+# Menambahkan record di akhir file; header hanya ditulis kalau file-nya masih baru / kosong
+# File yang sudah ada harus punya jenis label yang sama, supaya 1 file tidak berisi label dengan satuan berbeda
+class RecordWriter:
+    def __init__(self, path, magic, record, label=LABEL_UNKNOWN):
+        self.path = path
+        self.record = record
+        self.label = label
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(HEADER.pack(magic, RECORD_VERSION, record.size, label))
+            return
+        try:
+            file_label = check_header(path, magic, record)
+        except ValueError:
+            self.file.close()
+            raise
+        if file_label != label:
+            self.file.close()
+            raise ValueError(f"{path} holds {LABEL_NAMES.get(file_label, file_label)} labels, "
+                             f"not {LABEL_NAMES.get(label, label)}")
+
+    def write(self, *values):
+        self.file.write(self.record.pack(*values))
+
+    def flush(self):
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# label = LABEL_DISC_DIFF / LABEL_SEARCH_SCORE, sesuai arti score yang ditulis
+class PositionWriter(RecordWriter):
+    def __init__(self, path, label):
+        super().__init__(path, POSITION_MAGIC, POSITION_RECORD, label)
+
+    # side = BLACK_PIECE / WHITE_PIECE (1 / 2)
+    def write_position(self, black, white, side, score=0):
+        self.write(black, white, side, clamp_score(score))
+
+    def write_game_state(self, game, score=0):
+        black, white = game.color_masks()
+        self.write_position(black, white, game.current_player, score)
+
+
+class GameWriter(RecordWriter):
+    def __init__(self, path):
+        super().__init__(path, GAME_MAGIC, GAME_RECORD)
+
+    # moves = list of (row, col), tanpa pass
+    def write_game(self, moves, black_discs, white_discs):
+        squares = bytes(row * 8 + col for row, col in moves)
+        self.write(len(squares), squares.ljust(60, bytes([NO_MOVE])), black_discs, white_discs)
+
+
+def clamp_score(score):
+    if score == float("inf"):
+        return SCORE_LIMIT
+    if score == float("-inf"):
+        return -SCORE_LIMIT
+    return max(-SCORE_LIMIT, min(SCORE_LIMIT, int(round(score))))
+
+
+# Return jenis label file-nya
+def check_header(path, magic, record):
+    with open(path, "rb") as record_file:
+        header = record_file.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError(f"{path} is not a record file (header too short)")
+    file_magic, version, record_size, label = HEADER.unpack(header)
+    if file_magic != magic or version != RECORD_VERSION or record_size != record.size:
+        raise ValueError(f"{path} is not a version {RECORD_VERSION} {magic.decode()} record file")
+    return label
+
+
+# --- Reader ---
+# reader.array = numpy structured array (memmap) kalau numpy ada, None kalau tidak
+# reader[index] / iterasi selalu bisa dipakai dan menghasilkan tuple seperti yang ditulis writer-nya
+# reader.label = jenis label dari header (LABEL_*)
+class RecordReader:
+    def __init__(self, path, magic, record, dtype):
+        self.label = check_header(path, magic, record)
+        self.path = path
+        self.record = record
+        self.count = (os.path.getsize(path) - HEADER.size) // record.size
+        self.array = None
+        self.file = None
+        self.data = None
+
+        if self.count == 0:
+            return
+        if dtype is not None:
+            self.array = numpy.memmap(path, dtype=dtype, mode="r", offset=HEADER.size, shape=(self.count,))
+        else:
+            self.file = open(path, "rb")
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("record index out of range")
+        if self.array is not None:
+            return self.unpack_array_item(self.array[index])
+        return self.record.unpack_from(self.data, HEADER.size + index * self.record.size)
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def unpack_array_item(self, item):
+        return item.item()
+
+    def close(self):
+        # numpy.memmap tidak punya close(), file-nya ditutup waktu array-nya (dan semua view-nya) di-garbage collect
+        self.array = None
+        if self.data is not None:
+            self.data.close()
+            self.file.close()
+            self.data = None
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class PositionReader(RecordReader):
+    def __init__(self, path):
+        super().__init__(path, POSITION_MAGIC, POSITION_RECORD, POSITION_DTYPE)
+
+
+class GameReader(RecordReader):
+    def __init__(self, path):
+        super().__init__(path, GAME_MAGIC, GAME_RECORD, GAME_DTYPE)
+
+    # Return (moves [(row, col), ...], black_discs, white_discs)
+    def __getitem__(self, index):
+        count, squares, black_discs, white_discs = super().__getitem__(index)
+        moves = [(square >> 3, square & 7) for square in squares[:count]]
+        return moves, black_discs, white_discs
+
+    def unpack_array_item(self, item):
+        return int(item["count"]), bytes(item["moves"]), int(item["black_discs"]), int(item["white_discs"])
+
+
+# Cek jenis file dari magic-nya: "positions", "games", atau None (misalnya file teks)
+def record_kind(path):
+    with open(path, "rb") as record_file:
+        magic = record_file.read(4)
+    if magic == POSITION_MAGIC:
+        return "positions"
+    if magic == GAME_MAGIC:
+        return "games"
+    return None
+
+
+# Board string (format game_from_string) dari sebuah record posisi
+def position_string(black, white, side):
+    cells = "".join("X" if black >> square & 1 else "O" if white >> square & 1 else "-" for square in range(64))
+    return f"{cells} {BOARD_CHARS[side]}"
+
+
+# Mainkan ulang sebuah game dari posisi awal (pass diisi otomatis)
+# Yield (black, white, side) untuk setiap posisi sebelum sebuah move dimainkan
+def game_positions(moves):
+    black = bitboard.square_bit(3, 4) | bitboard.square_bit(4, 3)
+    white = bitboard.square_bit(3, 3) | bitboard.square_bit(4, 4)
+    side = BLACK_PIECE
+    for row, col in moves:
+        square = row * 8 + col
+        player, opponent = (black, white) if side == BLACK_PIECE else (white, black)
+        if not bitboard.legal_moves(player, opponent) >> square & 1:
+            # Move-nya bukan untuk pihak ini, berarti pihak ini pass
+            side = WHITE_PIECE if side == BLACK_PIECE else BLACK_PIECE
+            player, opponent = opponent, player
+            if not bitboard.legal_moves(player, opponent) >> square & 1:
+                raise ValueError(f"Illegal move {(row, col)} in game record")
+
+        yield black, white, side
+
+        flipped = bitboard.flips_for_move(player, opponent, square)
+        player |= flipped | (1 << square)
+        opponent &= ~flipped
+        black, white = (player, opponent) if side == BLACK_PIECE else (opponent, player)
+        side = WHITE_PIECE if side == BLACK_PIECE else BLACK_PIECE
@@ -0,0 +1,129 @@
+import math
+import time
+
+# --- Search Statistics ---
+# Setiap pencarian AIPlayer.search() menghasilkan 1 object SearchStats yang berisi ke mana saja waktu pencariannya habis
+# Object yang sama di-update setiap kali 1 iterasi iterative deepening selesai, dan dikirim ke stats_callback
+# (misalnya untuk UI atau log), jadi hasilnya bisa dibaca "live" selama AI masih berpikir
+
+
+# Score untuk output JSON: menang/kalah pasti (+-inf) ditulis "win" / "loss", karena Infinity bukan JSON yang valid
+def json_score(score):
+    if score == math.inf:
+        return "win"
+    if score == -math.inf:
+        return "loss"
+    return score
+
+
+class SearchStats:
+    def __init__(self):
+        # "search" (alpha-beta biasa), "book", "ponder", atau "endgame"
+        self.source = "search"
+        self.move = None
+        self.score = None
+        # Depth terakhir yang selesai dicari (untuk endgame: jumlah kotak kosong)
+        self.depth = 0
+        self.nodes = 0
+        self.leaf_evals = 0
+        # cutoffs_per_ply[ply] = jumlah cutoff alpha-beta di ply tersebut (root = 0)
+        self.cutoffs_per_ply = []
+        self.first_move_cutoffs = 0
+        # Hanya untuk search_algorithm="pvs": berapa kali null window harus dicari ulang, dan berapa kali aspiration window gagal
+        self.pvs_researches = 0
+        self.aspiration_failures = 0
+        # Jumlah node yang dipotong oleh Multi-ProbCut (AIPlayer dengan probcut)
+        self.probcut_cuts = 0
+        # 1 dict per iterasi yang selesai: depth, move, score, nodes (di iterasi itu saja), seconds
+        self.iterations = []
+        self.tt_probes = 0
+        self.tt_hits = 0
+        # True kalau iterasi terakhir dibatalkan karena waktunya habis / stop()
+        self.timed_out = False
+        self.endgame_timed_out = False
+        self.finished = False
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    @property
+    def cutoffs(self):
+        return sum(self.cutoffs_per_ply)
+
+    # Effective branching factor: berapa kali lipat jumlah node bertambah setiap depth bertambah 1
+    # Dihitung dari 2 iterasi terakhir; kalau hanya ada 1 iterasi, pakai nodes^(1/depth)
+    def effective_branching_factor(self):
+        if len(self.iterations) >= 2 and self.iterations[-2]["nodes"] > 0:
+            return self.iterations[-1]["nodes"] / self.iterations[-2]["nodes"]
+        if self.depth > 0 and self.nodes > 0:
+            return self.nodes ** (1 / self.depth)
+        return 0.0
+
+    def tt_hit_rate(self):
+        if self.tt_probes == 0:
+            return 0.0
+        return self.tt_hits / self.tt_probes
+
+    def first_move_cutoff_rate(self):
+        cutoffs = self.cutoffs
+        if cutoffs == 0:
+            return 0.0
+        return self.first_move_cutoffs / cutoffs
+
+    def nodes_per_second(self):
+        if self.seconds <= 0:
+            return 0.0
+        return self.nodes / self.seconds
+
+    # Versi dict (bisa langsung di-json.dumps) untuk log / tournament / benchmark
+    def as_dict(self):
+        cutoffs_per_ply = list(self.cutoffs_per_ply)
+        while cutoffs_per_ply and cutoffs_per_ply[-1] == 0:
+            cutoffs_per_ply.pop()
+        return {
+            "source": self.source,
+            "move": self.move,
+            "score": json_score(self.score),
+            "depth": self.depth,
+            "nodes": self.nodes,
+            "leaf_evals": self.leaf_evals,
+            "cutoffs": self.cutoffs,
+            "cutoffs_per_ply": cutoffs_per_ply,
+            "first_move_cutoff_rate": round(self.first_move_cutoff_rate(), 4),
+            "pvs_researches": self.pvs_researches,
+            "aspiration_failures": self.aspiration_failures,
+            "probcut_cuts": self.probcut_cuts,
+            "effective_branching_factor": round(self.effective_branching_factor(), 3),
+            "iterations": [dict(iteration, score=json_score(iteration["score"])) for iteration in self.iterations],
+            "tt_probes": self.tt_probes,
+            "tt_hits": self.tt_hits,
+            "tt_hit_rate": round(self.tt_hit_rate(), 4),
+            "timed_out": self.timed_out,
+            "endgame_timed_out": self.endgame_timed_out,
+            "seconds": round(self.seconds, 4),
+        }
+
+    # 1 baris ringkasan, sama seperti log "AI chose move ..." yang dulu di-print langsung oleh find_best_move
+    def summary(self):
+        if self.source == "book":
+            return f"AI chose book move: {self.move} with score: {self.score}"
+        if self.source == "ponder":
+            return f"AI chose pondered move: {self.move} with score: {self.score} (depth {self.depth})"
+        if self.source == "endgame":
+            return (f"AI solved endgame: move {self.move}, final disc difference {self.score:+d}, "
+                    f"{self.nodes} nodes in {self.seconds:.2f}s")
+
+        text = (f"AI chose move: {self.move} with score: {self.score} "
+                f"(depth {self.depth}, {self.nodes} nodes in {self.seconds:.2f}s, "
+                f"EBF {self.effective_branching_factor():.2f}")
+        if self.tt_probes:
+            text += f", TT hits {self.tt_hit_rate():.0%}"
+        text += ")"
+        if self.endgame_timed_out:
+            text += " [endgame solve timed out]"
+        return text
+
+
+# stats_callback default dari AIPlayer: print ringkasannya sekali waktu pencarian selesai (kalau ada move yang dipilih)
+def print_stats(stats):
+    if stats.finished and stats.move is not None:
+        print(stats.summary())
@@ -0,0 +1,25 @@
+import pytest
+
+from game_logic import AIPlayer, BLACK_PIECE
+from probcut import DEFAULT_PARAMS, ProbCut, load_probcut
+
+
+def make_ai(**options):
+    return AIPlayer(BLACK_PIECE, tt_size_mb=1, stats_callback=None, search_algorithm="pvs", **options)
+
+
+def test_default_params_match_positional_weights():
+    assert load_probcut("default").evaluator is None
+    assert make_ai(probcut="default").probcut.evaluator is None
+    with pytest.raises(ValueError):
+        make_ai(probcut="default", evaluator="pattern")
+
+
+def test_saved_params_keep_evaluator(tmp_path):
+    path = str(tmp_path / "probcut.json")
+    ProbCut(DEFAULT_PARAMS, evaluator="pattern").save(path)
+    assert ProbCut.load(path).evaluator == "pattern"
+
+    assert make_ai(probcut=path, evaluator="pattern").probcut.evaluator == "pattern"
+    with pytest.raises(ValueError):
+        make_ai(probcut=path)
@@ -0,0 +1,49 @@
+import pytest
+
+import records
+from records import PositionReader, PositionWriter, LABEL_DISC_DIFF, LABEL_SEARCH_SCORE
+
+POSITIONS = [
+    (0x0000000810000000, 0x0000001008000000, 1, 0),
+    (0x00000000000000FF, 0xFF00000000000000, 2, -12),
+    (0xFFFFFFFF00000000, 0x00000000FFFFFFFF, 1, records.SCORE_LIMIT),
+]
+
+
+@pytest.fixture
+def position_file(tmp_path):
+    path = tmp_path / "positions.bin"
+    with PositionWriter(path, LABEL_DISC_DIFF) as writer:
+        for black, white, side, score in POSITIONS:
+            writer.write_position(black, white, side, score)
+    return path
+
+
+def check_reader(path):
+    with PositionReader(path) as reader:
+        assert reader.label == LABEL_DISC_DIFF
+        assert len(reader) == len(POSITIONS)
+        assert list(reader) == POSITIONS
+        assert reader[-1] == POSITIONS[-1]
+        with pytest.raises(IndexError):
+            reader[len(POSITIONS)]
+        return reader.array is not None
+
+
+def test_position_reader_numpy(position_file):
+    pytest.importorskip("numpy")
+    assert check_reader(position_file)
+
+
+def test_position_reader_mmap_fallback(position_file, monkeypatch):
+    monkeypatch.setattr(records, "POSITION_DTYPE", None)
+    assert not check_reader(position_file)
+
+
+def test_position_writer_keeps_label_kind(position_file):
+    with pytest.raises(ValueError, match="disc difference"):
+        PositionWriter(position_file, LABEL_SEARCH_SCORE)
+    with PositionWriter(position_file, LABEL_DISC_DIFF) as writer:
+        writer.write_position(*POSITIONS[0])
+    with PositionReader(position_file) as reader:
+        assert len(reader) == len(POSITIONS) + 1
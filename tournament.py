@@ -0,0 +1,240 @@
+import argparse
+import json
+import multiprocessing
+import random
+import sys
+import time
+
+from game_logic import GameLogic, AIPlayer, BLACK_PIECE, WHITE_PIECE, square_name, parse_square
+from probcut import DEFAULT_CONFIDENCE
+from records import GameWriter, PositionWriter, LABEL_DISC_DIFF, game_positions
+
+# --- Headless Self-Play Tournament ---
+# Mainkan banyak game AIPlayer vs AIPlayer tanpa Pygame / window, dibagi ke beberapa process
+# Setiap opening dimainkan 2 kali dengan warna ditukar, supaya keuntungan warna tidak mempengaruhi hasil
+#
+# Contoh:
+#   python tournament.py --games 200 --a depth=4 --b depth=5,tt_mb=32 --output results.jsonl
+#
+# Setiap game yang selesai langsung ditulis sebagai 1 baris JSON ke --output
+# --games-out / --positions-out juga menyimpan game-nya dalam format biner dari records.py
+# (posisi diberi label selisih disk akhir dari sudut pandang pihak yang jalan, untuk data training evaluator)
+
+# Setting engine yang bisa diatur per sisi lewat "key=value,key=value"
+ENGINE_DEFAULTS = {
+    "depth": 4,          # difficulty_depth
+    "time_ms": 0,        # batas waktu per move (0 = fixed depth saja)
+    "tt_mb": 16,         # ukuran transposition table
+    "endgame": 12,       # endgame_empties (0 = tanpa endgame solver)
+    "ordering": 1,       # move ordering (0 = urutan raster)
+    "book": "",          # path opening book ("" = tanpa book)
+    "eval": "",          # evaluator ("" = POSITIONAL_WEIGHTS, "pattern", atau path file bobot pattern_eval)
+    "search": "alphabeta",  # search_algorithm ("alphabeta" atau "pvs")
+    "probcut": "",       # Multi-ProbCut untuk search=pvs ("" = tanpa, "default", atau path file parameter probcut.py)
+    "probcut_confidence": DEFAULT_CONFIDENCE,  # confidence ProbCut dalam sigma
+}
+
+
+def parse_engine_spec(spec):
+    config = dict(ENGINE_DEFAULTS)
+    if not spec:
+        return config
+    for item in spec.split(","):
+        key, _, value = item.partition("=")
+        key = key.strip()
+        if key not in config:
+            raise ValueError(f"Unknown engine setting {key!r} (expected one of {sorted(config)})")
+        config[key] = type(config[key])(value)
+    return config
+
+
+def create_ai(config, player_piece):
+    return AIPlayer(
+        player_piece,
+        difficulty_depth=config["depth"],
+        tt_size_mb=config["tt_mb"],
+        move_ordering=bool(config["ordering"]),
+        endgame_empties=config["endgame"],
+        opening_book=config["book"] or None,
+        stats_callback=None,
+        evaluator=config["eval"] or None,
+        search_algorithm=config["search"],
+        probcut=config["probcut"] or None,
+        probcut_confidence=config["probcut_confidence"],
+    )
+
+
+# Buat posisi awal untuk sebuah pasangan game
+# "random": opening_plies move acak dari posisi awal
+# "book": sama, tapi hanya move yang hasilnya masih ada di opening book (jadi posisinya "masuk akal")
+def create_opening(seed, opening_plies, openings, book):
+    rng = random.Random(seed)
+    game = GameLogic(backend="bitboard")
+    moves = []
+    for _ in range(opening_plies):
+        valid_moves = game.get_valid_moves()
+        if not valid_moves:
+            break
+        if openings == "book":
+            in_book = []
+            for move in valid_moves:
+                undo = game.make_move(move[0], move[1])
+                player, opponent = game.player_masks()
+                if book.lookup(player, opponent) is not None:
+                    in_book.append(move)
+                game.unmake_move(undo)
+            valid_moves = in_book or valid_moves
+        move = rng.choice(valid_moves)
+        game.make_move(move[0], move[1])
+        moves.append(move)
+    return moves
+
+
+# Mainkan 1 game sampai selesai, return dict hasilnya
+# task = (nomor game, move-move opening, engine A main hitam?, config A, config B)
+def play_game(task):
+    game_index, opening_moves, a_is_black, config_a, config_b = task
+
+    game = GameLogic(backend="bitboard")
+    for move in opening_moves:
+        game.make_move(move[0], move[1])
+
+    a_piece = BLACK_PIECE if a_is_black else WHITE_PIECE
+    b_piece = WHITE_PIECE if a_is_black else BLACK_PIECE
+    players = {a_piece: ("A", create_ai(config_a, a_piece), config_a), b_piece: ("B", create_ai(config_b, b_piece), config_b)}
+    stats = {name: {"moves": 0, "time": 0.0, "nodes": 0, "depth": 0} for name in ("A", "B")}
+    move_list = list(opening_moves)
+
+    while True:
+        if not game.get_valid_moves():
+            game.switch_player()
+            if not game.get_valid_moves():
+                break
+            continue
+
+        name, ai, config = players[game.current_player]
+        started = time.perf_counter()
+        search_stats = ai.search(game, time_limit_ms=config["time_ms"] or None)
+        stats[name]["time"] += time.perf_counter() - started
+        stats[name]["moves"] += 1
+        stats[name]["nodes"] += search_stats.nodes
+        stats[name]["depth"] += search_stats.depth
+
+        move = search_stats.move
+        game.make_move(move[0], move[1])
+        move_list.append(move)
+
+    for _, ai, _ in players.values():
+        ai.close()
+
+    black_discs = game.disc_count[BLACK_PIECE]
+    white_discs = game.disc_count[WHITE_PIECE]
+    a_discs, b_discs = (black_discs, white_discs) if a_is_black else (white_discs, black_discs)
+    if a_discs > b_discs:
+        winner = "A"
+    elif b_discs > a_discs:
+        winner = "B"
+    else:
+        winner = "draw"
+
+    result = {
+        "game": game_index,
+        "black": "A" if a_is_black else "B",
+        "winner": winner,
+        "black_discs": black_discs,
+        "white_discs": white_discs,
+        "margin_a": a_discs - b_discs,
+        "moves": "".join(square_name(row, col) for row, col in move_list),
+        "opening_plies": len(opening_moves),
+    }
+    for name in ("A", "B"):
+        moves = max(1, stats[name]["moves"])
+        result[f"{name.lower()}_ms_per_move"] = round(stats[name]["time"] * 1000 / moves, 2)
+        result[f"{name.lower()}_nodes"] = stats[name]["nodes"]
+        result[f"{name.lower()}_average_depth"] = round(stats[name]["depth"] / moves, 2)
+    return result
+
+
+def create_tasks(args, config_a, config_b):
+    book = None
+    if args.openings == "book":
+        from opening_book import OpeningBook
+        book = OpeningBook(args.book)
+
+    pairs = (args.games + 1) // 2
+    game_index = 0
+    for pair in range(pairs):
+        opening = create_opening(args.seed * 1000003 + pair, args.opening_plies, args.openings, book)
+        for a_is_black in (True, False):
+            if game_index >= args.games:
+                break
+            yield (game_index, opening, a_is_black, config_a, config_b)
+            game_index += 1
+
+    if book is not None:
+        book.close()
+
+
+# Simpan 1 hasil game ke file record (kalau diminta)
+def write_records(result, game_writer, position_writer):
+    moves_text = result["moves"]
+    moves = [parse_square(moves_text[index:index + 2]) for index in range(0, len(moves_text), 2)]
+    if game_writer is not None:
+        game_writer.write_game(moves, result["black_discs"], result["white_discs"])
+    if position_writer is not None:
+        disc_diff = result["black_discs"] - result["white_discs"]
+        for black, white, side in game_positions(moves):
+            position_writer.write_position(black, white, side, disc_diff if side == BLACK_PIECE else -disc_diff)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play AIPlayer vs AIPlayer games without a display")
+    parser.add_argument("--a", default="", help="engine A settings, e.g. depth=4,tt_mb=16,time_ms=0,endgame=12,book=,ordering=1,eval=pattern,search=pvs")
+    parser.add_argument("--b", default="", help="engine B settings (same keys as --a)")
+    parser.add_argument("--games", type=int, default=100, help="total number of games (played in color-swapped pairs)")
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--openings", choices=("random", "book"), default="random")
+    parser.add_argument("--opening-plies", type=int, default=4, help="number of opening plies before the engines take over")
+    parser.add_argument("--book", default="opening_book.bin", help="book used by --openings book")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", default="-", help="JSON lines output file ('-' for stdout)")
+    parser.add_argument("--games-out", help="append every game to this binary game record file")
+    parser.add_argument("--positions-out", help="append every position, labelled with the final disc difference, to this binary position file")
+    args = parser.parse_args(argv)
+
+    config_a = parse_engine_spec(args.a)
+    config_b = parse_engine_spec(args.b)
+
+    output = sys.stdout if args.output == "-" else open(args.output, "w")
+    game_writer = GameWriter(args.games_out) if args.games_out else None
+    position_writer = PositionWriter(args.positions_out, LABEL_DISC_DIFF) if args.positions_out else None
+    totals = {"A": 0, "B": 0, "draw": 0}
+    margin = 0
+    started = time.perf_counter()
+
+    with multiprocessing.Pool(args.workers) as pool:
+        for result in pool.imap_unordered(play_game, create_tasks(args, config_a, config_b)):
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+            totals[result["winner"]] += 1
+            margin += result["margin_a"]
+            write_records(result, game_writer, position_writer)
+
+    if output is not sys.stdout:
+        output.close()
+    for writer in (game_writer, position_writer):
+        if writer is not None:
+            writer.close()
+
+    played = sum(totals.values())
+    score = (totals["A"] + totals["draw"] / 2) / max(1, played)
+    print(
+        f"{played} games in {time.perf_counter() - started:.1f}s: "
+        f"A {totals['A']} - B {totals['B']} - draws {totals['draw']}, "
+        f"A score {score:.1%}, A average margin {margin / max(1, played):+.2f}",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
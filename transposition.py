@@ -0,0 +1,92 @@
+import random
+# Dipakai untuk generate angka acak Zobrist, dengan seed tetap supaya hash sebuah posisi selalu sama di setiap run
+
+# --- Zobrist Hashing ---
+# Setiap kombinasi (warna, kotak) punya 1 angka acak 64-bit
+# Hash sebuah posisi = XOR dari angka acak semua disk yang ada di papan (+ 1 angka lagi kalau yang jalan putih)
+# Karena XOR bisa dibatalkan dengan XOR yang sama, hash-nya bisa di-update per move tanpa scan ulang papan
+_rng = random.Random(0x5EED0F0E110)
+
+# ZOBRIST_PIECE[piece][square], index 0 (EMPTY) tidak dipakai
+ZOBRIST_PIECE = [[0] * 64] + [[_rng.getrandbits(64) for _ in range(64)] for _ in range(2)]
+ZOBRIST_SIDE = _rng.getrandbits(64)
+
+# XOR yang diperlukan untuk membalik 1 disk (hapus warna lama, tambah warna baru)
+ZOBRIST_FLIP = [ZOBRIST_PIECE[1][square] ^ ZOBRIST_PIECE[2][square] for square in range(64)]
+
+
+# --- Transposition Table ---
+# Bound type dari score yang disimpan
+EXACT = 0
+LOWER_BOUND = 1 # Score asli >= score yang disimpan (terjadi cutoff / fail-high)
+UPPER_BOUND = 2 # Score asli <= score yang disimpan (fail-low)
+
+# Perkiraan kasar memory per entry (tuple 6 elemen + key 64-bit), dipakai untuk konversi MB -> jumlah entry
+ENTRY_BYTES = 144
+
+# Table dengan ukuran tetap yang dialokasikan sekali di awal, jadi memory-nya tidak terus bertambah selama game
+# Replacement policy-nya two-tier: setiap bucket punya 2 slot
+# - Slot 0 "depth-preferred": hanya diganti kalau entry baru lebih dalam, atau entry lama berasal dari pencarian sebelumnya
+# - Slot 1 "always-replace": selalu diisi entry terbaru yang tidak masuk ke slot 0
+class TranspositionTable:
+    def __init__(self, size_mb=16):
+        self.size_mb = size_mb
+        self.bucket_count = max(1, int(size_mb * 1024 * 1024) // (ENTRY_BYTES * 2))
+        self.entries = [None] * (self.bucket_count * 2)
+
+        # Generation naik setiap kali AI mulai mencari move baru
+        # Entry dari generation lama tetap bisa dipakai, tapi boleh ditimpa duluan
+        self.generation = 0
+
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    def new_search(self):
+        self.generation += 1
+
+    def clear(self):
+        self.entries = [None] * (self.bucket_count * 2)
+        self.generation = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+
+    # Return (depth, bound, score, best_move) atau None kalau posisinya belum pernah disimpan
+    def probe(self, key):
+        self.probes += 1
+        index = (key % self.bucket_count) * 2
+        entries = self.entries
+
+        entry = entries[index]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1:5]
+
+        entry = entries[index + 1]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1:5]
+
+        return None
+
+    def store(self, key, depth, bound, score, best_move):
+        self.stores += 1
+        index = (key % self.bucket_count) * 2
+        entries = self.entries
+        new_entry = (key, depth, bound, score, best_move, self.generation)
+
+        deep = entries[index]
+        if deep is None or deep[0] == key or depth >= deep[1] or deep[5] != self.generation:
+            entries[index] = new_entry
+            # Hapus duplikat di slot always-replace supaya probe tidak pernah membaca entry yang lebih lama
+            shallow = entries[index + 1]
+            if shallow is not None and shallow[0] == key:
+                entries[index + 1] = None
+        else:
+            entries[index + 1] = new_entry
+
+    # Persentase slot yang terisi, untuk melihat seberapa penuh table-nya
+    def usage(self):
+        filled = sum(1 for entry in self.entries if entry is not None)
+        return filled / len(self.entries)